@@ -0,0 +1 @@
+"""Бенчмарки конвейера загрузки, обработки и отрисовки"""
@@ -0,0 +1,256 @@
+"""
+Бенчмарк конвейера загрузка -> обработка -> отрисовка на синтетических данных
+
+Запуск:
+    python -m benchmarks.run_benchmarks --sizes 1000,100000 --output bench.json
+    python -m benchmarks.run_benchmarks --sizes 1000000 --skip-render --baseline bench.json
+
+Для каждого этапа измеряется время выполнения и пиковый объем памяти
+(tracemalloc, отдельным прогоном, чтобы трассировка не искажала время).
+Результаты выводятся в JSON для сравнения запусков.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+
+from benchmarks.synthetic import generate_issues
+from jira_analytics.data_processor import DataProcessor
+from jira_analytics.issue_table import IssueTable
+from jira_analytics.jira_client import calculate_resolution_days
+from jira_analytics.reports import REPORTS
+from jira_analytics.batch import render_reports
+from jira_analytics.render_cache import RenderCache
+from jira_analytics.snapshot import load_snapshot, save_snapshot
+from jira_analytics.column_store import ColumnStore
+from jira_analytics.index import IssueFilter
+from jira_analytics.streaming import SearchResponseStream, project_issue
+from jira_analytics.time_in_status import dwell_by_status
+
+PROCESSOR_METHODS = [
+    'get_report_bundle',
+    'get_resolution_times',
+    'get_resolution_times_by_status',
+    'get_created_closed_counts',
+    'get_user_stats',
+    'get_time_spent_data',
+    'get_priority_distribution',
+    'get_flow_metrics',
+]
+
+# Ограничение количества вызовов скалярной функции calculate_resolution_days
+SCALAR_SAMPLE = 100000
+
+# Среднее количество переходов между статусами в журналах изменений
+CHANGELOG_TRANSITIONS = 20
+
+
+def measure(func: Callable[[], Any], track_memory: bool = True) -> Dict[str, Optional[float]]:
+    """
+    Измерение времени и пиковой памяти вызова
+
+    Args:
+        func: Измеряемая функция без аргументов
+        track_memory: Выполнить отдельный прогон под tracemalloc
+
+    Returns:
+        Словарь {seconds, peak_mb}
+    """
+    started = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - started
+
+    peak_mb = None
+    if track_memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+
+    return {'seconds': seconds, 'peak_mb': peak_mb}
+
+
+def run_size(size: int, track_memory: bool, render: bool) -> List[Dict[str, Any]]:
+    """
+    Прогон всех этапов для одного размера набора задач
+
+    Args:
+        size: Количество синтетических задач
+        track_memory: Измерять пиковую память
+        render: Измерять отрисовку графиков
+
+    Returns:
+        Список результатов этапов
+    """
+    results = []
+
+    def record(stage: str, func: Callable[[], Any], items: int = size) -> None:
+        result = measure(func, track_memory)
+        results.append(dict(size=size, stage=stage, items=items, **result))
+        peak = f"{result['peak_mb']:.1f} МБ" if result['peak_mb'] is not None else "-"
+        print(f"  {stage:<40} {result['seconds']:>9.4f} с  {peak:>10}")
+
+    print(f"Размер набора: {size}")
+    issues = generate_issues(size)
+    body = json.dumps({'startAt': 0, 'maxResults': size, 'total': size, 'issues': issues}).encode('utf-8')
+
+    record('json_decode', lambda: json.loads(body))
+    record('json_stream_project', lambda: [
+        project_issue(issue)
+        for issue in SearchResponseStream(body[i:i + 65536] for i in range(0, len(body), 65536))
+    ])
+    record('issue_table_from_issues', lambda: IssueTable.from_issues(issues))
+
+    sample = issues[:SCALAR_SAMPLE]
+    record('calculate_resolution_days', lambda: [
+        calculate_resolution_days(issue['fields']['created'], issue['fields']['resolutiondate'])
+        for issue in sample if issue['fields']['resolutiondate']
+    ], items=len(sample))
+
+    table = IssueTable.from_issues(issues)
+    for method in PROCESSOR_METHODS:
+        # Новый процессор на каждый прогон, чтобы не попадать в кэш отчетов
+        record(f'processor.{method}', lambda method=method: getattr(DataProcessor(table), method)())
+
+    # Отбор квартала по приоритету и исполнителю через индексы
+    issue_filter = IssueFilter(created_from='2019-07-01', created_to='2019-10-01',
+                               priority='Major', assignee='User 0')
+    indexed = DataProcessor(table)
+    record('processor.get_index', indexed.get_index)
+    record('filtered_report_bundle',
+           lambda: indexed.get_report_bundle(issue_filter=issue_filter))
+
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        for compress in (False, True):
+            path = os.path.join(snapshot_dir, f'snapshot_{int(compress)}.npz')
+            suffix = '_compressed' if compress else ''
+            record(f'snapshot_save{suffix}',
+                   lambda path=path, compress=compress: save_snapshot(table, path, compress))
+            record(f'snapshot_load{suffix}', lambda path=path: load_snapshot(path))
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        # Добавление новых строк и открытие хранилища, отображаемого в память
+        half = len(table) // 2
+        record('column_store_append', lambda: ColumnStore(store_dir).append(table.take(slice(half, None))),
+               items=len(table) - half)
+        ColumnStore(store_dir).append(table.take(slice(0, half)))
+        record('column_store_open', lambda: ColumnStore(store_dir).table())
+
+    changelog_issues = [project_issue(issue)
+                        for issue in generate_issues(size, mean_transitions=CHANGELOG_TRANSITIONS)]
+    transitions = sum(len(issue['changelog']['transitions']) for issue in changelog_issues)
+    record('issue_table_with_changelog', lambda issues=changelog_issues: IssueTable.from_issues(issues),
+           items=transitions)
+    changelog_table = IssueTable.from_issues(changelog_issues)
+    del changelog_issues
+    record('dwell_by_status', lambda: dwell_by_status(changelog_table), items=transitions)
+
+    if render:
+        from jira_analytics.visualizer import JiraVisualizer
+        processor = DataProcessor(table)
+        with tempfile.TemporaryDirectory() as output_dir:
+            visualizer = JiraVisualizer('SYN', output_dir=output_dir)
+            for report in REPORTS:
+                data = report.collect_data(processor)
+                record(f'render.{report.name}', lambda report=report, data=data: report.render(visualizer, data))
+
+            # Пакетная отрисовка с пустым кэшем графиков и повторная - из кэша
+            cache = RenderCache(os.path.join(output_dir, 'renders'))
+            batch_dir = os.path.join(output_dir, 'batch')
+
+            def render_cold() -> None:
+                cache.clear()
+                render_reports(DataProcessor(table), 'SYN', batch_dir, render_cache=cache)
+
+            record('render_reports_cold', render_cold)
+            render_reports(processor, 'SYN', batch_dir, render_cache=cache)
+            record('render_reports_light', lambda: render_reports(DataProcessor(table), 'SYN', batch_dir,
+                                                                  ('svg', 'vega'), backend='light'))
+            record('render_reports_cached',
+                   lambda: render_reports(DataProcessor(table), 'SYN', batch_dir, render_cache=cache))
+
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    """
+    Вывод отношения времени к предыдущему запуску
+
+    Args:
+        results: Результаты текущего запуска
+        baseline_path: Путь к JSON предыдущего запуска
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as file:
+        baseline = {(item['size'], item['stage']): item for item in json.load(file)['results']}
+
+    print(f"\nСравнение с {baseline_path} (время текущее / базовое):")
+    for item in results:
+        previous = baseline.get((item['size'], item['stage']))
+        if previous and previous['seconds'] > 0:
+            ratio = item['seconds'] / previous['seconds']
+            print(f"  {item['size']:>8} {item['stage']:<40} x{ratio:.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Точка входа бенчмарка
+
+    Args:
+        argv: Аргументы командной строки
+
+    Returns:
+        Отчет бенчмарка
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарк JIRA Analytics")
+    parser.add_argument("--sizes", default="1000,100000",
+                        help="размеры наборов задач через запятую (например 1000,100000,1000000)")
+    parser.add_argument("--output", help="путь к JSON-файлу результатов")
+    parser.add_argument("--baseline", help="JSON предыдущего запуска для сравнения")
+    parser.add_argument("--no-memory", action="store_true", help="не измерять пиковую память")
+    parser.add_argument("--skip-render", action="store_true", help="не измерять отрисовку графиков")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in [int(item) for item in args.sizes.split(',') if item.strip()]:
+        results.extend(run_size(size, not args.no_memory, not args.skip_render))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'platform': platform.platform()
+        },
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"\nРезультаты сохранены в {args.output}")
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+    return report
+
+
+if __name__ == "__main__":
+    main()
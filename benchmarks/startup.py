@@ -0,0 +1,133 @@
+"""
+Бенчмарк времени запуска точек входа по данным python -X importtime
+
+Запуск:
+    python -m benchmarks.startup --repeat 5 --output startup.json
+
+Каждая точка входа импортируется в отдельном процессе интерпретатора;
+для нее фиксируется суммарное время импорта (по -X importtime), время
+работы процесса и то, какие тяжелые зависимости оказались загружены.
+Из нескольких повторов берется минимум.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Тяжелые зависимости, загрузка которых отслеживается
+HEAVY_MODULES = ('numpy', 'requests', 'matplotlib', 'matplotlib.pyplot', 'asyncio')
+
+# Точка входа -> код, выполняемый после импорта
+ENTRY_POINTS = {
+    'jira_analytics': 'import jira_analytics',
+    'main': 'import main',
+    'config': "from jira_analytics.config import load_configuration; load_configuration('config.json')",
+    'sync': 'from jira_analytics.cache import sync_issues',
+    'snapshot': 'from jira_analytics.snapshot import load_snapshot',
+    'data_processor': 'from jira_analytics.data_processor import DataProcessor',
+    'visualizer': "from jira_analytics.visualizer import JiraVisualizer; JiraVisualizer('SYN')",
+    'plot': ("from jira_analytics.visualizer import plt; import matplotlib; "
+             "matplotlib.use('Agg'); plt.figure()")
+}
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """
+    Суммарное время импорта модулей верхнего уровня
+
+    Args:
+        stderr: Вывод интерпретатора с -X importtime
+
+    Returns:
+        Словарь {модуль: время в микросекундах с учетом вложенных импортов}
+    """
+    totals = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            totals[match.group(4)] = int(match.group(2))
+    return totals
+
+
+def measure_entry(name: str, code: str, repeat: int) -> Dict[str, Any]:
+    """
+    Измерение запуска одной точки входа
+
+    Args:
+        name: Имя точки входа
+        code: Код, выполняемый в новом интерпретаторе
+        repeat: Количество повторов
+
+    Returns:
+        Результат: время процесса и импорта (минимум по повторам), загруженные модули
+    """
+    probe = (f"{code}\nimport sys\n"
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    best_wall, best_import, loaded = None, None, []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', probe],
+                                   cwd=ROOT, capture_output=True, text=True, check=True)
+        wall = time.perf_counter() - started
+        import_seconds = sum(parse_importtime(completed.stderr).values()) / 1e6
+        best_wall = wall if best_wall is None else min(best_wall, wall)
+        best_import = import_seconds if best_import is None else min(best_import, import_seconds)
+        # Список модулей - последняя строка вывода (точка входа может печатать свое)
+        lines = completed.stdout.splitlines() or ['']
+        loaded = [module for module in lines[-1].split(',') if module]
+    return {'entry': name, 'seconds': best_wall, 'import_seconds': best_import, 'loaded': loaded}
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Точка входа бенчмарка запуска
+
+    Args:
+        argv: Аргументы командной строки
+
+    Returns:
+        Отчет бенчмарка
+    """
+    parser = argparse.ArgumentParser(description="Бенчмарк времени запуска JIRA Analytics")
+    parser.add_argument("--repeat", type=int, default=5, help="количество повторов на точку входа")
+    parser.add_argument("--entries", default=None,
+                        help=f"точки входа через запятую (по умолчанию все: {', '.join(ENTRY_POINTS)})")
+    parser.add_argument("--output", help="путь к JSON-файлу результатов")
+    args = parser.parse_args(argv)
+
+    names = [item.strip() for item in args.entries.split(',')] if args.entries else list(ENTRY_POINTS)
+    results = []
+    for name in names:
+        result = measure_entry(name, ENTRY_POINTS[name], args.repeat)
+        results.append(result)
+        print(f"  {name:<16} {result['seconds']:>8.3f} с  импорт {result['import_seconds']:>8.3f} с"
+              f"  {', '.join(result['loaded']) or '-'}")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"\nРезультаты сохранены в {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Генератор синтетических задач JIRA для бенчмарков"""
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+RESOLVED_STATUSES = ['Closed', 'Resolved']
+RESOLVED_WEIGHTS = [0.7, 0.3]
+OPEN_STATUSES = ['Open', 'In Progress', 'Reopened', 'Patch Available']
+OPEN_WEIGHTS = [0.6, 0.2, 0.1, 0.1]
+
+PRIORITIES = ['Blocker', 'Critical', 'Major', 'Minor', 'Trivial']
+PRIORITY_WEIGHTS = [0.02, 0.08, 0.6, 0.2, 0.1]
+
+# Начало и длительность истории проекта
+HISTORY_START = np.datetime64('2015-01-01T00:00:00', 's')
+HISTORY_DAYS = 10 * 365
+
+
+def _format_timestamps(seconds: np.ndarray) -> np.ndarray:
+    """Форматирование секунд эпохи в строки JIRA со смещением +0000"""
+    moments = seconds.astype('datetime64[s]').astype('datetime64[ms]')
+    return np.char.add(np.datetime_as_string(moments, unit='ms'), '+0000')
+
+
+def _generate_changelogs(rng: np.random.Generator, created: np.ndarray, end: np.ndarray,
+                         final_statuses: List[str], mean_transitions: float) -> List[Dict[str, Any]]:
+    """
+    Генерация журналов изменений со случайными переходами между статусами
+
+    Args:
+        rng: Генератор случайных чисел
+        created: Моменты создания задач (секунды эпохи)
+        end: Моменты последнего перехода (секунды эпохи)
+        final_statuses: Итоговые статусы задач
+        mean_transitions: Среднее количество переходов на задачу
+
+    Returns:
+        Объекты changelog в формате ответа с expand=changelog
+    """
+    count = len(created)
+    sizes = rng.poisson(max(mean_transitions - 1, 0), count) + 1
+    issue_index = np.repeat(np.arange(count), sizes)
+    fractions = rng.random(len(issue_index))
+    order = np.lexsort((fractions, issue_index))
+    fractions = fractions[order]
+    fractions[np.cumsum(sizes) - 1] = 1.0
+    moments = created[issue_index] + (fractions * (end - created)[issue_index]).astype(np.int64)
+    moments_str = _format_timestamps(moments).tolist()
+    targets = rng.choice(len(OPEN_STATUSES), len(issue_index), p=OPEN_WEIGHTS).tolist()
+
+    changelogs, position = [], 0
+    for i, size in enumerate(sizes.tolist()):
+        histories, current = [], 'Open'
+        for step in range(size):
+            target = final_statuses[i] if step == size - 1 else OPEN_STATUSES[targets[position]]
+            histories.append({'created': moments_str[position], 'items': [
+                {'field': 'status', 'fromString': current, 'toString': target}
+            ]})
+            current = target
+            position += 1
+        changelogs.append({'startAt': 0, 'maxResults': size, 'total': size, 'histories': histories})
+    return changelogs
+
+
+def generate_issues(count: int, project_key: str = 'SYN', seed: Optional[int] = 0,
+                    resolved_share: float = 0.85,
+                    mean_transitions: float = 0) -> List[Dict[str, Any]]:
+    """
+    Генерация задач с реалистичными распределениями полей
+
+    Даты создания равномерно распределены по 10 годам, время до разрешения
+    логнормально (медиана около двух недель, тяжелый хвост), исполнители и
+    авторы выбираются по закону Ципфа, учет времени есть примерно у 10% задач.
+
+    Args:
+        count: Количество задач
+        project_key: Ключ проекта
+        seed: Зерно генератора случайных чисел
+        resolved_share: Доля разрешенных задач
+        mean_transitions: Среднее количество переходов между статусами
+            в журнале изменений (0 - задачи без журнала)
+
+    Returns:
+        Список задач в формате ответа /rest/api/2/search
+    """
+    rng = np.random.default_rng(seed)
+    start = HISTORY_START.astype(np.int64)
+
+    created = start + rng.integers(0, HISTORY_DAYS * 86400, count)
+    lag = np.minimum(rng.lognormal(mean=np.log(14 * 86400), sigma=1.5, size=count), 3000 * 86400)
+    resolved = created + lag.astype(np.int64)
+    is_resolved = rng.random(count) < resolved_share
+    updated = np.where(is_resolved, resolved, created) + rng.integers(0, 86400, count)
+
+    user_count = max(10, int(np.sqrt(count) * 2))
+    users = [f'User {i}' for i in range(user_count)]
+    assignees = np.minimum(rng.zipf(1.3, count), user_count) - 1
+    reporters = np.minimum(rng.zipf(1.5, count), user_count) - 1
+    has_assignee = rng.random(count) < 0.8
+
+    resolved_statuses = rng.choice(len(RESOLVED_STATUSES), count, p=RESOLVED_WEIGHTS)
+    open_statuses = rng.choice(len(OPEN_STATUSES), count, p=OPEN_WEIGHTS)
+    priorities = rng.choice(len(PRIORITIES), count, p=PRIORITY_WEIGHTS)
+    has_timespent = rng.random(count) < 0.1
+    timespent = rng.integers(900, 20 * 86400, count)
+
+    created_str = _format_timestamps(created).tolist()
+    resolved_str = _format_timestamps(resolved).tolist()
+    updated_str = _format_timestamps(updated).tolist()
+
+    # Поэлементный доступ к спискам Python быстрее, чем к массивам NumPy
+    is_resolved, has_assignee, has_timespent = \
+        is_resolved.tolist(), has_assignee.tolist(), has_timespent.tolist()
+    assignees, reporters, timespent = assignees.tolist(), reporters.tolist(), timespent.tolist()
+    resolved_statuses, open_statuses, priorities = \
+        resolved_statuses.tolist(), open_statuses.tolist(), priorities.tolist()
+
+    final_statuses = [RESOLVED_STATUSES[resolved_statuses[i]] if is_resolved[i]
+                      else OPEN_STATUSES[open_statuses[i]] for i in range(count)]
+    changelogs = None
+    if mean_transitions > 0:
+        changelogs = _generate_changelogs(rng, created, np.where(is_resolved, resolved, updated),
+                                          final_statuses, mean_transitions)
+
+    issues = []
+    for i in range(count):
+        issues.append({
+            'key': f'{project_key}-{i + 1}',
+            'fields': {
+                'created': created_str[i],
+                'updated': updated_str[i],
+                'resolutiondate': resolved_str[i] if is_resolved[i] else None,
+                'status': {'name': final_statuses[i]},
+                'priority': {'name': PRIORITIES[priorities[i]]},
+                'assignee': {'displayName': users[assignees[i]]} if has_assignee[i] else None,
+                'reporter': {'displayName': users[reporters[i]]},
+                'timespent': timespent[i] if has_timespent[i] else None
+            }
+        })
+        if changelogs is not None:
+            issues[-1]['changelog'] = changelogs[i]
+    return issues
@@ -1,31 +1,102 @@
 """
 JIRA Analytics Package
 Аналитика данных из JIRA для визуализации метрик проекта
+
+Модули пакета загружаются при первом обращении к их атрибутам (PEP 562),
+поэтому импорт пакета не тянет numpy, requests и matplotlib.
 """
+import importlib
+from typing import Any, List
 
-from .config import load_configuration, validate_config, DEFAULT_CONFIG
 from .exceptions import (JiraAnalyticsError, ConfigError, JiraApiError,
                          DataProcessingError, VisualizationError)
-from .jira_client import fetch_jira_issues, calculate_resolution_days
-from .data_processor import DataProcessor
-from .visualizer import JiraVisualizer
-from .menu import display_menu, MenuHandler
+
+# Публичное имя -> модуль пакета, в котором оно определено
+_EXPORTS = {
+    'load_configuration': 'config',
+    'validate_config': 'config',
+    'DEFAULT_CONFIG': 'config',
+    'JiraClient': 'jira_client',
+    'fetch_jira_issues': 'jira_client',
+    'iter_jira_issues': 'jira_client',
+    'calculate_resolution_days': 'jira_client',
+    'fetch_projects': 'async_fetch',
+    'fetch_projects_async': 'async_fetch',
+    'IssueCache': 'cache',
+    'sync_issues': 'cache',
+    'refresh_issues': 'cache',
+    'IssueTable': 'issue_table',
+    'TransitionLog': 'transitions',
+    'dwell_by_status': 'time_in_status',
+    'save_snapshot': 'snapshot',
+    'load_snapshot': 'snapshot',
+    'ColumnStore': 'column_store',
+    'sync_column_store': 'column_store',
+    'IssueFilter': 'index',
+    'IssueIndex': 'index',
+    'Histogram': 'histograms',
+    'compute_histogram': 'histograms',
+    'Timeline': 'timeline',
+    'rolling_mean': 'timeline',
+    'rolling_sum': 'timeline',
+    'ReportBundle': 'aggregation',
+    'build_report_bundle': 'aggregation',
+    'FlowMetrics': 'flow_metrics',
+    'QuantileSketch': 'flow_metrics',
+    'AgeReport': 'survival',
+    'kaplan_meier': 'survival',
+    'DataProcessor': 'data_processor',
+    'JiraVisualizer': 'visualizer',
+    'Report': 'reports',
+    'REPORTS': 'reports',
+    'get_report': 'reports',
+    'required_fields': 'reports',
+    'render_reports': 'batch',
+    'render_portfolio': 'portfolio',
+    'write_portfolio_index': 'portfolio',
+    'RenderCache': 'render_cache',
+    'render_key': 'render_cache',
+    'LightweightVisualizer': 'light_visualizer',
+    'create_visualizer': 'visualizer',
+    'display_menu': 'menu',
+    'MenuHandler': 'menu',
+    'AnalyticsService': 'server',
+    'create_server': 'server',
+    'serve': 'server'
+}
 
 __all__ = [
-    'load_configuration',
-    'validate_config',
-    'DEFAULT_CONFIG',
     'JiraAnalyticsError',
     'ConfigError',
     'JiraApiError',
     'DataProcessingError',
     'VisualizationError',
-    'fetch_jira_issues',
-    'calculate_resolution_days',
-    'DataProcessor',
-    'JiraVisualizer',
-    'display_menu',
-    'MenuHandler'
+    *_EXPORTS
 ]
 
-__version__ = '1.0.0'
\ No newline at end of file
+__version__ = '1.0.0'
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Загрузка модуля пакета при первом обращении к его публичному имени
+
+    Args:
+        name: Имя атрибута пакета
+
+    Returns:
+        Значение атрибута
+
+    Raises:
+        AttributeError: Если имя не экспортируется пакетом
+    """
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
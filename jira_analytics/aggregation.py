@@ -0,0 +1,173 @@
+"""Модуль совместного расчета агрегатов всех отчетов"""
+from datetime import date
+from collections import defaultdict
+from typing import Dict, List, DefaultDict, Tuple
+import numpy as np
+from jira_analytics.histograms import Bins, Histogram, DEFAULT_BINS, compute_histogram
+from jira_analytics.issue_table import IssueTable, MISSING, SECONDS_PER_DAY
+from jira_analytics.time_in_status import dwell_by_status
+from jira_analytics.timeline import Timeline
+
+# Верхняя граница затраченного времени в днях
+MAX_TIME_SPENT_DAYS = 3650
+
+# Количество интервалов гистограмм по статусам
+STATUS_BINS = 10
+
+
+class ReportBundle:
+    """Агрегаты всех отчетов, рассчитанные за один проход по колонкам"""
+
+    def __init__(self, issue_count: int, resolution_times: np.ndarray,
+                 resolution_times_by_status: Dict[str, np.ndarray],
+                 created_dates: DefaultDict[date, int], closed_dates: DefaultDict[date, int],
+                 user_stats: Dict[str, int], time_spent: np.ndarray,
+                 priority_distribution: Dict[str, int],
+                 resolution_histogram: Histogram, status_histograms: Dict[str, Histogram],
+                 time_spent_histogram: Histogram, timeline: Timeline):
+        """
+        Инициализация набора агрегатов
+
+        Args:
+            issue_count: Количество задач
+            resolution_times: Времена разрешения в днях
+            resolution_times_by_status: Время в статусах по журналу изменений
+                (без журнала - время разрешения по итоговому статусу)
+            created_dates: Количество созданных задач по датам (UTC)
+            closed_dates: Количество закрытых задач по датам (UTC)
+            user_stats: Количество задач по пользователям
+            time_spent: Затраченное время в днях
+            priority_distribution: Количество задач по приоритетам
+            resolution_histogram: Гистограмма времени разрешения
+            status_histograms: Гистограммы времени разрешения по статусам
+            time_spent_histogram: Гистограмма затраченного времени
+            timeline: Плотный дневной ряд созданных и закрытых задач (UTC)
+        """
+        self.issue_count = issue_count
+        self.resolution_times = resolution_times
+        self.resolution_times_by_status = resolution_times_by_status
+        self.created_dates = created_dates
+        self.closed_dates = closed_dates
+        self.user_stats = user_stats
+        self.time_spent = time_spent
+        self.priority_distribution = priority_distribution
+        self.resolution_histogram = resolution_histogram
+        self.status_histograms = status_histograms
+        self.time_spent_histogram = time_spent_histogram
+        self.timeline = timeline
+
+
+def event_days(table: IssueTable) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Номера дней эпохи (UTC) создания и закрытия задач
+
+    Args:
+        table: Таблица задач
+
+    Returns:
+        Кортеж (дни создания, дни закрытия); задачи с некорректными
+        датами пропускаются
+    """
+    created_ok = np.isfinite(table.created)
+    closed_ok = created_ok & table.has_resolution & np.isfinite(table.resolved)
+    created_days = np.floor(table.created[created_ok] / SECONDS_PER_DAY).astype(np.int64)
+    closed_days = np.floor(table.resolved[closed_ok] / SECONDS_PER_DAY).astype(np.int64)
+    return created_days, closed_days
+
+
+def _group_by_code(codes: np.ndarray, values: np.ndarray, labels: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Группировка значений по кодам с сохранением исходного порядка
+
+    Args:
+        codes: Коды категориальной колонки
+        values: Значения в том же порядке
+        labels: Словарь строк для кодов
+
+    Returns:
+        Словарь {значение категории: массив значений}
+    """
+    order = np.argsort(codes, kind='stable')
+    codes, values = codes[order], values[order]
+    present, starts = np.unique(codes, return_index=True)
+    groups = np.split(values, starts[1:])
+    return {labels[code]: group for code, group in zip(present, groups)}
+
+
+def build_report_bundle(table: IssueTable, min_days: int = 0, max_days: int = 3650,
+                        bins: Bins = DEFAULT_BINS, log_scale: bool = False) -> ReportBundle:
+    """
+    Расчет агрегатов всех отчетов за один проход по колонкам таблицы
+
+    Общие промежуточные массивы (маски разрешенных задач, номера дней)
+    вычисляются один раз и используются всеми отчетами. Гистограммы
+    рассчитываются заранее, поэтому стоимость отрисовки не зависит
+    от количества задач.
+
+    Args:
+        table: Таблица задач
+        min_days: Минимальное время разрешения для отчетов 1 и 2
+        max_days: Максимальное время разрешения для отчетов 1 и 2
+        bins: Количество интервалов или явные границы гистограмм отчетов 1 и 5
+        log_scale: Логарифмические интервалы гистограмм
+
+    Returns:
+        Набор агрегатов
+    """
+    days = table.resolution_days
+    has_resolution = table.has_resolution
+    in_range = has_resolution & (days >= min_days) & (days <= max_days)
+
+    # Отчеты 1 и 2: время разрешения и время в статусах; при загруженном журнале
+    # изменений - фактическое время пребывания, иначе - по итоговому статусу
+    resolution_times = days[in_range]
+    if table.transitions is not None:
+        by_status = dwell_by_status(table, min_days, max_days)
+    else:
+        status_codes = table.codes['status']
+        with_status = in_range & (status_codes != MISSING)
+        by_status = _group_by_code(status_codes[with_status], days[with_status], table.labels('status'))
+
+    # Отчет 3: созданные и закрытые задачи по дням
+    created_days, closed_days = event_days(table)
+
+    # Отчет 4: исполнители и авторы по общему словарю пользователей
+    user_counts = table.count_codes('assignee') + table.count_codes('reporter')
+    user_labels = table.labels('assignee')
+    user_stats = {user_labels[code]: int(count)
+                  for code, count in enumerate(user_counts.tolist()) if count}
+
+    # Отчет 5: учтенное время, для задач без учета - время разрешения
+    has_timespent = np.isfinite(table.timespent)
+    spent = np.where(has_timespent, table.timespent / SECONDS_PER_DAY, days)
+    spent_mask = (has_timespent | has_resolution) & (spent > 0) & (spent <= MAX_TIME_SPENT_DAYS)
+
+    # Отчет 6: приоритеты, отсутствующий приоритет - отдельная категория
+    priority_distribution = defaultdict(int)
+    for label, count in zip(table.labels('priority'), table.count_codes('priority').tolist()):
+        if count:
+            priority_distribution[label] += count
+    missing_priority = int(np.count_nonzero(table.codes['priority'] == MISSING))
+    if missing_priority:
+        priority_distribution['Без приоритета'] += missing_priority
+
+    timeline = Timeline.from_days(created_days, closed_days)
+    created_dates, closed_dates = timeline.as_dicts()
+    time_spent = spent[spent_mask]
+    status_bins = bins if not isinstance(bins, int) else STATUS_BINS
+
+    return ReportBundle(
+        issue_count=len(table),
+        resolution_times=resolution_times,
+        resolution_times_by_status=by_status,
+        created_dates=created_dates,
+        closed_dates=closed_dates,
+        user_stats=user_stats,
+        time_spent=time_spent,
+        priority_distribution=dict(priority_distribution),
+        resolution_histogram=compute_histogram(resolution_times, bins, log_scale),
+        status_histograms={status: compute_histogram(times, status_bins, log_scale)
+                           for status, times in by_status.items()},
+        time_spent_histogram=compute_histogram(time_spent, bins, log_scale),
+        timeline=timeline
+    )
@@ -0,0 +1,188 @@
+"""Модуль асинхронной загрузки задач нескольких проектов"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Union
+from urllib.parse import urlparse
+from jira_analytics.exceptions import JiraApiError
+from jira_analytics.jira_client import (JiraClient, DEFAULT_STATUSES, build_search_params,
+                                        to_api_error)
+
+# Описание проекта: ключ или словарь {"key": ..., "jql": ..., "statuses": ..., "fields": ...,
+# "jira_url": ..., "updated_since": ..., "expand_changelog": ..., "name": ...}
+# (name - ключ результата, если по проекту выполняется несколько запросов)
+ProjectSpec = Union[str, Dict[str, Any]]
+
+
+class RateLimiter:
+    """Ограничитель частоты запросов к одному хосту (token bucket)"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Инициализация ограничителя
+
+        Args:
+            rate: Допустимое количество запросов в секунду
+            burst: Максимальное количество запросов подряд без ожидания
+        """
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Дождаться разрешения на очередной запрос"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class _FetchEngine:
+    """Планировщик страниц поиска с общими ограничениями"""
+
+    def __init__(self, jira_url: str, max_results: int, max_concurrency: int,
+                 rate_limit: Optional[float], clients: Dict[str, JiraClient]):
+        self.jira_url = jira_url
+        self.max_results = max_results
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self.clients = clients
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.limiters: Dict[str, RateLimiter] = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def _client(self, jira_url: str) -> JiraClient:
+        if jira_url not in self.clients:
+            self.clients[jira_url] = JiraClient(jira_url, pool_size=self.max_concurrency)
+        return self.clients[jira_url]
+
+    async def _search_page(self, jira_url: str, params: Dict[str, Any], start_at: int):
+        """Загрузка страницы в потоке пула с учетом общих ограничений"""
+        host = urlparse(jira_url).netloc
+        async with self.semaphore:
+            if self.rate_limit:
+                if host not in self.limiters:
+                    self.limiters[host] = RateLimiter(self.rate_limit)
+                await self.limiters[host].acquire()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, self._client(jira_url).search_page, params, start_at)
+
+    async def fetch_project(self, spec: ProjectSpec) -> List[Dict[str, Any]]:
+        """
+        Загрузка всех страниц одного проекта
+
+        Args:
+            spec: Описание проекта
+
+        Returns:
+            Задачи проекта в порядке выдачи JIRA
+        """
+        if isinstance(spec, str):
+            spec = {'key': spec}
+        jira_url = spec.get('jira_url', self.jira_url)
+        params = build_search_params(spec['key'], self.max_results,
+                                     updated_since=spec.get('updated_since'), jql=spec.get('jql'),
+                                     statuses=spec.get('statuses', DEFAULT_STATUSES),
+                                     expand_changelog=spec.get('expand_changelog', False),
+                                     fields=spec.get('fields'))
+
+        try:
+            total_issues, issues = await self._search_page(jira_url, params, 0)
+            page_size = len(issues)
+            if page_size and total_issues > page_size:
+                pages = await asyncio.gather(*(
+                    self._search_page(jira_url, params, start_at)
+                    for start_at in range(page_size, total_issues, page_size)
+                ))
+                for _, page in pages:
+                    issues.extend(page)
+        except Exception as e:
+            raise to_api_error(e, jira_url)
+
+        print(f"Проект {_project_key(spec)}: получено {len(issues)} из {total_issues} задач")
+        return issues
+
+
+def _project_key(spec: ProjectSpec) -> str:
+    """Ключ результата из описания (имя запроса или ключ проекта)"""
+    return spec if isinstance(spec, str) else spec.get('name', spec['key'])
+
+
+async def fetch_projects_async(jira_url: str, projects: List[ProjectSpec], max_results: int,
+                               max_concurrency: int = 8,
+                               rate_limit: Optional[float] = 10.0) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Параллельная загрузка задач нескольких проектов
+
+    Страницы всех проектов планируются одновременно: общее число запросов
+    в полете ограничено max_concurrency, частота запросов к каждому хосту -
+    rate_limit. Запросы выполняются через пул соединений JiraClient.
+
+    Args:
+        jira_url: URL JIRA сервера по умолчанию
+        projects: Ключи проектов или словари {"key", "jql", "statuses", "fields", "jira_url",
+            "updated_since", "expand_changelog", "name"}
+        max_results: Размер страницы
+        max_concurrency: Максимальное количество одновременных запросов
+        rate_limit: Запросов в секунду на хост (None - без ограничения)
+
+    Returns:
+        Словарь {ключ проекта (или name): список задач}; проекты с ошибкой
+        загрузки пропускаются
+
+    Raises:
+        JiraApiError: Если не удалось загрузить ни один проект
+    """
+    clients: Dict[str, JiraClient] = {}
+    engine = _FetchEngine(jira_url, max_results, max_concurrency, rate_limit, clients)
+    try:
+        print(f"Загрузка {len(projects)} проектов ({max_concurrency} параллельных запросов)...")
+        results = await asyncio.gather(*(engine.fetch_project(spec) for spec in projects),
+                                       return_exceptions=True)
+    finally:
+        engine.executor.shutdown(wait=True)
+        for client in clients.values():
+            client.close()
+
+    issues_by_project = {}
+    errors = []
+    for spec, result in zip(projects, results):
+        if isinstance(result, BaseException):
+            print(f"Ошибка загрузки проекта {_project_key(spec)}: {result}")
+            errors.append(result)
+        else:
+            issues_by_project[_project_key(spec)] = result
+
+    if errors and not issues_by_project:
+        raise JiraApiError(f"Не удалось загрузить ни один проект: {errors[0]}")
+
+    return issues_by_project
+
+
+def fetch_projects(jira_url: str, projects: List[ProjectSpec], max_results: int,
+                   max_concurrency: int = 8,
+                   rate_limit: Optional[float] = 10.0) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Синхронная обертка над fetch_projects_async
+
+    Args:
+        jira_url: URL JIRA сервера по умолчанию
+        projects: Ключи проектов или словари {"key", "jql", "statuses", "fields", "jira_url",
+            "updated_since", "expand_changelog", "name"}
+        max_results: Размер страницы
+        max_concurrency: Максимальное количество одновременных запросов
+        rate_limit: Запросов в секунду на хост (None - без ограничения)
+
+    Returns:
+        Словарь {ключ проекта: список задач}
+    """
+    return asyncio.run(fetch_projects_async(jira_url, projects, max_results,
+                                            max_concurrency, rate_limit))
@@ -0,0 +1,116 @@
+"""Модуль пакетного построения отчетов без интерактивного режима"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from jira_analytics.data_processor import DataProcessor
+from jira_analytics.exceptions import VisualizationError
+from jira_analytics.index import IssueFilter
+from jira_analytics.render_cache import RenderCache, render_key
+from jira_analytics.reports import REPORTS, get_report
+from jira_analytics.visualizer import create_visualizer
+
+
+def _init_worker() -> None:
+    """Выбор неинтерактивного бэкенда Agg до первого импорта pyplot в процессе отрисовки"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render_worker(project_key: str, output_dir: str, formats: Sequence[str],
+                   report_name: str, data: Tuple[Any, ...],
+                   options: Dict[str, Any]) -> List[str]:
+    """
+    Построение одного отчета в процессе пула
+
+    Args:
+        project_key: Ключ проекта
+        output_dir: Каталог для файлов
+        formats: Форматы файлов
+        report_name: Имя отчета
+        data: Аргументы метода визуализатора
+        options: Дополнительные параметры визуализатора
+
+    Returns:
+        Пути сохраненных файлов
+    """
+    from jira_analytics.visualizer import JiraVisualizer
+
+    visualizer = JiraVisualizer(project_key, output_dir=output_dir, formats=formats, **options)
+    get_report(report_name).render(visualizer, data)
+    return visualizer.saved_files
+
+
+def render_reports(processor: DataProcessor, project_key: str, output_dir: str,
+                   formats: Sequence[str] = ('png',), max_workers: Optional[int] = None,
+                   report_names: Optional[Sequence[str]] = None,
+                   visualizer_options: Optional[Dict[str, Any]] = None,
+                   issue_filter: Optional[IssueFilter] = None,
+                   render_cache: Optional[RenderCache] = None,
+                   backend: str = 'matplotlib', in_process: bool = False) -> List[str]:
+    """
+    Построение набора отчетов в файлы с параллельной отрисовкой
+
+    Данные отчетов готовятся в текущем процессе, а построение графиков
+    matplotlib (однопоточное и ресурсоемкое) распределяется по пулу процессов.
+    Отчеты, найденные в кэше графиков, копируются из кэша без расчета данных
+    и отрисовки. Облегченный бэкенд (light) строит графики в текущем
+    процессе: без matplotlib запуск пула обходится дороже самой отрисовки.
+
+    Args:
+        processor: Процессор данных
+        project_key: Ключ проекта
+        output_dir: Каталог для файлов
+        formats: Форматы файлов (png, svg, pdf)
+        max_workers: Количество процессов (по умолчанию - число ядер)
+        report_names: Имена отчетов (по умолчанию - все)
+        visualizer_options: Параметры визуализатора (timeline_days, rolling_window,
+            timeline_period)
+        issue_filter: Условия отбора задач
+        render_cache: Кэш построенных графиков
+        backend: Бэкенд визуализации (matplotlib или light)
+        in_process: Строить графики в текущем процессе без пула (когда
+            параллельность обеспечивается снаружи, например по проектам)
+
+    Returns:
+        Пути сохраненных файлов в порядке отчетов
+
+    Raises:
+        VisualizationError: При ошибке построения отчета или неизвестном имени
+    """
+    reports = REPORTS if report_names is None else [get_report(name) for name in report_names]
+    if None in reports:
+        raise VisualizationError(f"Неизвестные отчеты: {list(report_names)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    options = visualizer_options or {}
+    report_files: List[Optional[List[str]]] = [None] * len(reports)
+    keys = [None] * len(reports)
+    if render_cache is not None:
+        for position, report in enumerate(reports):
+            keys[position] = render_key(processor, report, project_key, formats, options, issue_filter,
+                                        backend)
+            report_files[position] = render_cache.restore_files(keys[position], output_dir)
+
+    pending = [position for position, files in enumerate(report_files) if files is None]
+    if pending and (backend != 'matplotlib' or in_process):
+        visualizer = create_visualizer(project_key, backend, output_dir=output_dir,
+                                       formats=tuple(formats), **options)
+        for position in pending:
+            rendered = len(visualizer.saved_files)
+            reports[position].render(visualizer, reports[position].collect_data(processor, issue_filter))
+            report_files[position] = visualizer.saved_files[rendered:]
+    elif pending:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+            futures = {
+                position: executor.submit(_render_worker, project_key, output_dir, tuple(formats),
+                                          reports[position].name,
+                                          reports[position].collect_data(processor, issue_filter), options)
+                for position in pending
+            }
+            for position, future in futures.items():
+                report_files[position] = future.result()
+    if render_cache is not None:
+        for position in pending:
+            render_cache.store_files(keys[position], report_files[position])
+
+    return [path for files in report_files for path in files]
@@ -0,0 +1,497 @@
+"""Модуль локального кэша задач JIRA"""
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Sequence, Set, Tuple
+from jira_analytics.exceptions import DataProcessingError
+from jira_analytics.jira_client import (JiraClient, DEFAULT_STATUSES, SEARCH_FIELDS,
+                                        build_filter_clause, fetch_jira_issues)
+
+# Запас по времени для инкрементальной синхронизации: JQL интерпретирует дату
+# в часовом поясе сервера, поэтому перекрытие покрывает любое смещение
+SYNC_OVERLAP = timedelta(days=1)
+
+# Условие отбора по умолчанию; для него сохраняется прежнее имя файла кэша
+DEFAULT_QUERY = build_filter_clause()
+
+
+def cache_name(jira_url: str, project_key: str, query: str = DEFAULT_QUERY) -> str:
+    """
+    Имя файла кэша без расширения для проекта, сервера и условия отбора
+
+    Args:
+        jira_url: URL JIRA сервера
+        project_key: Ключ проекта
+        query: Условие отбора задач
+
+    Returns:
+        Имя вида KEY-hash; для условия по умолчанию сохраняется прежнее имя
+    """
+    scope = jira_url if query == DEFAULT_QUERY else f"{jira_url}|{query}"
+    url_hash = hashlib.sha1(scope.encode('utf-8')).hexdigest()[:10]
+    return f"{project_key}-{url_hash}"
+
+
+class IssueCache:
+    """Хранилище задач JIRA в SQLite, привязанное к проекту и серверу"""
+
+    def __init__(self, cache_dir: str, jira_url: str, project_key: str,
+                 query: str = DEFAULT_QUERY):
+        """
+        Инициализация кэша
+
+        Args:
+            cache_dir: Каталог для файлов кэша
+            jira_url: URL JIRA сервера
+            project_key: Ключ проекта
+            query: Условие отбора задач; наборы с разными условиями
+                хранятся в разных файлах
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"{cache_name(jira_url, project_key, query)}.sqlite")
+
+        try:
+            self.connection = sqlite3.connect(self.path)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS issues ("
+                "key TEXT PRIMARY KEY, updated TEXT, data TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)"
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            raise DataProcessingError(f"Ошибка открытия кэша {self.path}: {e}")
+
+    def load_issues(self) -> List[Dict[str, Any]]:
+        """
+        Загрузить все задачи из кэша
+
+        Returns:
+            Список задач JIRA
+        """
+        rows = self.connection.execute("SELECT data FROM issues ORDER BY rowid")
+        return [json.loads(data) for (data,) in rows]
+
+    def upsert_issues(self, issues: List[Dict[str, Any]]) -> None:
+        """
+        Добавить или обновить задачи в кэше
+
+        Args:
+            issues: Список задач JIRA
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO issues (key, updated, data) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET updated = excluded.updated, data = excluded.data",
+                [(issue['key'], issue.get('fields', {}).get('updated'), json.dumps(issue))
+                 for issue in issues]
+            )
+
+    def delete_issues(self, keys: Sequence[str]) -> None:
+        """
+        Удалить задачи из кэша
+
+        Args:
+            keys: Ключи задач
+        """
+        with self.connection:
+            self.connection.executemany("DELETE FROM issues WHERE key = ?", [(key,) for key in keys])
+
+    def get_meta(self, name: str) -> Optional[str]:
+        """
+        Получить служебное значение кэша
+
+        Args:
+            name: Имя значения
+
+        Returns:
+            Значение или None, если оно не сохранялось
+        """
+        row = self.connection.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str) -> None:
+        """
+        Сохранить служебное значение кэша
+
+        Args:
+            name: Имя значения
+            value: Значение
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO meta (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (name, value)
+            )
+
+    def get_last_sync(self) -> Optional[str]:
+        """
+        Получить отметку последней синхронизации
+
+        Returns:
+            Значение updated самой свежей задачи или None для пустого кэша
+        """
+        return self.get_meta('last_sync')
+
+    def set_last_sync(self, value: str) -> None:
+        """
+        Сохранить отметку последней синхронизации
+
+        Args:
+            value: Значение updated самой свежей задачи
+        """
+        self.set_meta('last_sync', value)
+
+    def get_fields(self) -> Optional[List[str]]:
+        """
+        Получить набор полей, с которым загружены задачи кэша
+
+        Returns:
+            Список полей или None, если набор не сохранялся
+        """
+        value = self.get_meta('fields')
+        return value.split(',') if value else None
+
+    def set_fields(self, fields: Sequence[str]) -> None:
+        """
+        Сохранить набор полей загруженных задач
+
+        Args:
+            fields: Имена полей
+        """
+        self.set_meta('fields', ','.join(fields))
+
+    def close(self) -> None:
+        """Закрыть соединение с кэшем"""
+        self.connection.close()
+
+
+def to_jql_date(updated: str) -> str:
+    """
+    Преобразование значения updated в дату для JQL с запасом SYNC_OVERLAP
+
+    Args:
+        updated: Дата обновления в формате ISO
+
+    Returns:
+        Дата в формате "yyyy-MM-dd HH:mm"
+    """
+    moment = datetime.strptime(updated[:16], '%Y-%m-%dT%H:%M') - SYNC_OVERLAP
+    return moment.strftime('%Y-%m-%d %H:%M')
+
+
+def fields_order(name: str) -> int:
+    """
+    Порядок поля в SEARCH_FIELDS для стабильной записи набора полей
+
+    Args:
+        name: Имя поля
+
+    Returns:
+        Позиция поля (неизвестные поля - в конце)
+    """
+    return SEARCH_FIELDS.index(name) if name in SEARCH_FIELDS else len(SEARCH_FIELDS)
+
+
+def resolve_fields(requested: Optional[Sequence[str]],
+                   stored: Optional[Sequence[str]]) -> Tuple[List[str], bool]:
+    """
+    Набор полей для синхронизации с учетом полей уже загруженных задач
+
+    Args:
+        requested: Запрошенные поля (None - SEARCH_FIELDS)
+        stored: Поля загруженных задач (None - набор не сохранялся)
+
+    Returns:
+        Кортеж (поля для запроса, нужна ли полная загрузка): если запрошены
+        отсутствующие поля, проект загружается заново с объединенным набором
+    """
+    fields = list(requested or SEARCH_FIELDS)
+    if stored is None:
+        return fields, False
+    if not set(fields) <= set(stored):
+        print("В кэше нет части запрошенных полей, проект загружается заново")
+        return sorted(set(fields) | set(stored), key=fields_order), True
+    return list(stored), False
+
+
+def cache_query(jql: Optional[str], statuses: Optional[Sequence[str]],
+                expand_changelog: bool) -> str:
+    """
+    Условие отбора, определяющее файл кэша
+
+    Args:
+        jql: Дополнительное условие JQL
+        statuses: Статусы задач
+        expand_changelog: Задачи загружаются с журналом изменений
+
+    Returns:
+        Строка условия для IssueCache
+    """
+    query = build_filter_clause(statuses, jql)
+    return f"{query}|changelog" if expand_changelog else query
+
+
+def prepare_sync(cache: IssueCache,
+                 fields: Optional[Sequence[str]]) -> Tuple[Optional[str], List[str]]:
+    """
+    Отметка и набор полей для загрузки изменений в кэш
+
+    Если запрошены поля, которых нет у задач кэша, проект загружается
+    заново с объединенным набором полей.
+
+    Args:
+        cache: Открытый кэш
+        fields: Запрашиваемые поля задач (по умолчанию SEARCH_FIELDS)
+
+    Returns:
+        Кортеж (отметка последней синхронизации или None для полной
+        загрузки, поля для запроса)
+    """
+    last_sync = cache.get_last_sync()
+    fields, reload = resolve_fields(fields, cache.get_fields())
+    if reload:
+        last_sync = None
+    if last_sync:
+        print(f"Найден кэш задач, синхронизация изменений с {last_sync}")
+    return last_sync, fields
+
+
+def delta_fields(fields: Sequence[str], statuses: Optional[Sequence[str]]) -> List[str]:
+    """
+    Поля запроса изменений: для отбора по статусам на стороне клиента нужен status
+
+    Args:
+        fields: Поля задач набора
+        statuses: Статусы задач набора
+
+    Returns:
+        Поля для запроса изменений
+    """
+    if statuses and 'status' not in fields:
+        return [*fields, 'status']
+    return list(fields)
+
+
+def select_delta(issues: Iterable[Dict[str, Any]], statuses: Optional[Sequence[str]],
+                 matching: Optional[Set[str]], removed: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Отбор изменений проекта по условию набора задач
+
+    Изменения загружаются по всему проекту без условия отбора, чтобы задачи,
+    вышедшие из набора (например, сменившие статус), не оставались в кэше.
+    Статусы проверяются локально, дополнительное условие JQL - по ключам
+    задач, которые ему удовлетворяют.
+
+    Args:
+        issues: Измененные задачи проекта
+        statuses: Статусы задач набора; None - задачи в любом статусе
+        matching: Ключи задач, удовлетворяющих условию JQL (None - условия нет)
+        removed: Список, в который добавляются задачи, не входящие в набор
+
+    Yields:
+        Задачи, входящие в набор
+    """
+    allowed = {status.casefold() for status in statuses} if statuses else None
+    for issue in issues:
+        status = ((issue.get('fields') or {}).get('status') or {}).get('name') or ''
+        if ((allowed is None or status.casefold() in allowed)
+                and (matching is None or issue['key'] in matching)):
+            yield issue
+        else:
+            removed.append(issue)
+
+
+def fetch_delta(fetch: Callable[..., Iterable[Dict[str, Any]]], jira_url: str, project_key: str,
+                max_results: int, max_workers: int, updated_since: str, client: Optional[JiraClient],
+                jql: Optional[str], statuses: Optional[Sequence[str]], expand_changelog: bool,
+                fields: Sequence[str], removed: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Загрузка изменений проекта с отбором по условию набора (см. select_delta)
+
+    Args:
+        fetch: Функция загрузки задач (fetch_jira_issues или iter_jira_issues)
+        jira_url: URL JIRA сервера
+        project_key: Ключ проекта
+        max_results: Размер страницы
+        max_workers: Количество параллельных запросов
+        updated_since: Нижняя граница поля updated (формат JQL)
+        client: Клиент JIRA
+        jql: Дополнительное условие JQL
+        statuses: Статусы задач
+        expand_changelog: Загружать журнал изменений
+        fields: Поля задач набора
+        removed: Список, в который добавляются задачи, вышедшие из набора
+
+    Returns:
+        Новые и измененные задачи набора
+    """
+    matching = None
+    if jql:
+        # Условие JQL не проверяется локально: ключи подходящих задач запрашиваются отдельно
+        matching = {issue['key'] for issue in fetch(
+            jira_url, project_key, max_results, max_workers, updated_since=updated_since,
+            client=client, jql=jql, statuses=statuses, fields=['updated'])}
+    issues = fetch(jira_url, project_key, max_results, max_workers, updated_since=updated_since,
+                   client=client, jql=None, statuses=None, expand_changelog=expand_changelog,
+                   fields=delta_fields(fields, statuses))
+    return select_delta(issues, statuses, matching, removed)
+
+
+def latest_updated(issues: Iterable[Dict[str, Any]], last_sync: Optional[str]) -> Optional[str]:
+    """
+    Новая отметка синхронизации
+
+    Args:
+        issues: Загруженные задачи
+        last_sync: Прежняя отметка
+
+    Returns:
+        Наибольшее значение updated среди задач и прежней отметки
+    """
+    updated_values = [issue['fields']['updated'] for issue in issues
+                      if (issue.get('fields') or {}).get('updated')]
+    return max([last_sync or ''] + updated_values) or None
+
+
+def apply_sync(cache: IssueCache, fresh: List[Dict[str, Any]], fields: Sequence[str],
+               last_sync: Optional[str], removed: Sequence[Dict[str, Any]] = ()) -> None:
+    """
+    Сохранение загруженных изменений в кэш
+
+    Args:
+        cache: Открытый кэш
+        fresh: Новые и измененные задачи
+        fields: Поля, с которыми загружены задачи
+        last_sync: Отметка, от которой выполнялась загрузка (см. prepare_sync)
+        removed: Измененные задачи, вышедшие из набора (удаляются из кэша)
+    """
+    cache.upsert_issues(fresh)
+    cache.delete_issues([issue['key'] for issue in removed])
+    cache.set_fields(fields)
+
+    latest = latest_updated([*fresh, *removed], last_sync)
+    if latest and latest != last_sync:
+        cache.set_last_sync(latest)
+
+
+def _sync_cache(cache: IssueCache, jira_url: str, project_key: str, max_results: int,
+                max_workers: int, client: Optional[JiraClient], jql: Optional[str],
+                statuses: Optional[Sequence[str]], expand_changelog: bool,
+                fields: Optional[Sequence[str]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Загрузка изменений с последней синхронизации в кэш
+
+    Задачи, вышедшие из набора после изменения, удаляются из кэша.
+
+    Args:
+        cache: Открытый кэш
+        jira_url: URL JIRA сервера
+        project_key: Ключ проекта
+        max_results: Размер страницы
+        max_workers: Количество параллельных запросов
+        client: Клиент JIRA
+        jql: Дополнительное условие JQL
+        statuses: Статусы задач
+        expand_changelog: Загружать журнал изменений
+        fields: Запрашиваемые поля задач (по умолчанию SEARCH_FIELDS)
+
+    Returns:
+        Кортеж (новые и измененные задачи, ключи удаленных задач)
+    """
+    last_sync, fields = prepare_sync(cache, fields)
+    removed: List[Dict[str, Any]] = []
+    if last_sync:
+        fresh = list(fetch_delta(fetch_jira_issues, jira_url, project_key, max_results, max_workers,
+                                 to_jql_date(last_sync), client, jql, statuses, expand_changelog,
+                                 fields, removed))
+    else:
+        fresh = fetch_jira_issues(jira_url, project_key, max_results, max_workers,
+                                  updated_since=None, client=client, jql=jql, statuses=statuses,
+                                  expand_changelog=expand_changelog, fields=fields)
+    apply_sync(cache, fresh, fields, last_sync, removed)
+    return fresh, [issue['key'] for issue in removed]
+
+
+def sync_issues(jira_url: str, project_key: str, max_results: int,
+                max_workers: int = 4, cache_dir: str = ".jira_cache",
+                client: Optional[JiraClient] = None, jql: Optional[str] = None,
+                statuses: Optional[Sequence[str]] = DEFAULT_STATUSES,
+                expand_changelog: bool = False,
+                fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Получение задач проекта с использованием локального кэша
+
+    При пустом кэше загружается весь проект, иначе запрашиваются только
+    задачи, обновленные после последней синхронизации (по всему проекту:
+    задачи, вышедшие из набора, удаляются из кэша).
+
+    Args:
+        jira_url: URL JIRA сервера
+        project_key: Ключ проекта
+        max_results: Размер страницы
+        max_workers: Количество параллельных запросов
+        cache_dir: Каталог для файлов кэша
+        client: Клиент JIRA (по умолчанию создается временный)
+        jql: Дополнительное условие JQL
+        statuses: Статусы задач; None - задачи в любом статусе
+        expand_changelog: Загружать переходы между статусами из журнала изменений
+        fields: Запрашиваемые поля задач (по умолчанию SEARCH_FIELDS)
+
+    Returns:
+        Список задач JIRA из обновленного кэша
+
+    Raises:
+        JiraApiError: При ошибках API JIRA
+    """
+    cache = IssueCache(cache_dir, jira_url, project_key,
+                       cache_query(jql, statuses, expand_changelog))
+    try:
+        _sync_cache(cache, jira_url, project_key, max_results, max_workers, client,
+                    jql, statuses, expand_changelog, fields)
+        return cache.load_issues()
+    finally:
+        cache.close()
+
+
+def refresh_issues(jira_url: str, project_key: str, max_results: int,
+                   max_workers: int = 4, cache_dir: str = ".jira_cache",
+                   client: Optional[JiraClient] = None, jql: Optional[str] = None,
+                   statuses: Optional[Sequence[str]] = DEFAULT_STATUSES,
+                   expand_changelog: bool = False,
+                   fields: Optional[Sequence[str]] = None) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Быстрое обновление: загрузка в кэш только изменений с последней синхронизации
+
+    В отличие от sync_issues, кэш целиком не читается: возвращаются только
+    изменения для DataProcessor.update_issues.
+
+    Args:
+        jira_url: URL JIRA сервера
+        project_key: Ключ проекта
+        max_results: Размер страницы
+        max_workers: Количество параллельных запросов
+        cache_dir: Каталог для файлов кэша
+        client: Клиент JIRA (по умолчанию создается временный)
+        jql: Дополнительное условие JQL
+        statuses: Статусы задач; None - задачи в любом статусе
+        expand_changelog: Загружать переходы между статусами из журнала изменений
+        fields: Запрашиваемые поля задач (по умолчанию SEARCH_FIELDS)
+
+    Returns:
+        Кортеж (новые и измененные задачи JIRA, ключи задач, вышедших из набора)
+
+    Raises:
+        JiraApiError: При ошибках API JIRA
+    """
+    cache = IssueCache(cache_dir, jira_url, project_key,
+                       cache_query(jql, statuses, expand_changelog))
+    try:
+        return _sync_cache(cache, jira_url, project_key, max_results, max_workers,
+                           client, jql, statuses, expand_changelog, fields)
+    finally:
+        cache.close()
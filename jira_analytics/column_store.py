@@ -0,0 +1,586 @@
+"""Модуль колоночного хранилища задач на файлах, отображаемых в память"""
+import json
+import os
+import re
+import weakref
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from jira_analytics.cache import (cache_name, cache_query, fetch_delta, latest_updated, resolve_fields,
+                                  to_jql_date)
+from jira_analytics.exceptions import DataProcessingError
+from jira_analytics.issue_table import CATEGORICAL_COLUMNS, IssueTable, merge_dictionaries
+from jira_analytics.jira_client import JiraClient, DEFAULT_STATUSES, iter_jira_issues
+from jira_analytics.transitions import TransitionLog
+
+# Версия формата хранилища (1 - признак superseded хранился колонкой)
+STORE_VERSION = 2
+
+MANIFEST_NAME = 'manifest.json'
+
+# Начальная ширина колонки ключей (символов); при более длинном ключе
+# колонка ключей переписывается с новой шириной
+KEY_WIDTH = 16
+
+# Количество строк, переписываемых за один шаг уплотнения
+COMPACT_BLOCK = 1 << 20
+
+# Доля замененных строк, при превышении которой добавление уплотняет хранилище
+COMPACT_RATIO = 0.25
+
+# Колонки задач и их типы
+ISSUE_COLUMNS = {
+    'created': np.float64,
+    'resolved': np.float64,
+    'has_resolution': np.bool_,
+    'timespent': np.float64,
+    **{f'codes.{column}': np.int32 for column in CATEGORICAL_COLUMNS}
+}
+
+# Колонки журнала переходов
+TRANSITION_COLUMNS = {
+    'transitions.rows': np.int32,
+    'transitions.times': np.float64,
+    'transitions.from_codes': np.int32,
+    'transitions.to_codes': np.int32
+}
+
+# Номер поколения в имени файла колонки (name.gN.bin; name.bin - поколение 0)
+_GENERATION_SUFFIX = re.compile(r'\.g(\d+)\.bin$')
+
+# Поколения файлов, отображенных открытыми таблицами: {каталог: {поколение: число таблиц}}
+_mapped_generations: Dict[str, Dict[int, int]] = {}
+
+
+def _release_generation(path: str, generation: int) -> None:
+    """Учет закрытия таблицы, отображавшей файлы поколения"""
+    counts = _mapped_generations.get(path, {})
+    counts[generation] -= 1
+    if not counts[generation]:
+        del counts[generation]
+
+
+def to_ranges(rows: np.ndarray) -> List[List[int]]:
+    """
+    Сжатие номеров строк в диапазоны
+
+    Args:
+        rows: Возрастающие номера строк без повторов
+
+    Returns:
+        Список [начало, конец) последовательных номеров
+    """
+    if not len(rows):
+        return []
+    breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+    starts = rows[np.concatenate(([0], breaks))]
+    stops = rows[np.concatenate((breaks - 1, [len(rows) - 1]))] + 1
+    return [[int(start), int(stop)] for start, stop in zip(starts, stops)]
+
+
+def ranges_mask(ranges: Sequence[Sequence[int]], length: int) -> np.ndarray:
+    """
+    Маска строк, входящих в диапазоны
+
+    Args:
+        ranges: Диапазоны [начало, конец)
+        length: Количество строк
+
+    Returns:
+        Булев массив длины length
+    """
+    mask = np.zeros(length, dtype=bool)
+    for start, stop in ranges:
+        mask[start:stop] = True
+    return mask
+
+
+class ColumnStore:
+    """
+    Колоночное хранилище задач в каталоге на диске
+
+    Каждая колонка - отдельный файл с массивом фиксированного типа,
+    манифест хранит количество строк, словари строк, отметку синхронизации,
+    поколение файлов колонок и диапазоны строк, замененных более новыми
+    версиями задач. Добавление дописывает строки в конец файлов и только
+    затем атомарно записывает манифест, поэтому прежние строки не
+    изменяются. Чтение отображает файлы в память без копирования (при
+    замененных строках копируются только актуальные) и ничего не пишет
+    на диск. Замененные строки удаляются уплотнением в файлы следующего
+    поколения - явным вызовом compact или при добавлении, если их доля
+    превышает COMPACT_RATIO. Файлы прежних поколений удаляются, когда их
+    не отображает ни одна открытая таблица процесса.
+    """
+
+    def __init__(self, path: str):
+        """
+        Открытие или создание хранилища
+
+        Args:
+            path: Каталог хранилища
+
+        Raises:
+            DataProcessingError: Если манифест поврежден или другой версии
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        manifest_path = os.path.join(path, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            try:
+                with open(manifest_path, encoding='utf-8') as file:
+                    self.manifest = json.load(file)
+            except (OSError, ValueError) as e:
+                raise DataProcessingError(f"Ошибка чтения манифеста {manifest_path}: {e}")
+            if self.manifest.get('version') == 1:
+                self._upgrade_manifest()
+            if self.manifest.get('version') != STORE_VERSION:
+                raise DataProcessingError(
+                    f"Неподдерживаемая версия хранилища {path}: {self.manifest.get('version')}")
+        else:
+            self.manifest = self._empty_manifest()
+
+    def _upgrade_manifest(self) -> None:
+        """Перенос признаков superseded из колонки версии 1 в диапазоны манифеста"""
+        length = self.manifest['row_count']
+        rows = np.zeros(0, dtype=np.int64)
+        if length:
+            column = np.memmap(self._column_path('superseded'), dtype=np.bool_, mode='r', shape=(length,))
+            rows = np.flatnonzero(column)
+            del column
+        self.manifest = dict(self.manifest, version=STORE_VERSION, superseded=to_ranges(rows),
+                             superseded_count=len(rows))
+
+    @staticmethod
+    def _empty_manifest() -> Dict[str, Any]:
+        """Манифест пустого хранилища"""
+        return {
+            'version': STORE_VERSION,
+            'row_count': 0,
+            'superseded': [],
+            'superseded_count': 0,
+            'transition_count': 0,
+            'has_transitions': False,
+            'key_width': KEY_WIDTH,
+            'dictionaries': {name: [] for name in set(CATEGORICAL_COLUMNS.values())},
+            'last_sync': None,
+            'fields': None,
+            'generation': 0
+        }
+
+    def __len__(self) -> int:
+        """Количество актуальных задач"""
+        return self.manifest['row_count'] - self.manifest['superseded_count']
+
+    @property
+    def last_sync(self) -> Optional[str]:
+        """Значение updated самой свежей задачи на момент последней синхронизации"""
+        return self.manifest['last_sync']
+
+    @property
+    def fields(self) -> Optional[List[str]]:
+        """Поля JIRA, с которыми загружены задачи"""
+        return self.manifest['fields']
+
+    def _column_path(self, name: str, generation: Optional[int] = None) -> str:
+        if generation is None:
+            if name == 'keys' and self.manifest.get('keys_file'):
+                # Колонка ключей, расширенная после последнего уплотнения
+                return os.path.join(self.path, self.manifest['keys_file'])
+            generation = self.manifest.get('generation', 0)
+        suffix = f'.g{generation}' if generation else ''
+        return os.path.join(self.path, f'{name}{suffix}.bin')
+
+    def _remove_stale_files(self) -> None:
+        """
+        Удаление файлов колонок, не относящихся к текущему поколению
+
+        Файлы поколений, которые отображают открытые таблицы процесса,
+        сохраняются до закрытия таблиц.
+        """
+        current = {os.path.basename(self._column_path(name))
+                   for name in ['keys', *ISSUE_COLUMNS, *TRANSITION_COLUMNS]}
+        mapped = _mapped_generations.get(os.path.realpath(self.path), {})
+        for file_name in os.listdir(self.path):
+            if not file_name.endswith('.bin') or file_name in current:
+                continue
+            match = _GENERATION_SUFFIX.search(file_name)
+            generation = int(match.group(1)) if match else 0
+            if generation not in mapped:
+                os.remove(os.path.join(self.path, file_name))
+
+    def _superseded(self, length: int) -> np.ndarray:
+        """Маска замененных строк по диапазонам манифеста"""
+        return ranges_mask(self.manifest['superseded'], length)
+
+    def _dtype(self, name: str) -> np.dtype:
+        if name == 'keys':
+            return np.dtype(f"<U{self.manifest['key_width']}")
+        return np.dtype(ISSUE_COLUMNS.get(name) or TRANSITION_COLUMNS[name])
+
+    def _map(self, name: str, length: int, mode: str = 'r') -> np.ndarray:
+        """
+        Отображение колонки в память
+
+        Args:
+            name: Имя колонки
+            length: Количество элементов (хвост файла после сбоя игнорируется)
+            mode: Режим np.memmap
+
+        Returns:
+            Массив колонки
+        """
+        if length == 0:
+            return np.zeros(0, dtype=self._dtype(name))
+        return np.memmap(self._column_path(name), dtype=self._dtype(name), mode=mode,
+                         shape=(length,))
+
+    def _append_column(self, name: str, values: np.ndarray, length: int) -> None:
+        """
+        Дописывание значений в конец файла колонки
+
+        Args:
+            name: Имя колонки
+            values: Новые значения
+            length: Текущее количество элементов по манифесту
+        """
+        dtype = self._dtype(name)
+        with open(self._column_path(name), 'ab') as file:
+            # Отбрасывается недописанный хвост прерванного добавления
+            file.truncate(length * dtype.itemsize)
+            file.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+    def _widen_keys(self, width: int) -> None:
+        """
+        Перезапись колонки ключей с большей шириной в новый файл
+
+        Файл с прежней шириной не изменяется: манифест на диске указывает
+        на новый файл только после записи (см. append).
+        """
+        keys = np.array(self._map('keys', self.manifest['row_count']), dtype=f'<U{width}')
+        generation = self.manifest.get('generation', 0)
+        file_name = f"keys.u{width}{f'.g{generation}' if generation else ''}.bin"
+        keys.tofile(os.path.join(self.path, file_name))
+        self.manifest['key_width'] = width
+        self.manifest['keys_file'] = file_name
+
+    def _write_manifest(self) -> None:
+        """Атомарная запись манифеста: новые строки видны только после нее"""
+        manifest_path = os.path.join(self.path, MANIFEST_NAME)
+        temp_path = manifest_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.manifest, file, ensure_ascii=False)
+        os.replace(temp_path, manifest_path)
+
+    def append(self, table: IssueTable, last_sync: Optional[str] = None,
+               fields: Optional[Sequence[str]] = None, removed: Sequence[str] = ()) -> None:
+        """
+        Добавление новых и измененных задач
+
+        Существующие строки не изменяются: новые дописываются в конец файлов,
+        прежние версии измененных задач добавляются к диапазонам замененных
+        строк. Строки и диапазоны становятся видны одновременно - с записью
+        манифеста, поэтому сбой на любом шаге оставляет прежнее состояние.
+        Если доля замененных строк превышает COMPACT_RATIO, хранилище
+        уплотняется (см. compact).
+
+        Args:
+            table: Таблица новых и измененных задач
+            last_sync: Новая отметка синхронизации
+            fields: Поля JIRA загруженных задач
+            removed: Ключи задач, вышедших из набора (их строки считаются замененными)
+        """
+        self._remove_stale_files()
+        previous = self.manifest
+        # Изменения копии манифеста видны на диске только после записи;
+        # при сбое в памяти восстанавливается прежний манифест
+        self.manifest = manifest = dict(previous)
+        try:
+            self._append_rows(table, removed)
+            if last_sync:
+                manifest['last_sync'] = max(last_sync, manifest['last_sync'] or '')
+            if fields is not None:
+                manifest['fields'] = list(fields)
+            self._write_manifest()
+        except BaseException:
+            self.manifest = previous
+            raise
+        if manifest['superseded_count'] > COMPACT_RATIO * manifest['row_count']:
+            self.compact()
+
+    def _append_rows(self, table: IssueTable, removed: Sequence[str]) -> None:
+        """Дописывание строк и пометка замененных в манифесте (без его записи)"""
+        manifest = self.manifest
+        length = manifest['row_count']
+        if length and (len(table) or len(removed)):
+            keys = self._map('keys', length)
+            replaced = np.isin(keys, np.concatenate([table.keys, np.asarray(removed, dtype=str)]))
+            del keys
+            superseded = self._superseded(length)
+            if (replaced & ~superseded).any():
+                rows = np.flatnonzero(superseded | replaced)
+                manifest['superseded'] = to_ranges(rows)
+                manifest['superseded_count'] = len(rows)
+
+        if not len(table):
+            return
+        width = table.keys.dtype.itemsize // np.dtype('<U1').itemsize
+        if width > manifest['key_width']:
+            self._widen_keys(width)
+
+        dictionaries, mappings = merge_dictionaries(manifest['dictionaries'], table)
+        columns = {
+            'keys': table.keys,
+            'created': table.created,
+            'resolved': table.resolved,
+            'has_resolution': table.has_resolution,
+            'timespent': table.timespent,
+            **{f'codes.{column}': mappings[column][codes]
+               for column, codes in table.codes.items()}
+        }
+        for name, values in columns.items():
+            self._append_column(name, values, length)
+
+        if table.transitions is not None:
+            log = table.transitions
+            transitions = {
+                'transitions.rows': log.rows.astype(np.int64) + length,
+                'transitions.times': log.times,
+                'transitions.from_codes': mappings['status'][log.from_codes],
+                'transitions.to_codes': mappings['status'][log.to_codes]
+            }
+            for name, values in transitions.items():
+                self._append_column(name, values, manifest['transition_count'])
+            manifest['transition_count'] += len(log)
+            manifest['has_transitions'] = True
+
+        manifest['dictionaries'] = dictionaries
+        manifest['row_count'] = length + len(table)
+
+    def table(self) -> IssueTable:
+        """
+        Таблица актуальных задач
+
+        Колонки отображаются в память без чтения; если в хранилище есть
+        замененные строки, актуальные строки копируются по маске. Файлы
+        хранилища не изменяются, файлы текущего поколения сохраняются,
+        пока таблица открыта.
+
+        Returns:
+            Таблица задач
+        """
+        manifest = self.manifest
+        length = manifest['row_count']
+        transitions = None
+        if manifest['has_transitions']:
+            count = manifest['transition_count']
+            transitions = TransitionLog(*(self._map(name, count) for name in TRANSITION_COLUMNS))
+
+        table = IssueTable(
+            keys=self._map('keys', length),
+            created=self._map('created', length),
+            resolved=self._map('resolved', length),
+            has_resolution=self._map('has_resolution', length),
+            timespent=self._map('timespent', length),
+            codes={column: self._map(f'codes.{column}', length) for column in CATEGORICAL_COLUMNS},
+            dictionaries=manifest['dictionaries'],
+            transitions=transitions
+        )
+        if manifest['superseded_count']:
+            return table.take(~self._superseded(length))
+
+        path = os.path.realpath(self.path)
+        generation = manifest.get('generation', 0)
+        counts = _mapped_generations.setdefault(path, {})
+        counts[generation] = counts.get(generation, 0) + 1
+        weakref.finalize(table, _release_generation, path, generation)
+        return table
+
+    def compact(self) -> None:
+        """
+        Перезапись хранилища без замененных строк
+
+        Колонки переписываются блоками по COMPACT_BLOCK строк в файлы
+        следующего поколения; манифест переключается на них последним,
+        затем удаляются файлы прежних поколений, не отображаемые открытыми
+        таблицами. Сбой на любом шаге оставляет хранилище в прежнем или
+        в новом целом состоянии.
+        """
+        manifest = self.manifest
+        if not manifest['superseded_count']:
+            self._remove_stale_files()
+            return
+        length = manifest['row_count']
+        generation = manifest.get('generation', 0) + 1
+        superseded = self._superseded(length)
+        # Номера удаляемых строк: новый номер строки - старый минус число удаленных до нее
+        dropped = np.flatnonzero(superseded)
+
+        for name in ['keys', *ISSUE_COLUMNS]:
+            column = self._map(name, length)
+            with open(self._column_path(name, generation), 'wb') as file:
+                for start in range(0, length, COMPACT_BLOCK):
+                    block = slice(start, start + COMPACT_BLOCK)
+                    file.write(np.ascontiguousarray(column[block][~superseded[block]]).tobytes())
+            del column
+
+        transition_count = 0
+        if manifest['has_transitions']:
+            count = manifest['transition_count']
+            columns = {name: self._map(name, count) for name in TRANSITION_COLUMNS}
+            files = {name: open(self._column_path(name, generation), 'wb') for name in TRANSITION_COLUMNS}
+            try:
+                for start in range(0, count, COMPACT_BLOCK):
+                    block = slice(start, start + COMPACT_BLOCK)
+                    rows = columns['transitions.rows'][block]
+                    kept = ~superseded[rows]
+                    transition_count += int(np.count_nonzero(kept))
+                    for name, column in columns.items():
+                        values = column[block][kept]
+                        if name == 'transitions.rows':
+                            values = values - np.searchsorted(dropped, values)
+                        files[name].write(np.ascontiguousarray(values, dtype=self._dtype(name)).tobytes())
+            finally:
+                for file in files.values():
+                    file.close()
+            del columns
+
+        self.manifest = dict(manifest, row_count=length - len(dropped), superseded=[], superseded_count=0,
+                             transition_count=transition_count, generation=generation, keys_file=None)
+        try:
+            self._write_manifest()
+        except BaseException:
+            self.manifest = manifest
+            raise
+        self._remove_stale_files()
+
+    def clear(self) -> None:
+        """Удаление всех задач хранилища (манифест сбрасывается до удаления файлов)"""
+        generation = self.manifest.get('generation', 0) + 1
+        self.manifest = dict(self._empty_manifest(), generation=generation)
+        self._write_manifest()
+        self._remove_stale_files()
+
+
+def open_column_store(root: str, jira_url: str, project_key: str, jql: Optional[str] = None,
+                      statuses: Optional[Sequence[str]] = DEFAULT_STATUSES,
+                      expand_changelog: bool = False) -> ColumnStore:
+    """
+    Хранилище проекта в каталоге root (имя каталога - как у файла кэша)
+
+    Args:
+        root: Каталог хранилищ
+        jira_url: URL JIRA сервера
+        project_key: Ключ проекта
+        jql: Дополнительное условие JQL
+        statuses: Статусы задач
+        expand_changelog: Загружать журнал изменений
+
+    Returns:
+        Хранилище задач
+    """
+    query = cache_query(jql, statuses, expand_changelog)
+    return ColumnStore(os.path.join(root, f"{cache_name(jira_url, project_key, query)}.columns"))
+
+
+def _track_updated(issues: Iterable[Dict[str, Any]], latest: List[str]) -> Iterator[Dict[str, Any]]:
+    """Передача задач дальше с запоминанием максимального значения updated"""
+    for issue in issues:
+        updated = (issue.get('fields') or {}).get('updated')
+        if updated and updated > latest[0]:
+            latest[0] = updated
+        yield issue
+
+
+def prepare_store_sync(store: ColumnStore,
+                       fields: Optional[Sequence[str]]) -> Tuple[Optional[str], List[str]]:
+    """
+    Отметка и набор полей для загрузки изменений в хранилище
+
+    Если запрошены поля, которых нет у задач хранилища, оно очищается
+    и проект загружается заново с объединенным набором полей.
+
+    Args:
+        store: Хранилище задач
+        fields: Запрашиваемые поля задач (по умолчанию SEARCH_FIELDS)
+
+    Returns:
+        Кортеж (отметка последней синхронизации или None для полной
+        загрузки, поля для запроса)
+    """
+    last_sync = store.last_sync
+    fields, reload = resolve_fields(fields, store.fields)
+    if reload:
+        store.clear()
+        last_sync = None
+    if last_sync:
+        print(f"Найдено хранилище задач, синхронизация изменений с {last_sync}")
+    return last_sync, fields
+
+
+def apply_store_sync(store: ColumnStore, issues: Iterable[Dict[str, Any]], fields: Sequence[str],
+                     last_sync: Optional[str], removed: Sequence[Dict[str, Any]] = ()) -> IssueTable:
+    """
+    Запись загруженных изменений в хранилище
+
+    Задачи сразу преобразуются в колонки, JSON задач не сохраняется.
+
+    Args:
+        store: Хранилище задач
+        issues: Новые и измененные задачи (список или генератор)
+        fields: Поля, с которыми загружены задачи
+        last_sync: Отметка, от которой выполнялась загрузка (см. prepare_store_sync)
+        removed: Измененные задачи, вышедшие из набора (заполняется до конца
+            чтения issues, если задачи отбираются генератором select_delta)
+
+    Returns:
+        Таблица новых и измененных задач
+    """
+    latest = [last_sync or '']
+    fresh = IssueTable.from_issues(_track_updated(issues, latest))
+    store.append(fresh, latest_updated(removed, latest[0] or None), fields,
+                 [issue['key'] for issue in removed])
+    return fresh
+
+
+def sync_column_store(store: ColumnStore, jira_url: str, project_key: str, max_results: int,
+                      max_workers: int = 4, client: Optional[JiraClient] = None,
+                      jql: Optional[str] = None,
+                      statuses: Optional[Sequence[str]] = DEFAULT_STATUSES,
+                      expand_changelog: bool = False,
+                      fields: Optional[Sequence[str]] = None) -> Tuple[IssueTable, List[str]]:
+    """
+    Загрузка изменений с последней синхронизации в колоночное хранилище
+
+    Страницы ответа сразу преобразуются в колонки, JSON задач не сохраняется.
+    Изменения загружаются по всему проекту, задачи, вышедшие из набора,
+    удаляются из хранилища.
+
+    Args:
+        store: Хранилище задач
+        jira_url: URL JIRA сервера
+        project_key: Ключ проекта
+        max_results: Размер страницы
+        max_workers: Количество параллельных запросов
+        client: Клиент JIRA (по умолчанию создается временный)
+        jql: Дополнительное условие JQL
+        statuses: Статусы задач; None - задачи в любом статусе
+        expand_changelog: Загружать переходы между статусами из журнала изменений
+        fields: Запрашиваемые поля задач (по умолчанию SEARCH_FIELDS)
+
+    Returns:
+        Кортеж (таблица новых и измененных задач, ключи задач, вышедших из набора)
+
+    Raises:
+        JiraApiError: При ошибках API JIRA
+    """
+    last_sync, fields = prepare_store_sync(store, fields)
+    removed: List[Dict[str, Any]] = []
+    if last_sync:
+        issues = fetch_delta(iter_jira_issues, jira_url, project_key, max_results, max_workers,
+                             to_jql_date(last_sync), client, jql, statuses, expand_changelog,
+                             fields, removed)
+    else:
+        issues = iter_jira_issues(jira_url, project_key, max_results, max_workers,
+                                  updated_since=None, client=client, jql=jql, statuses=statuses,
+                                  expand_changelog=expand_changelog, fields=fields)
+    fresh = apply_store_sync(store, issues, fields, last_sync, removed)
+    return fresh, [issue['key'] for issue in removed]
@@ -3,11 +3,29 @@ import json
 import os
 from typing import Dict, Any
 from jira_analytics.exceptions import ConfigError
+from jira_analytics.constants import BACKENDS, FILTER_KEYS, PERIODS
 
 DEFAULT_CONFIG = {
     "jira_url": "https://issues.apache.org/jira",
     "project_key": "KAFKA",
-    "max_results": 500
+    "max_results": 500,
+    "max_workers": 4,
+    "max_retries": 5,
+    "use_cache": True,
+    "column_store": False,
+    "cache_dir": ".jira_cache",
+    "render_cache_mb": 256,
+    "status_filter": None,
+    "jql": None,
+    "changelog": False,
+    "reports": None,
+    "issue_filter": None,
+    "histogram_bins": 15,
+    "histogram_log_scale": False,
+    "timeline_days": 90,
+    "rolling_window": 7,
+    "timeline_period": "day",
+    "backend": "matplotlib"
 }
 
 def validate_config(config: Dict[str, Any]) -> None:
@@ -36,6 +54,101 @@ def validate_config(config: Dict[str, Any]) -> None:
     if config["max_results"] <= 0:
         raise ConfigError("max_results должен быть положительным числом")
 
+    if "max_workers" in config:
+        if not isinstance(config["max_workers"], int) or config["max_workers"] <= 0:
+            raise ConfigError("max_workers должен быть положительным целым числом")
+
+    if "max_retries" in config:
+        if not isinstance(config["max_retries"], int) or config["max_retries"] < 0:
+            raise ConfigError("max_retries должен быть неотрицательным целым числом")
+
+    if "projects" in config:
+        projects = config["projects"]
+        valid_items = all(
+            isinstance(project, str) or
+            (isinstance(project, dict) and isinstance(project.get("key"), str))
+            for project in projects
+        ) if isinstance(projects, list) else False
+        if not valid_items:
+            raise ConfigError("projects должен быть списком ключей проектов или словарей с ключом key")
+
+    if "max_concurrency" in config:
+        if not isinstance(config["max_concurrency"], int) or config["max_concurrency"] <= 0:
+            raise ConfigError("max_concurrency должен быть положительным целым числом")
+
+    if "rate_limit" in config and config["rate_limit"] is not None:
+        if not isinstance(config["rate_limit"], (int, float)) or config["rate_limit"] <= 0:
+            raise ConfigError("rate_limit должен быть положительным числом или null")
+
+    if "use_cache" in config and not isinstance(config["use_cache"], bool):
+        raise ConfigError("use_cache должен быть логическим значением")
+
+    if "column_store" in config and not isinstance(config["column_store"], bool):
+        raise ConfigError("column_store должен быть логическим значением")
+
+    if "cache_dir" in config and not isinstance(config["cache_dir"], str):
+        raise ConfigError("cache_dir должен быть строкой")
+
+    if "render_cache_mb" in config:
+        if not isinstance(config["render_cache_mb"], int) or config["render_cache_mb"] < 0:
+            raise ConfigError("render_cache_mb должен быть неотрицательным целым числом (0 - без кэша)")
+
+    if "status_filter" in config and config["status_filter"] is not None:
+        statuses = config["status_filter"]
+        if not isinstance(statuses, list) or not all(
+                isinstance(status, str) and status for status in statuses):
+            raise ConfigError("status_filter должен быть списком названий статусов или null")
+
+    if "jql" in config and config["jql"] is not None and not isinstance(config["jql"], str):
+        raise ConfigError("jql должен быть строкой или null")
+
+    if "changelog" in config and not isinstance(config["changelog"], bool):
+        raise ConfigError("changelog должен быть логическим значением")
+
+    if "reports" in config and config["reports"] is not None:
+        reports = config["reports"]
+        if not isinstance(reports, list) or not reports or not all(
+                isinstance(report, str) and report for report in reports):
+            raise ConfigError("reports должен быть непустым списком имен отчетов или null")
+
+    if "issue_filter" in config and config["issue_filter"] is not None:
+        issue_filter = config["issue_filter"]
+        if not isinstance(issue_filter, dict) or not set(issue_filter) <= set(FILTER_KEYS):
+            raise ConfigError(f"issue_filter должен быть словарем с ключами из: {', '.join(FILTER_KEYS)}")
+        for key, value in issue_filter.items():
+            valid = isinstance(value, str) or (
+                key not in ('created_from', 'created_to') and isinstance(value, list) and
+                all(isinstance(item, str) for item in value))
+            if not valid:
+                raise ConfigError(f"issue_filter.{key} должен быть строкой"
+                                  + ("" if key.startswith('created') else " или списком строк"))
+
+    if "histogram_bins" in config:
+        bins = config["histogram_bins"]
+        valid_bins = (
+            (isinstance(bins, int) and bins > 0) or
+            (isinstance(bins, list) and len(bins) > 1 and
+             all(isinstance(edge, (int, float)) for edge in bins) and
+             all(left < right for left, right in zip(bins, bins[1:])))
+        )
+        if not valid_bins:
+            raise ConfigError("histogram_bins должен быть положительным целым числом "
+                              "или возрастающим списком границ")
+
+    if "histogram_log_scale" in config and not isinstance(config["histogram_log_scale"], bool):
+        raise ConfigError("histogram_log_scale должен быть логическим значением")
+
+    for key in ("timeline_days", "rolling_window"):
+        if key in config:
+            if not isinstance(config[key], int) or config[key] <= 0:
+                raise ConfigError(f"{key} должен быть положительным целым числом")
+
+    if "timeline_period" in config and config["timeline_period"] not in PERIODS:
+        raise ConfigError(f"timeline_period должен быть одним из: {', '.join(PERIODS)}")
+
+    if "backend" in config and config["backend"] not in BACKENDS:
+        raise ConfigError(f"backend должен быть одним из: {', '.join(BACKENDS)}")
+
     # Проверка URL
     if not config["jira_url"].startswith(("http://", "https://")):
         raise ConfigError("jira_url должен быть валидным URL (начинаться с http:// или https://)")
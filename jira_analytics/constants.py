@@ -0,0 +1,11 @@
+"""Модуль допустимых значений настроек (без внешних зависимостей)"""
+
+# Допустимые условия отбора (аргументы IssueFilter)
+FILTER_KEYS = ('created_from', 'created_to', 'status', 'priority', 'assignee', 'reporter')
+
+# Периоды агрегации календарного ряда
+PERIODS = ('day', 'week', 'month')
+
+# Бэкенды визуализации: matplotlib (по умолчанию, с интерактивным показом)
+# и облегченный вывод SVG и Vega-Lite без matplotlib
+BACKENDS = ('matplotlib', 'light')
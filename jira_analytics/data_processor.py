@@ -1,146 +1,337 @@
 """Модуль для обработки данных JIRA"""
+import functools
+import inspect
+import os
+import time
+from collections import OrderedDict
 from datetime import datetime
-from collections import defaultdict, Counter
-from typing import Dict, List, Tuple, DefaultDict, Any
-from jira_analytics.jira_client import calculate_resolution_days
+from typing import Dict, List, Tuple, DefaultDict, Any, Optional, Sequence, Union, Callable
+import numpy as np
+from jira_analytics.aggregation import ReportBundle, build_report_bundle
+from jira_analytics.flow_metrics import FlowMetrics
+from jira_analytics.histograms import Bins, DEFAULT_BINS
+from jira_analytics.index import IssueFilter, IssueIndex
+from jira_analytics.issue_table import IssueTable
+from jira_analytics.snapshot import load_snapshot, table_fingerprint
+from jira_analytics.survival import AgeReport, build_age_report
+
+# Источник задач: список задач JIRA, готовая таблица или путь к файлу снимка
+IssueSource = Union[List[Dict[str, Any]], IssueTable, str, 'os.PathLike[str]']
+
+# Наибольшее число результатов в кэше отчетов (условия отбора приходят
+# от клиентов API, давно не использованные результаты вытесняются)
+MAX_CACHED_RESULTS = 512
+
+
+def as_issue_table(issues: IssueSource) -> IssueTable:
+    """
+    Приведение источника задач к колоночной таблице
+
+    Args:
+        issues: Список задач JIRA, таблица задач или путь к снимку
+
+    Returns:
+        Таблица задач
+    """
+    if isinstance(issues, IssueTable):
+        return issues
+    if isinstance(issues, (str, os.PathLike)):
+        return load_snapshot(issues)
+    return IssueTable.from_issues(issues)
+
+
+def memoized(method: Callable) -> Callable:
+    """
+    Кэширование результата метода DataProcessor по значениям аргументов
+
+    Аргументы приводятся к полному набору с учетом значений по умолчанию,
+    поэтому вызовы get_resolution_times() и get_resolution_times(0, 3650)
+    разделяют один результат. Кэш сбрасывается при изменении данных
+    и хранит не более MAX_CACHED_RESULTS последних использованных результатов.
+    Возвращаемые значения общие для всех вызовов и не должны изменяться.
+
+    Args:
+        method: Метод DataProcessor
+
+    Returns:
+        Метод с кэшированием результата
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple(bound.arguments.items())[1:]
+        try:
+            result = self._cache[key]
+        except KeyError:
+            result = method(self, *args, **kwargs)
+            self._cache[key] = result
+            if len(self._cache) > MAX_CACHED_RESULTS:
+                self._cache.popitem(last=False)
+            return result
+        self._cache.move_to_end(key)
+        return result
+
+    return wrapper
 
 
 class DataProcessor:
     """Класс для обработки данных JIRA"""
 
-    def __init__(self, issues: List[Dict[str, Any]]):
+    def __init__(self, issues: IssueSource,
+                 histogram_bins: Bins = DEFAULT_BINS, histogram_log_scale: bool = False):
         """
         Инициализация процессора данных
 
+        Задачи преобразуются в колоночную таблицу за один проход,
+        все отчеты далее строятся по массивам таблицы.
+
+        Args:
+            issues: Список задач JIRA, готовая таблица задач или путь
+                к файлу снимка (колонки снимка отображаются в память)
+            histogram_bins: Количество интервалов или явные границы гистограмм
+            histogram_log_scale: Логарифмические интервалы гистограмм
+        """
+        self.table = as_issue_table(issues)
+        self.histogram_bins = histogram_bins
+        self.histogram_log_scale = histogram_log_scale
+        self.version = 0
+        self._cache: 'OrderedDict[tuple, Any]' = OrderedDict()
+        self._flow_metrics: Optional[FlowMetrics] = None
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    @property
+    def issues(self) -> List[Dict[str, Any]]:
+        """
+        Задачи в формате ответа JIRA, восстановленные из таблицы
+
+        Оставлено для совместимости: список строится заново при каждом
+        обращении и изменения в нем не влияют на процессор.
+        """
+        return self.table.to_issues()
+
+    def _invalidate(self) -> None:
+        """Сброс кэша отчетов после изменения набора задач"""
+        self._cache.clear()
+        self.version += 1
+
+    def replace_issues(self, issues: IssueSource) -> None:
+        """
+        Полная замена набора задач
+
+        Args:
+            issues: Список задач JIRA, готовая таблица задач или путь к файлу снимка
+        """
+        self.table = as_issue_table(issues)
+        self._flow_metrics = None
+        self._invalidate()
+
+    def update_issues(self, issues: IssueSource, removed: Sequence[str] = ()) -> None:
+        """
+        Применение инкрементального обновления: измененные задачи
+        заменяются по ключу, новые добавляются, вышедшие из набора удаляются
+
+        Метрики потока обновляются по разнице: вклад замененных и удаленных
+        задач вычитается, вклад задач обновления добавляется.
+
+        Args:
+            issues: Новые и измененные задачи JIRA
+            removed: Ключи задач, вышедших из набора
+        """
+        delta = as_issue_table(issues)
+        dropped = np.isin(self.table.keys, np.asarray(removed, dtype=str))
+        if len(delta) == 0 and not dropped.any():
+            return
+        if self._flow_metrics is not None:
+            self._flow_metrics.remove(self.table.take(dropped | np.isin(self.table.keys, delta.keys)))
+            self._flow_metrics.add(delta)
+        table = self.table.take(~dropped) if dropped.any() else self.table
+        self.table = table.upsert(delta) if len(delta) else table
+        self._invalidate()
+
+    @memoized
+    def get_fingerprint(self) -> str:
+        """
+        Отпечаток набора задач, постоянный между запусками приложения
+
+        Returns:
+            Хеш содержимого таблицы задач
+        """
+        return table_fingerprint(self.table)
+
+    @memoized
+    def get_index(self) -> IssueIndex:
+        """
+        Получить индексы таблицы задач (строятся при первом отборе)
+
+        Returns:
+            Индексы по дате создания и категориальным колонкам
+        """
+        return IssueIndex(self.table)
+
+    @memoized
+    def select(self, issue_filter: Optional[IssueFilter] = None) -> IssueTable:
+        """
+        Получить таблицу задач, удовлетворяющих условиям отбора
+
+        Args:
+            issue_filter: Условия отбора (None или пустые условия - все задачи)
+
+        Returns:
+            Таблица отобранных задач
+        """
+        if not issue_filter:
+            return self.table
+        return self.table.take(self.get_index().select(issue_filter))
+
+    @memoized
+    def get_report_bundle(self, min_days: int = 0, max_days: int = 3650,
+                          issue_filter: Optional[IssueFilter] = None) -> ReportBundle:
+        """
+        Получить агрегаты всех отчетов, рассчитанные за один проход
+
+        Args:
+            min_days: Минимальное время разрешения в днях (включительно)
+            max_days: Максимальное время разрешения в днях (включительно)
+            issue_filter: Условия отбора задач
+
+        Returns:
+            Набор агрегатов отчетов
+        """
+        return build_report_bundle(self.select(issue_filter), min_days, max_days,
+                                   self.histogram_bins, self.histogram_log_scale)
+
+    def get_flow_metrics(self, issue_filter: Optional[IssueFilter] = None) -> FlowMetrics:
+        """
+        Получить метрики потока (бэклог, пропускная способность, время выполнения)
+
+        Метрики рассчитываются при первом обращении и далее поддерживаются
+        инкрементально в update_issues (метрики отобранных задач кэшируются
+        до изменения данных). Объект общий для всех вызовов и не должен
+        изменяться вызывающим кодом.
+
         Args:
-            issues: Список задач JIRA
+            issue_filter: Условия отбора задач
+
+        Returns:
+            Метрики потока
         """
-        self.issues = issues
+        if issue_filter:
+            return self._get_filtered_flow_metrics(issue_filter)
+        if self._flow_metrics is None:
+            self._flow_metrics = FlowMetrics.from_table(self.table)
+        return self._flow_metrics
 
-    def get_resolution_times(self, min_days: int = 0, max_days: int = 3650) -> List[int]:
+    @memoized
+    def _get_filtered_flow_metrics(self, issue_filter: IssueFilter) -> FlowMetrics:
+        """Метрики потока отобранных задач"""
+        return FlowMetrics.from_table(self.select(issue_filter))
+
+    def get_age_report(self, reference: Optional[float] = None,
+                       issue_filter: Optional[IssueFilter] = None) -> AgeReport:
+        """
+        Получить возраст открытых задач и кривую дожития
+
+        Результат зависит от момента расчета, поэтому не кэшируется;
+        расчет выполняется одним векторным проходом по таблице.
+
+        Args:
+            reference: Момент расчета (секунды эпохи UTC), по умолчанию - текущий
+            issue_filter: Условия отбора задач
+
+        Returns:
+            Отчет о возрасте задач
+        """
+        reference = time.time() if reference is None else reference
+        return build_age_report(self.select(issue_filter), reference, self.histogram_bins, self.histogram_log_scale)
+
+    @memoized
+    def get_resolution_times(self, min_days: int = 0, max_days: int = 3650,
+                             issue_filter: Optional[IssueFilter] = None) -> List[int]:
         """
         Получить список времен разрешения задач
 
         Args:
             min_days: Минимальное количество дней (включительно)
             max_days: Максимальное количество дней (включительно)
+            issue_filter: Условия отбора задач
 
         Returns:
             Список времен в днях
         """
-        times = []
-        for issue in self.issues:
-            if issue['fields'].get('resolutiondate'):
-                days = calculate_resolution_days(
-                    issue['fields']['created'],
-                    issue['fields']['resolutiondate']
-                )
-                if min_days <= days <= max_days:
-                    times.append(days)
-        return times
+        return self.get_report_bundle(min_days, max_days, issue_filter).resolution_times.tolist()
 
-    def get_resolution_times_by_status(self, min_days: int = 0, max_days: int = 3650) -> Dict[str, List[int]]:
+    @memoized
+    def get_resolution_times_by_status(self, min_days: int = 0, max_days: int = 3650,
+                                       issue_filter: Optional[IssueFilter] = None
+                                       ) -> Dict[str, List[int]]:
         """
         Получить времена разрешения сгруппированные по статусам
 
         Args:
             min_days: Минимальное количество дней
             max_days: Максимальное количество дней
+            issue_filter: Условия отбора задач
 
         Returns:
             Словарь {статус: [времена в днях]}
         """
-        status_groups = defaultdict(list)
-        for issue in self.issues:
-            status = issue['fields']['status']['name']
-            if issue['fields'].get('resolutiondate'):
-                days = calculate_resolution_days(
-                    issue['fields']['created'],
-                    issue['fields']['resolutiondate']
-                )
-                if min_days <= days <= max_days:
-                    status_groups[status].append(days)
-        return dict(status_groups)
+        by_status = self.get_report_bundle(min_days, max_days, issue_filter).resolution_times_by_status
+        return {status: times.tolist() for status, times in by_status.items()}
 
-    def get_created_closed_counts(self) -> Tuple[DefaultDict[datetime.date, int], DefaultDict[datetime.date, int]]:
+    def get_created_closed_counts(self, issue_filter: Optional[IssueFilter] = None
+                                  ) -> Tuple[DefaultDict[datetime.date, int], DefaultDict[datetime.date, int]]:
         """
-        Получить количество созданных и закрытых задач по датам
+        Получить количество созданных и закрытых задач по датам (UTC)
+
+        Args:
+            issue_filter: Условия отбора задач
 
         Returns:
             Кортеж (created_dates, closed_dates)
         """
-        created_dates = defaultdict(int)
-        closed_dates = defaultdict(int)
-
-        for issue in self.issues:
-            try:
-                created_date = datetime.strptime(
-                    issue['fields']['created'].split('.')[0],
-                    '%Y-%m-%dT%H:%M:%S'
-                ).date()
-                created_dates[created_date] += 1
-
-                if issue['fields'].get('resolutiondate'):
-                    closed_date = datetime.strptime(
-                        issue['fields']['resolutiondate'].split('.')[0],
-                        '%Y-%m-%dT%H:%M:%S'
-                    ).date()
-                    closed_dates[closed_date] += 1
-            except (ValueError, KeyError, TypeError):
-                continue
+        bundle = self.get_report_bundle(issue_filter=issue_filter)
+        return bundle.created_dates, bundle.closed_dates
 
-        return created_dates, closed_dates
-
-    def get_user_stats(self) -> Dict[str, int]:
+    def get_user_stats(self, issue_filter: Optional[IssueFilter] = None) -> Dict[str, int]:
         """
         Получить статистику по пользователям
 
+        Args:
+            issue_filter: Условия отбора задач
+
         Returns:
             Словарь {имя пользователя: количество задач}
         """
-        user_counts = defaultdict(int)
-        for issue in self.issues:
-            if issue['fields'].get('assignee'):
-                user_counts[issue['fields']['assignee'].get('displayName', 'Unknown')] += 1
-            if issue['fields'].get('reporter'):
-                user_counts[issue['fields']['reporter'].get('displayName', 'Unknown')] += 1
-        return dict(user_counts)
+        return self.get_report_bundle(issue_filter=issue_filter).user_stats
 
-    def get_time_spent_data(self) -> List[float]:
+    @memoized
+    def get_time_spent_data(self, issue_filter: Optional[IssueFilter] = None) -> List[float]:
         """
         Получить данные о затраченном времени
 
+        Для задач без учета времени используется время разрешения.
+
+        Args:
+            issue_filter: Условия отбора задач
+
         Returns:
             Список затраченного времени в днях
         """
-        times = []
-        for issue in self.issues:
-            if issue['fields'].get('timespent'):
-                days = issue['fields']['timespent'] / 86400
-                if 0 < days <= 3650:
-                    times.append(days)
-            elif issue['fields'].get('resolutiondate'):
-                days = calculate_resolution_days(
-                    issue['fields']['created'],
-                    issue['fields']['resolutiondate']
-                )
-                if 0 < days <= 3650:
-                    times.append(days)
-        return times
-
-    def get_priority_distribution(self) -> Dict[str, int]:
+        return self.get_report_bundle(issue_filter=issue_filter).time_spent.tolist()
+
+    def get_priority_distribution(self, issue_filter: Optional[IssueFilter] = None) -> Dict[str, int]:
         """
         Получить распределение задач по приоритетам
 
+        Args:
+            issue_filter: Условия отбора задач
+
         Returns:
             Словарь {приоритет: количество}
         """
-        priorities = []
-        for issue in self.issues:
-            priority = issue["fields"].get("priority")
-            if priority:
-                priorities.append(priority.get("name", "Без приоритета"))
-            else:
-                priorities.append("Без приоритета")
-
-        return dict(Counter(priorities))
\ No newline at end of file
+        return self.get_report_bundle(issue_filter=issue_filter).priority_distribution
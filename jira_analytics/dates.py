@@ -0,0 +1,190 @@
+"""Модуль пакетного разбора дат JIRA"""
+from datetime import datetime, timezone
+from typing import Optional, Sequence
+import numpy as np
+
+# Длины строк фиксированного формата JIRA:
+# 2024-01-05T14:30:00, 2024-01-05T14:30:00.000, 2024-01-05T14:30:00.000+0300
+_FIXED_LENGTHS = (19, 23, 28)
+_WIDTH = 28
+
+_DIGIT_COLUMNS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]
+_SEPARATORS = {4: '-', 7: '-', 10: 'T', 13: ':', 16: ':'}
+
+_DAYS_IN_MONTH = np.array([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# Форматы для медленного разбора нестандартных значений
+_FALLBACK_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S.%f%z',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+)
+
+
+def _days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """
+    Количество дней от 1970-01-01 для дат григорианского календаря
+
+    Args:
+        year: Годы
+        month: Месяцы (1-12)
+        day: Дни месяца
+
+    Returns:
+        Массив номеров дней эпохи
+    """
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    year_of_era = year - era * 400
+    day_of_year = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def _parse_fallback(value: str) -> float:
+    """
+    Медленный разбор даты нестандартного формата
+
+    Args:
+        value: Дата в формате ISO
+
+    Returns:
+        Секунды эпохи или NaN при ошибке
+    """
+    for date_format in _FALLBACK_FORMATS:
+        try:
+            moment = datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.timestamp()
+    return np.nan
+
+
+def _parse_fixed(strings: Sequence[str], lengths: np.ndarray) -> np.ndarray:
+    """
+    Векторный разбор строк фиксированного формата по кодам символов
+
+    Args:
+        strings: Строки дат
+        lengths: Длины строк
+
+    Returns:
+        Секунды эпохи, NaN для строк, не соответствующих формату
+    """
+    count = len(strings)
+    # Коды символов как матрица (строка x позиция); вычитание с переполнением
+    # uint32 отправляет символы меньше '0' за пределы диапазона цифр
+    chars = np.array(strings, dtype=f'U{_WIDTH}').view(np.uint32).reshape(count, _WIDTH)
+
+    def is_digit(columns) -> np.ndarray:
+        return np.all(chars[:, columns] - ord('0') <= 9, axis=1)
+
+    def number(*columns: int) -> np.ndarray:
+        value = np.zeros(count, dtype=np.int64)
+        for column in columns:
+            value = value * 10 + (chars[:, column].astype(np.int64) - ord('0'))
+        return value
+
+    valid = np.isin(lengths, _FIXED_LENGTHS) & is_digit(_DIGIT_COLUMNS)
+    for column, separator in _SEPARATORS.items():
+        valid &= chars[:, column] == ord(separator)
+
+    has_fraction = lengths >= 23
+    valid &= ~has_fraction | ((chars[:, 19] == ord('.')) & is_digit(slice(20, 23)))
+
+    has_offset = lengths == 28
+    sign = np.where(chars[:, 23] == ord('-'), -1, 1)
+    offset_ok = np.isin(chars[:, 23], (ord('+'), ord('-'))) & is_digit(slice(24, 28))
+    valid &= ~has_offset | offset_ok
+
+    year = number(0, 1, 2, 3)
+    month = number(5, 6)
+    day = number(8, 9)
+    hour = number(11, 12)
+    minute = number(14, 15)
+    second = number(17, 18)
+
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_days = _DAYS_IN_MONTH[np.clip(month, 0, 12)] - ((month == 2) & ~leap)
+    valid &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_days)
+    valid &= (hour < 24) & (minute < 60) & (second < 61)
+
+    milliseconds = np.where(has_fraction, number(20, 21, 22), 0)
+    offset = np.where(has_offset, sign * (number(24, 25) * 3600 + number(26, 27) * 60), 0)
+
+    seconds = (_days_from_civil(year, month, day) * 86400
+               + hour * 3600 + minute * 60 + second - offset).astype(np.float64)
+    seconds += milliseconds / 1000.0
+    return np.where(valid, seconds, np.nan)
+
+
+def parse_jira_timestamps(values: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    Пакетный разбор колонки дат JIRA в секунды эпохи UTC
+
+    Строки формата JIRA (2024-01-05T14:30:00.000+0300) разбираются
+    векторно за один проход с учетом смещения часового пояса, остальные
+    значения - по списку запасных форматов. Даты без смещения считаются UTC.
+
+    Args:
+        values: Даты в формате ISO (None или пустая строка для отсутствующих)
+
+    Returns:
+        Массив float64 секунд эпохи, NaN для отсутствующих и ошибочных значений
+    """
+    strings = [value or '' for value in values]
+    result = np.full(len(strings), np.nan)
+    if not strings:
+        return result
+
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+    fixed = np.isin(lengths, _FIXED_LENGTHS)
+    if fixed.all():
+        result = _parse_fixed(strings, lengths)
+    elif fixed.any():
+        fixed_index = np.flatnonzero(fixed)
+        result[fixed_index] = _parse_fixed([strings[i] for i in fixed_index], lengths[fixed_index])
+
+    for i in np.flatnonzero(np.isnan(result) & (lengths > 0)):
+        result[i] = _parse_fallback(strings[i])
+
+    return result
+
+
+def parse_jira_timestamp(value: Optional[str]) -> float:
+    """
+    Разбор одной даты JIRA в секунды эпохи UTC
+
+    Для одиночных значений используется strptime: создание массивов
+    NumPy обходится дороже самого разбора.
+
+    Args:
+        value: Дата в формате ISO
+
+    Returns:
+        Секунды эпохи или NaN при ошибке
+    """
+    if not isinstance(value, str) or not value:
+        return np.nan
+    return _parse_fallback(value)
+
+
+def format_jira_timestamp(seconds: float) -> Optional[str]:
+    """
+    Форматирование секунд эпохи в дату JIRA (UTC)
+
+    Args:
+        seconds: Секунды эпохи (NaN при отсутствии даты)
+
+    Returns:
+        Дата вида 2024-01-05T14:30:00.000+0000 или None для NaN
+    """
+    if np.isnan(seconds):
+        return None
+    moment = datetime.fromtimestamp(float(seconds), tz=timezone.utc)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f'{moment.microsecond // 1000:03d}+0000'
@@ -0,0 +1,263 @@
+"""Модуль инкрементально обновляемых метрик потока задач"""
+import math
+from typing import Dict, Sequence
+import numpy as np
+from jira_analytics.aggregation import event_days
+from jira_analytics.exceptions import DataProcessingError
+from jira_analytics.issue_table import IssueTable, SECONDS_PER_DAY
+from jira_analytics.timeline import Timeline
+
+# Перцентили времени выполнения по умолчанию
+LEAD_TIME_QUANTILES = (0.5, 0.85, 0.95)
+
+# Значения меньше порога (в днях) учитываются как нулевые
+MIN_SKETCH_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """
+    Скетч квантилей с логарифмическими интервалами (по схеме DDSketch)
+
+    Оценка любого квантиля имеет относительную погрешность не больше
+    relative_accuracy. Скетчи с одинаковой точностью объединяются
+    сложением счетчиков, значения можно удалять с обратным весом.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Инициализация пустого скетча
+
+        Args:
+            relative_accuracy: Относительная погрешность квантилей
+        """
+        if not 0 < relative_accuracy < 1:
+            raise DataProcessingError(f"Недопустимая точность скетча: {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, values: Sequence[float], weight: int = 1) -> None:
+        """
+        Добавление значений
+
+        Args:
+            values: Неотрицательные значения
+            weight: Вес каждого значения (-1 для удаления)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        positive = values[values > MIN_SKETCH_VALUE]
+
+        self.zero_count += weight * (len(values) - len(positive))
+        self.count += weight * len(values)
+
+        keys, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype(np.int64),
+                                 return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            total = self.bins.get(key, 0) + weight * count
+            if total:
+                self.bins[key] = total
+            else:
+                del self.bins[key]
+
+    def remove(self, values: Sequence[float]) -> None:
+        """
+        Удаление ранее добавленных значений
+
+        Args:
+            values: Значения
+        """
+        self.add(values, weight=-1)
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """
+        Объединение со скетчем той же точности
+
+        Args:
+            other: Другой скетч
+
+        Raises:
+            DataProcessingError: При разной точности скетчей
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise DataProcessingError("Объединять можно только скетчи одинаковой точности")
+        for key, count in other.bins.items():
+            total = self.bins.get(key, 0) + count
+            if total:
+                self.bins[key] = total
+            else:
+                self.bins.pop(key, None)
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """
+        Оценка квантиля
+
+        Args:
+            q: Уровень квантиля от 0 до 1
+
+        Returns:
+            Значение квантиля или NaN для пустого скетча
+        """
+        if self.count <= 0:
+            return math.nan
+
+        rank = q * (self.count - 1)
+        cumulative = self.zero_count
+        if rank < cumulative:
+            return 0.0
+        for key in sorted(self.bins):
+            cumulative += self.bins[key]
+            if rank < cumulative:
+                # Середина интервала (gamma^(key-1), gamma^key] в относительной мере
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+
+class FlowMetrics:
+    """
+    Метрики потока: бэклог во времени, пропускная способность и время выполнения
+
+    Хранятся дневные количества созданных и закрытых задач и скетч времени
+    выполнения. Обновление набора задач применяется как вычитание вклада
+    замененных задач и добавление вклада новых, без пересчета остальных.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Инициализация пустых метрик
+
+        Args:
+            relative_accuracy: Относительная погрешность перцентилей времени выполнения
+        """
+        self.first_day = 0
+        self.created = np.zeros(0, dtype=np.int64)
+        self.closed = np.zeros(0, dtype=np.int64)
+        self.lead_times = QuantileSketch(relative_accuracy)
+        self.issue_count = 0
+
+    @classmethod
+    def from_table(cls, table: IssueTable, relative_accuracy: float = 0.01) -> 'FlowMetrics':
+        """
+        Расчет метрик по таблице задач
+
+        Args:
+            table: Таблица задач
+            relative_accuracy: Относительная погрешность перцентилей
+
+        Returns:
+            Метрики потока
+        """
+        metrics = cls(relative_accuracy)
+        metrics.add(table)
+        return metrics
+
+    def add(self, table: IssueTable) -> None:
+        """
+        Учет задач таблицы
+
+        Args:
+            table: Таблица добавляемых задач
+        """
+        self._apply(table, 1)
+
+    def remove(self, table: IssueTable) -> None:
+        """
+        Исключение ранее учтенных задач
+
+        Args:
+            table: Таблица задач в ранее учтенном состоянии
+        """
+        self._apply(table, -1)
+
+    def _apply(self, table: IssueTable, weight: int) -> None:
+        """
+        Применение вклада задач с весом
+
+        Args:
+            table: Таблица задач
+            weight: 1 для добавления, -1 для исключения
+        """
+        if len(table) == 0:
+            return
+
+        created_days, closed_days = event_days(table)
+        self._extend(np.concatenate((created_days, closed_days)))
+        size = len(self.created)
+        self.created += weight * np.bincount(created_days - self.first_day, minlength=size)
+        self.closed += weight * np.bincount(closed_days - self.first_day, minlength=size)
+
+        closed_ok = np.isfinite(table.created) & table.has_resolution & np.isfinite(table.resolved)
+        lead_times = (table.resolved[closed_ok] - table.created[closed_ok]) / SECONDS_PER_DAY
+        self.lead_times.add(np.maximum(lead_times, 0.0), weight)
+        self.issue_count += weight * len(table)
+
+    def _extend(self, days: np.ndarray) -> None:
+        """
+        Расширение дневных массивов до диапазона дней
+
+        Args:
+            days: Номера дней эпохи
+        """
+        if len(days) == 0:
+            return
+        low, high = int(days.min()), int(days.max())
+        if len(self.created) == 0:
+            self.first_day = low
+            self.created = np.zeros(high - low + 1, dtype=np.int64)
+            self.closed = np.zeros(high - low + 1, dtype=np.int64)
+            return
+
+        last_day = self.first_day + len(self.created) - 1
+        before, after = max(self.first_day - low, 0), max(high - last_day, 0)
+        if before or after:
+            self.created = np.pad(self.created, (before, after))
+            self.closed = np.pad(self.closed, (before, after))
+            self.first_day -= before
+
+    def timeline(self) -> Timeline:
+        """
+        Дневной ряд созданных и закрытых задач
+
+        Returns:
+            Дневной ряд
+        """
+        starts = np.arange(self.first_day, self.first_day + len(self.created), dtype=np.int64)
+        return Timeline(starts, self.created.copy(), self.closed.copy())
+
+    def backlog(self) -> np.ndarray:
+        """
+        Количество открытых задач на конец каждого дня ряда timeline()
+
+        Returns:
+            Массив размера бэклога
+        """
+        return np.cumsum(self.created - self.closed)
+
+    def throughput(self, period: str = 'week') -> Timeline:
+        """
+        Пропускная способность: закрытые задачи по периодам
+
+        Args:
+            period: Период агрегации (day, week, month)
+
+        Returns:
+            Агрегированный ряд (количество закрытых задач - closed)
+        """
+        return self.timeline().resample(period)
+
+    def lead_time_percentiles(self, quantiles: Sequence[float] = LEAD_TIME_QUANTILES) -> Dict[float, float]:
+        """
+        Перцентили времени выполнения (от создания до разрешения) в днях
+
+        Args:
+            quantiles: Уровни квантилей
+
+        Returns:
+            Словарь {уровень: дни}
+        """
+        return {q: self.lead_times.quantile(q) for q in quantiles}
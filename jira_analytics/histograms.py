@@ -0,0 +1,86 @@
+"""Модуль предварительного расчета гистограмм"""
+from typing import Sequence, Union
+import numpy as np
+
+# Количество интервалов по умолчанию
+DEFAULT_BINS = 15
+
+# Интервалы: количество или явные границы
+Bins = Union[int, Sequence[float]]
+
+
+class Histogram:
+    """Гистограмма: количества по интервалам и границы интервалов"""
+
+    def __init__(self, counts: np.ndarray, edges: np.ndarray, log_scale: bool = False):
+        """
+        Инициализация гистограммы
+
+        Args:
+            counts: Количество значений в каждом интервале
+            edges: Границы интервалов (на одну больше, чем counts)
+            log_scale: Интервалы построены в логарифмической шкале
+        """
+        self.counts = counts
+        self.edges = edges
+        self.log_scale = log_scale
+
+    @property
+    def total(self) -> int:
+        """Общее количество значений"""
+        return int(self.counts.sum())
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, Histogram) and self.log_scale == other.log_scale and
+                np.array_equal(self.counts, other.counts) and np.array_equal(self.edges, other.edges))
+
+
+def histogram_edges(values: np.ndarray, bins: Bins = DEFAULT_BINS, log_scale: bool = False) -> np.ndarray:
+    """
+    Расчет границ интервалов
+
+    Логарифмические интервалы строятся по log(1 + x), поэтому допускают
+    нулевые значения и подходят для распределений с тяжелым хвостом.
+
+    Args:
+        values: Значения
+        bins: Количество интервалов или явные границы
+        log_scale: Логарифмическая шкала интервалов
+
+    Returns:
+        Массив границ интервалов
+    """
+    if not isinstance(bins, (int, np.integer)):
+        return np.asarray(bins, dtype=np.float64)
+
+    if len(values) == 0:
+        return np.linspace(0.0, 1.0, bins + 1)
+
+    if log_scale:
+        low, high = max(float(values.min()), 0.0), float(values.max())
+        high = max(high, low + 1)
+        edges = np.expm1(np.linspace(np.log1p(low), np.log1p(high), bins + 1))
+        # expm1(log1p(x)) может отличаться от x в последнем знаке
+        edges[0], edges[-1] = low, high
+        return edges
+
+    return np.histogram_bin_edges(values, bins=bins)
+
+
+def compute_histogram(values: Union[np.ndarray, Sequence[float]], bins: Bins = DEFAULT_BINS,
+                      log_scale: bool = False) -> Histogram:
+    """
+    Расчет гистограммы по массиву значений
+
+    Args:
+        values: Значения
+        bins: Количество интервалов или явные границы
+        log_scale: Логарифмическая шкала интервалов
+
+    Returns:
+        Гистограмма
+    """
+    values = np.asarray(values, dtype=np.float64)
+    edges = histogram_edges(values, bins, log_scale)
+    counts, _ = np.histogram(values, bins=edges)
+    return Histogram(counts, edges, log_scale)
@@ -0,0 +1,210 @@
+"""Модуль индексов таблицы задач для быстрого отбора"""
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple, Union
+import numpy as np
+from jira_analytics.exceptions import DataProcessingError
+from jira_analytics.issue_table import CATEGORICAL_COLUMNS, IssueTable, MISSING
+
+# Значение условия по категориальной колонке: одно значение или несколько
+Labels = Union[str, Iterable[str]]
+# Граница диапазона дат: дата или строка ISO (YYYY-MM-DD)
+DateBound = Union[str, date]
+
+
+
+def _to_seconds(value: Optional[DateBound]) -> Optional[float]:
+    """Граница диапазона в секундах эпохи UTC"""
+    if value is None:
+        return None
+    try:
+        return float(np.datetime64(value, 's').astype(np.int64))
+    except ValueError as e:
+        raise DataProcessingError(f"Некорректная дата отбора {value!r}: {e}")
+
+
+class IssueFilter:
+    """
+    Условия отбора задач для отчетов
+
+    Условия объединяются по И, значения одной колонки - по ИЛИ.
+    Объект неизменяемый и хешируемый, поэтому служит ключом кэша отчетов.
+    """
+
+    def __init__(self, created_from: Optional[DateBound] = None,
+                 created_to: Optional[DateBound] = None,
+                 status: Optional[Labels] = None, priority: Optional[Labels] = None,
+                 assignee: Optional[Labels] = None, reporter: Optional[Labels] = None):
+        """
+        Инициализация условий отбора
+
+        Args:
+            created_from: Задачи, созданные не раньше даты (включительно)
+            created_to: Задачи, созданные раньше даты (не включительно)
+            status: Статусы
+            priority: Приоритеты
+            assignee: Исполнители
+            reporter: Авторы
+        """
+        self.created_from = _to_seconds(created_from)
+        self.created_to = _to_seconds(created_to)
+        self.labels: Dict[str, Tuple[str, ...]] = {}
+        for column, values in (('status', status), ('priority', priority),
+                               ('assignee', assignee), ('reporter', reporter)):
+            if values is not None:
+                values = (values,) if isinstance(values, str) else values
+                self.labels[column] = tuple(sorted(set(values)))
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """Поля задач JIRA, по которым выполняется отбор"""
+        dated = self.created_from is not None or self.created_to is not None
+        return (('created',) if dated else ()) + tuple(self.labels)
+
+    def _key(self) -> tuple:
+        return self.created_from, self.created_to, tuple(sorted(self.labels.items()))
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, IssueFilter) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __bool__(self) -> bool:
+        """Есть ли хотя бы одно условие"""
+        return self.created_from is not None or self.created_to is not None or bool(self.labels)
+
+    def __repr__(self) -> str:
+        parts = [f'{column}={list(values)}' for column, values in self.labels.items()]
+        for name in ('created_from', 'created_to'):
+            seconds = getattr(self, name)
+            if seconds is not None:
+                parts.append(f"{name}={np.datetime64(int(seconds), 's')}")
+        return f"IssueFilter({', '.join(parts)})"
+
+
+class IssueIndex:
+    """
+    Индексы таблицы задач
+
+    Строки, упорядоченные по дате создания, позволяют выбрать диапазон
+    дат двоичным поиском; инвертированные индексы категориальных колонок
+    хранят строки каждого значения подряд в одном массиве.
+    """
+
+    def __init__(self, table: IssueTable):
+        """
+        Построение индексов
+
+        Args:
+            table: Таблица задач
+        """
+        self.table = table
+        # Задачи без даты создания (NaN) оказываются в конце порядка
+        self.created_order = np.argsort(table.created, kind='stable')
+        self.created_sorted = table.created[self.created_order]
+        self._dated = len(table) - int(np.count_nonzero(np.isnan(table.created)))
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for column, codes in table.codes.items():
+            order = np.argsort(codes, kind='stable')
+            counts = np.bincount(codes[codes != MISSING], minlength=len(table.labels(column)))
+            # Строки без значения (MISSING) стоят в начале порядка и пропускаются
+            offsets = np.concatenate([[0], np.cumsum(counts)]) + (len(codes) - counts.sum())
+            self.postings[column] = (order, offsets)
+        self._codes = {name: {label: code for code, label in enumerate(labels)}
+                       for name, labels in table.dictionaries.items()}
+
+    def created_range(self, start: Optional[float], end: Optional[float]) -> np.ndarray:
+        """
+        Строки задач, созданных в диапазоне [start, end)
+
+        Args:
+            start: Начало диапазона, секунды эпохи (None - без ограничения)
+            end: Конец диапазона, секунды эпохи (None - без ограничения)
+
+        Returns:
+            Номера строк в порядке даты создания
+        """
+        return self.created_order[self._created_bounds(start, end)]
+
+    def _created_bounds(self, start: Optional[float], end: Optional[float]) -> slice:
+        """Границы диапазона [start, end) в порядке даты создания"""
+        dated = self.created_sorted[:self._dated]
+        low = 0 if start is None else int(np.searchsorted(dated, start, 'left'))
+        high = self._dated if end is None else int(np.searchsorted(dated, end, 'left'))
+        return slice(low, max(low, high))
+
+    def codes_for(self, column: str, labels: Iterable[str]) -> np.ndarray:
+        """
+        Коды значений категориальной колонки (неизвестные значения пропускаются)
+
+        Args:
+            column: Имя категориальной колонки
+            labels: Значения
+
+        Returns:
+            Массив кодов
+        """
+        mapping = self._codes[CATEGORICAL_COLUMNS[column]]
+        return np.array([mapping[label] for label in labels if label in mapping], dtype=np.int32)
+
+    def rows_with(self, column: str, codes: np.ndarray) -> np.ndarray:
+        """
+        Строки задач с любым из кодов колонки
+
+        Args:
+            column: Имя категориальной колонки
+            codes: Коды значений
+
+        Returns:
+            Номера строк
+        """
+        order, offsets = self.postings[column]
+        parts = [order[offsets[code]:offsets[code + 1]] for code in codes]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=order.dtype)
+
+    def select(self, issue_filter: IssueFilter) -> np.ndarray:
+        """
+        Номера строк задач, удовлетворяющих условиям
+
+        Строки выбираются по самому избирательному условию через индекс,
+        остальные условия проверяются только на выбранных строках.
+
+        Args:
+            issue_filter: Условия отбора
+
+        Returns:
+            Возрастающий массив номеров строк
+        """
+        table = self.table
+        codes = {column: self.codes_for(column, labels)
+                 for column, labels in issue_filter.labels.items()}
+
+        # Размеры кандидатов: диапазон дат и объединения списков значений
+        candidates = {}
+        if issue_filter.created_from is not None or issue_filter.created_to is not None:
+            bounds = self._created_bounds(issue_filter.created_from, issue_filter.created_to)
+            candidates['created'] = bounds.stop - bounds.start
+        for column, column_codes in codes.items():
+            offsets = self.postings[column][1]
+            candidates[column] = int(np.sum(offsets[column_codes + 1] - offsets[column_codes]))
+        if not candidates:
+            return np.arange(len(table))
+
+        driver = min(candidates, key=candidates.get)
+        if driver == 'created':
+            rows = self.created_range(issue_filter.created_from, issue_filter.created_to)
+        else:
+            rows = self.rows_with(driver, codes[driver])
+
+        if driver != 'created' and 'created' in candidates:
+            created = table.created[rows]
+            keep = np.ones(len(rows), dtype=bool)
+            if issue_filter.created_from is not None:
+                keep &= created >= issue_filter.created_from
+            if issue_filter.created_to is not None:
+                keep &= created < issue_filter.created_to
+            rows = rows[keep]
+        for column, column_codes in codes.items():
+            if column != driver:
+                rows = rows[np.isin(table.codes[column][rows], column_codes)]
+        return np.sort(rows)
@@ -0,0 +1,293 @@
+"""Модуль колоночного представления задач JIRA"""
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+import numpy as np
+from jira_analytics.dates import format_jira_timestamp, parse_jira_timestamps
+from jira_analytics.transitions import TransitionLog, TransitionLogBuilder
+
+# Код отсутствующего значения в категориальных колонках
+MISSING = -1
+
+SECONDS_PER_DAY = 86400
+
+# Категориальная колонка -> имя словаря строк (исполнитель и автор
+# используют общий словарь пользователей)
+CATEGORICAL_COLUMNS = {
+    'status': 'status',
+    'priority': 'priority',
+    'assignee': 'user',
+    'reporter': 'user'
+}
+
+
+class _Dictionary:
+    """Словарь строк для кодирования категориальных значений"""
+
+    def __init__(self, values: Optional[List[str]] = None):
+        self.values: List[str] = list(values or [])
+        self.codes: Dict[str, int] = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return MISSING
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+def merge_dictionaries(dictionaries: Dict[str, List[str]],
+                       other: 'IssueTable') -> Tuple[Dict[str, List[str]], Dict[str, np.ndarray]]:
+    """
+    Дополнение словарей строк значениями другой таблицы
+
+    Args:
+        dictionaries: Исходные словари {имя словаря: список значений}
+        other: Таблица, коды которой перекодируются
+
+    Returns:
+        Кортеж (дополненные словари, отображения кодов other по колонкам);
+        последний элемент отображения соответствует коду MISSING
+    """
+    merged = {name: _Dictionary(values) for name, values in dictionaries.items()}
+    mappings = {}
+    for column in other.codes:
+        dictionary = merged[CATEGORICAL_COLUMNS[column]]
+        mappings[column] = np.array(
+            [dictionary.encode(value) for value in other.labels(column)] + [MISSING], dtype=np.int32)
+    return {name: dictionary.values for name, dictionary in merged.items()}, mappings
+
+
+class IssueTable:
+    """Колоночное хранилище задач JIRA на массивах NumPy"""
+
+    def __init__(self, keys: np.ndarray, created: np.ndarray, resolved: np.ndarray,
+                 has_resolution: np.ndarray, timespent: np.ndarray,
+                 codes: Dict[str, np.ndarray], dictionaries: Dict[str, List[str]],
+                 transitions: Optional[TransitionLog] = None):
+        """
+        Инициализация таблицы из готовых колонок
+
+        Args:
+            keys: Ключи задач
+            created: Дата создания, секунды эпохи (NaN при отсутствии)
+            resolved: Дата разрешения, секунды эпохи (NaN при отсутствии)
+            has_resolution: Признак заполненного поля resolutiondate
+            timespent: Затраченное время в секундах (NaN при отсутствии)
+            codes: Категориальные колонки {имя: массив кодов}
+            dictionaries: Словари строк {имя словаря: список значений}
+            transitions: Переходы между статусами (None, если журнал
+                изменений не загружался); коды статусов - в словаре status
+        """
+        self.keys = keys
+        self.created = created
+        self.resolved = resolved
+        self.has_resolution = has_resolution
+        self.timespent = timespent
+        self.codes = codes
+        self.dictionaries = dictionaries
+        self.transitions = transitions
+        self.resolution_days = self._compute_resolution_days()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def from_issues(cls, issues: Iterable[Dict[str, Any]]) -> 'IssueTable':
+        """
+        Построение таблицы за один проход по задачам
+
+        Переходы между статусами из журнала изменений (если он загружен)
+        накапливаются в том же проходе.
+
+        Args:
+            issues: Задачи JIRA (список или генератор)
+
+        Returns:
+            Таблица задач
+        """
+        dictionaries = {name: _Dictionary() for name in set(CATEGORICAL_COLUMNS.values())}
+        keys, created, resolved, timespent = [], [], [], []
+        codes = {column: [] for column in CATEGORICAL_COLUMNS}
+        transitions = None
+
+        for issue in issues:
+            fields = issue.get('fields') or {}
+            row = len(keys)
+            keys.append(issue.get('key', ''))
+            created.append(fields.get('created'))
+            resolved.append(fields.get('resolutiondate'))
+            timespent.append(fields.get('timespent') or np.nan)
+
+            status = fields.get('status')
+            codes['status'].append(dictionaries['status'].encode(
+                status.get('name') if status else None))
+
+            priority = fields.get('priority')
+            codes['priority'].append(dictionaries['priority'].encode(
+                priority.get('name', 'Без приоритета') if priority else None))
+
+            for column in ('assignee', 'reporter'):
+                user = fields.get(column)
+                codes[column].append(dictionaries['user'].encode(
+                    user.get('displayName', 'Unknown') if user else None))
+
+            changelog = issue.get('changelog')
+            if changelog is not None:
+                if transitions is None:
+                    transitions = TransitionLogBuilder()
+                encode = dictionaries['status'].encode
+                for created_at, from_status, to_status in changelog.get('transitions', ()):
+                    transitions.append(row, created_at, encode(from_status), encode(to_status))
+
+        return cls(
+            keys=np.array(keys, dtype=str),
+            created=parse_jira_timestamps(created),
+            resolved=parse_jira_timestamps(resolved),
+            has_resolution=np.array([bool(value) for value in resolved], dtype=bool),
+            timespent=np.array(timespent, dtype=np.float64),
+            codes={column: np.array(values, dtype=np.int32) for column, values in codes.items()},
+            dictionaries={name: dictionary.values for name, dictionary in dictionaries.items()},
+            transitions=transitions.build() if transitions is not None else None
+        )
+
+    def _compute_resolution_days(self) -> np.ndarray:
+        """
+        Расчет полных дней от создания до разрешения
+
+        Returns:
+            Массив int32: -1 для неразрешенных задач, 0 при ошибке дат
+            или дате разрешения раньше даты создания
+        """
+        with np.errstate(invalid='ignore'):
+            delta = self.resolved - self.created
+            negative = delta < 0
+            days = np.floor(delta / SECONDS_PER_DAY)
+        days = np.where(np.isfinite(days) & ~negative, days, 0).astype(np.int32)
+
+        reversed_count = int(np.count_nonzero(negative & self.has_resolution))
+        if reversed_count:
+            print(f"Предупреждение: у {reversed_count} задач дата разрешения раньше даты создания")
+
+        return np.where(self.has_resolution, days, MISSING).astype(np.int32)
+
+    def take(self, rows: np.ndarray) -> 'IssueTable':
+        """
+        Выборка строк таблицы
+
+        Args:
+            rows: Индексы строк или булева маска
+
+        Returns:
+            Новая таблица с общими словарями строк
+        """
+        transitions = None
+        if self.transitions is not None:
+            selected = np.arange(len(self))[rows]
+            row_map = np.full(len(self), MISSING, dtype=np.int64)
+            row_map[selected] = np.arange(len(selected))
+            transitions = self.transitions.reindex(row_map)
+
+        return IssueTable(
+            keys=self.keys[rows],
+            created=self.created[rows],
+            resolved=self.resolved[rows],
+            has_resolution=self.has_resolution[rows],
+            timespent=self.timespent[rows],
+            codes={column: codes[rows] for column, codes in self.codes.items()},
+            dictionaries=self.dictionaries,
+            transitions=transitions
+        )
+
+    def upsert(self, other: 'IssueTable') -> 'IssueTable':
+        """
+        Объединение с таблицей обновленных задач
+
+        Строки с ключами из other заменяются, новые задачи добавляются
+        в конец. Коды other перекодируются в словари текущей таблицы.
+
+        Args:
+            other: Таблица новых и измененных задач
+
+        Returns:
+            Новая объединенная таблица
+        """
+        dictionaries, mappings = merge_dictionaries(self.dictionaries, other)
+        # Код MISSING (-1) указывает на последний элемент отображения
+        remapped = {column: mappings[column][codes] for column, codes in other.codes.items()}
+
+        kept = ~np.isin(self.keys, other.keys)
+
+        transitions = None
+        if self.transitions is not None or other.transitions is not None:
+            row_map = np.where(kept, np.cumsum(kept) - 1, MISSING)
+            transitions = (self.transitions or TransitionLog.empty()).reindex(row_map).concat(
+                other.transitions or TransitionLog.empty(), int(np.count_nonzero(kept)),
+                mappings['status'])
+
+        return IssueTable(
+            keys=np.concatenate([self.keys[kept], other.keys]),
+            created=np.concatenate([self.created[kept], other.created]),
+            resolved=np.concatenate([self.resolved[kept], other.resolved]),
+            has_resolution=np.concatenate([self.has_resolution[kept], other.has_resolution]),
+            timespent=np.concatenate([self.timespent[kept], other.timespent]),
+            codes={column: np.concatenate([codes[kept], remapped[column]])
+                   for column, codes in self.codes.items()},
+            dictionaries=dictionaries,
+            transitions=transitions
+        )
+
+    def to_issues(self) -> List[Dict[str, Any]]:
+        """
+        Восстановление задач в формате ответа JIRA
+
+        Сохраняются только поля, хранимые в таблице; даты приводятся к UTC,
+        журнал изменений не восстанавливается.
+
+        Returns:
+            Список задач {'key': ..., 'fields': {...}}
+        """
+        wrappers = {'status': 'name', 'priority': 'name',
+                    'assignee': 'displayName', 'reporter': 'displayName'}
+        columns = {column: [None if code == MISSING else {wrappers[column]: labels[code]}
+                            for code in self.codes[column].tolist()]
+                   for column, labels in ((column, self.labels(column)) for column in self.codes)}
+
+        issues = []
+        for row, key in enumerate(self.keys.tolist()):
+            fields = {
+                'created': format_jira_timestamp(self.created[row]),
+                'resolutiondate': (format_jira_timestamp(self.resolved[row])
+                                   if self.has_resolution[row] else None),
+                'timespent': None if np.isnan(self.timespent[row]) else int(self.timespent[row])
+            }
+            for column, values in columns.items():
+                fields[column] = values[row]
+            issues.append({'key': key, 'fields': fields})
+        return issues
+
+    def labels(self, column: str) -> List[str]:
+        """
+        Словарь строк для категориальной колонки
+
+        Args:
+            column: Имя категориальной колонки
+
+        Returns:
+            Список значений, индекс которого соответствует коду
+        """
+        return self.dictionaries[CATEGORICAL_COLUMNS[column]]
+
+    def count_codes(self, column: str) -> np.ndarray:
+        """
+        Количество задач по кодам категориальной колонки
+
+        Args:
+            column: Имя категориальной колонки
+
+        Returns:
+            Массив количеств длины словаря (отсутствующие значения не учитываются)
+        """
+        codes = self.codes[column]
+        return np.bincount(codes[codes != MISSING], minlength=len(self.labels(column)))
@@ -1,9 +1,43 @@
 """Модуль для работы с JIRA API"""
-import requests
 import json
-from typing import Dict, List, Any
-from datetime import datetime
+import math
+import random
+import threading
+import time
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Any, Optional, Iterator, Sequence, Tuple
+from datetime import datetime, timezone
+from jira_analytics.dates import parse_jira_timestamp
 from jira_analytics.exceptions import JiraApiError
+from jira_analytics.lazy import LazyModule
+from jira_analytics.streaming import (SearchResponseStream, build_projection, project_issue,
+                                      status_transitions)
+
+# requests загружается при создании первого клиента
+requests = LazyModule('requests')
+
+# Коды ответа, при которых запрос повторяется
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Размер фрагмента при потоковом чтении ответа
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Статусы задач, загружаемых по умолчанию
+DEFAULT_STATUSES = ('Closed', 'Resolved')
+
+# Размер страницы постраничной догрузки журнала изменений задачи
+CHANGELOG_PAGE_SIZE = 100
+
+# Устойчивый порядок выдачи поиска
+SEARCH_ORDER = ' ORDER BY key ASC'
+
+# Поля задачи, запрашиваемые по умолчанию (все поля, используемые отчетами)
+SEARCH_FIELDS = ('created', 'updated', 'resolutiondate', 'status', 'reporter', 'assignee',
+                 'priority', 'timespent')
+
 
 def calculate_resolution_days(created_str: str, resolved_str: str) -> int:
     """
@@ -16,64 +50,422 @@ def calculate_resolution_days(created_str: str, resolved_str: str) -> int:
     Returns:
         Количество дней (0 при ошибке)
     """
-    try:
-        if not created_str or not resolved_str:
-            return 0
-
-        created = datetime.strptime(created_str.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-        resolved = datetime.strptime(resolved_str.split('.')[0], '%Y-%m-%dT%H:%M:%S')
+    if not created_str or not resolved_str:
+        return 0
 
-        if resolved < created:
-            print(f"Предупреждение: Дата разрешения раньше даты создания")
-            return 0
+    created = parse_jira_timestamp(created_str)
+    resolved = parse_jira_timestamp(resolved_str)
+    if math.isnan(created) or math.isnan(resolved):
+        print(f"Ошибка при расчете времени: неверный формат даты "
+              f"({created_str!r}, {resolved_str!r})")
+        return 0
 
-        return (resolved - created).days
-    except (ValueError, AttributeError, TypeError) as e:
-        print(f"Ошибка при расчете времени: {e}")
+    if resolved < created:
+        print(f"Предупреждение: Дата разрешения раньше даты создания")
         return 0
 
-def fetch_jira_issues(jira_url: str, project_key: str, max_results: int) -> List[Dict[str, Any]]:
+    return int((resolved - created) // 86400)
+
+class JiraClient:
+    """Клиент JIRA REST API с пулом соединений и повтором запросов"""
+
+    def __init__(self, jira_url: str, pool_size: int = 10, timeout: float = 30,
+                 max_retries: int = 5, backoff_factor: float = 0.5, max_backoff: float = 60):
+        """
+        Инициализация клиента
+
+        Args:
+            jira_url: URL JIRA сервера
+            pool_size: Размер пула keep-alive соединений
+            timeout: Таймаут одного запроса в секундах
+            max_retries: Максимальное количество повторов при 429/5xx
+            backoff_factor: Базовая задержка экспоненциального отката в секундах
+            max_backoff: Верхняя граница задержки в секундах
+        """
+        self.jira_url = jira_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.latencies: List[float] = []
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'JiraClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрыть сессию и освободить соединения"""
+        self.session.close()
+
+    def _retry_delay(self, response: Optional['requests.Response'], attempt: int) -> float:
+        """
+        Вычисление задержки перед повтором запроса
+
+        Заголовок Retry-After имеет приоритет, иначе используется
+        экспоненциальный откат с полным джиттером.
+
+        Args:
+            response: Ответ сервера (None при сетевой ошибке)
+            attempt: Номер попытки, начиная с 0
+
+        Returns:
+            Задержка в секундах
+        """
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    moment = parsedate_to_datetime(retry_after)
+                    return min(max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0),
+                               self.max_backoff)
+                except (TypeError, ValueError):
+                    pass
+            else:
+                # Отрицательные, бесконечные и NaN значения игнорируются
+                if math.isfinite(delay) and delay >= 0:
+                    return min(delay, self.max_backoff)
+
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** attempt))
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None,
+            stream: bool = False) -> 'requests.Response':
+        """
+        GET-запрос к API с повтором при 429/5xx и сетевых ошибках
+
+        Args:
+            path: Путь метода API относительно URL сервера
+            params: Параметры запроса
+            stream: Не загружать тело ответа сразу (для потокового разбора)
+
+        Returns:
+            Успешный ответ сервера
+
+        Raises:
+            requests.exceptions.RequestException: Если все попытки исчерпаны
+        """
+        url = f"{self.jira_url}{path}"
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                response = None
+            finally:
+                with self._lock:
+                    self.latencies.append(time.perf_counter() - started)
+
+            if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                response.raise_for_status()
+                return response
+
+            if attempt >= self.max_retries:
+                response.raise_for_status()
+                return response
+
+            if response is not None:
+                response.close()
+            with self._lock:
+                self.retries += 1
+            time.sleep(self._retry_delay(response, attempt))
+            attempt += 1
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        GET-запрос к API с разбором JSON-ответа
+
+        Args:
+            path: Путь метода API относительно URL сервера
+            params: Параметры запроса
+
+        Returns:
+            Разобранный JSON-ответ
+        """
+        return self.get(path, params).json()
+
+    def search_page(self, params: Dict[str, Any], start_at: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Потоковая загрузка страницы поиска с проекцией задач
+
+        Задачи разбираются по мере поступления ответа и сразу сокращаются
+        до запрошенных в params['fields'] полей, поэтому полное дерево
+        ответа в памяти не строится.
+
+        Args:
+            params: Параметры поиска без startAt
+            start_at: Смещение первой задачи страницы
+
+        Returns:
+            Кортеж (общее количество задач, задачи страницы)
+        """
+        response = self.get("/rest/api/2/search", dict(params, startAt=start_at), stream=True)
+        try:
+            stream = SearchResponseStream(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+            projection = build_projection(params.get('fields', ','.join(SEARCH_FIELDS)).split(','))
+            issues = [project_issue(issue, projection) for issue in stream]
+        finally:
+            response.close()
+
+        if params.get('expand') == 'changelog':
+            for issue in issues:
+                self.complete_changelog(issue)
+        return stream.header.get('total', 0), issues
+
+    def complete_changelog(self, issue: Dict[str, Any]) -> None:
+        """
+        Догрузка журнала изменений задачи, не поместившегося в ответ поиска
+
+        Поиск возвращает ограниченное число записей журнала; остальные
+        запрашиваются постранично и сразу сокращаются до переходов статусов.
+
+        Args:
+            issue: Проекция задачи с сокращенным журналом (изменяется на месте)
+        """
+        changelog = issue.get('changelog')
+        while changelog and changelog['received'] < changelog['total']:
+            page = self.get_json(f"/rest/api/2/issue/{issue['key']}/changelog",
+                                 {'startAt': changelog['received'], 'maxResults': CHANGELOG_PAGE_SIZE})
+            histories = page.get('values', page.get('histories')) or []
+            if not histories:
+                break
+            changelog['transitions'].extend(status_transitions(histories))
+            changelog['received'] += len(histories)
+
+    def latency_stats(self) -> Dict[str, float]:
+        """
+        Статистика задержек выполненных запросов
+
+        Returns:
+            Словарь с количеством запросов, повторов и задержками в секундах
+        """
+        with self._lock:
+            latencies = sorted(self.latencies)
+            retries = self.retries
+
+        if not latencies:
+            return {'requests': 0, 'retries': retries}
+
+        return {
+            'requests': len(latencies),
+            'retries': retries,
+            'mean': sum(latencies) / len(latencies),
+            'p50': latencies[len(latencies) // 2],
+            'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            'max': latencies[-1]
+        }
+
+def build_filter_clause(statuses: Optional[Sequence[str]] = DEFAULT_STATUSES,
+                        jql: Optional[str] = None) -> str:
     """
-    Получение задач из JIRA API
+    Формирование условия отбора задач проекта
 
     Args:
-        jira_url: URL JIRA сервера
-        project_key: Ключ проекта
-        max_results: Максимальное количество результатов
+        statuses: Статусы задач; None или пустой список - задачи в любом статусе
+        jql: Дополнительное условие JQL, объединяемое через AND
 
     Returns:
-        Список задач JIRA
+        Условие JQL без ограничения по проекту (пустая строка - без отбора)
+    """
+    clauses = []
+    if statuses:
+        clauses.append("status in (" + ", ".join(f'"{status}"' for status in statuses) + ")")
+    if jql:
+        clauses.append(f"({jql})")
+    return " AND ".join(clauses)
 
-    Raises:
-        JiraApiError: При ошибках API JIRA
+def build_search_params(project_key: str, max_results: int,
+                        updated_since: Optional[str] = None,
+                        jql: Optional[str] = None,
+                        statuses: Optional[Sequence[str]] = DEFAULT_STATUSES,
+                        expand_changelog: bool = False,
+                        fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Формирование параметров поиска задач проекта
+
+    Args:
+        project_key: Ключ проекта
+        max_results: Размер страницы (maxResults одного запроса)
+        updated_since: Нижняя граница поля updated (формат JQL "yyyy-MM-dd HH:mm")
+        jql: Дополнительное условие JQL, объединяемое через AND
+        statuses: Статусы задач; None или пустой список - задачи в любом статусе
+        expand_changelog: Запросить журнал изменений задач (expand=changelog)
+        fields: Запрашиваемые поля задач (по умолчанию SEARCH_FIELDS)
+
+    Returns:
+        Параметры запроса без startAt
     """
-    url = f"{jira_url}/rest/api/2/search"
+    query = f"project={project_key}"
+    clause = build_filter_clause(statuses, jql)
+    if clause:
+        query += f" AND {clause}"
+    if updated_since:
+        query += f' AND updated >= "{updated_since}"'
+    # Страницы загружаются параллельно по смещению startAt: без устойчивого
+    # порядка задачи могли бы пропускаться или повторяться между страницами
+    query += SEARCH_ORDER
     params = {
-        "jql": f"project={project_key} AND status in (Closed, Resolved)",
+        "jql": query,
         "maxResults": max_results,
-        "fields": "key,created,resolutiondate,status,reporter,assignee,priority,timespent,summary"
+        "fields": ",".join(fields or SEARCH_FIELDS)
     }
+    if expand_changelog:
+        params["expand"] = "changelog"
+    return params
+
+def to_api_error(error: Exception, jira_url: str) -> JiraApiError:
+    """
+    Преобразование ошибки запроса в JiraApiError
+
+    Args:
+        error: Исходное исключение
+        jira_url: URL JIRA сервера
+
+    Returns:
+        Исключение JiraApiError с описанием ошибки
+    """
+    if isinstance(error, JiraApiError):
+        return error
+    if isinstance(error, requests.exceptions.Timeout):
+        return JiraApiError(f"Таймаут при запросе к JIRA ({jira_url})")
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return JiraApiError(f"Ошибка подключения к JIRA ({jira_url})")
+    if isinstance(error, requests.exceptions.HTTPError):
+        status_code = error.response.status_code if error.response is not None else "unknown"
+        return JiraApiError(f"HTTP ошибка {status_code} при запросе к JIRA: {error}")
+    if isinstance(error, json.JSONDecodeError):
+        return JiraApiError(f"Ошибка парсинга ответа JIRA: {error}")
+    return JiraApiError(f"Неожиданная ошибка при получении задач: {error}")
+
+def iter_jira_issues(jira_url: str, project_key: str, max_results: int,
+                     max_workers: int = 4,
+                     updated_since: Optional[str] = None,
+                     client: Optional[JiraClient] = None,
+                     jql: Optional[str] = None,
+                     statuses: Optional[Sequence[str]] = DEFAULT_STATUSES,
+                     expand_changelog: bool = False,
+                     fields: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Потоковое получение всех задач проекта из JIRA API
+
+    Первая страница определяет общее количество задач и фактический размер
+    страницы (сервер может ограничить maxResults). Остальные окна startAt
+    загружаются параллельно, не более max_workers страниц сверх текущей,
+    и выдаются в исходном порядке.
+
+    Args:
+        jira_url: URL JIRA сервера
+        project_key: Ключ проекта
+        max_results: Размер страницы (maxResults одного запроса)
+        max_workers: Количество параллельных запросов
+        updated_since: Если задано, загружаются только задачи, обновленные
+            не раньше этого момента (формат JQL "yyyy-MM-dd HH:mm")
+        client: Клиент JIRA; если не задан, создается временный клиент
+            с пулом на max_workers соединений
+        jql: Дополнительное условие JQL
+        statuses: Статусы задач; None - задачи в любом статусе
+        expand_changelog: Загрузить переходы между статусами из журнала изменений
+        fields: Запрашиваемые поля задач (по умолчанию SEARCH_FIELDS)
+
+    Yields:
+        Задачи JIRA, сокращенные до используемых полей
+
+    Raises:
+        JiraApiError: При ошибках API JIRA
+    """
+    params = build_search_params(project_key, max_results, updated_since, jql, statuses,
+                                 expand_changelog, fields)
+
+    owns_client = client is None
+    if owns_client:
+        client = JiraClient(jira_url, pool_size=max_workers)
 
+    executor = None
+    pending = deque()
     try:
         print(f"Запрос задач проекта {project_key}...")
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-
-        total_issues = data.get("total", 0)
-        issues = data.get("issues", [])
-
-        print(f"Получено {len(issues)} из {total_issues} задач")
-        return issues
-
-    except requests.exceptions.Timeout:
-        raise JiraApiError(f"Таймаут при запросе к JIRA ({jira_url})")
-    except requests.exceptions.ConnectionError:
-        raise JiraApiError(f"Ошибка подключения к JIRA ({jira_url})")
-    except requests.exceptions.HTTPError as e:
-        status_code = e.response.status_code if e.response else "unknown"
-        raise JiraApiError(f"HTTP ошибка {status_code} при запросе к JIRA: {e}")
-    except json.JSONDecodeError as e:
-        raise JiraApiError(f"Ошибка парсинга ответа JIRA: {e}")
+        total_issues, issues = client.search_page(params, 0)
+        page_size = len(issues)
+        received = page_size
+        yield from issues
+
+        if page_size and total_issues > page_size:
+            windows = range(page_size, total_issues, page_size)
+            print(f"Загрузка оставшихся {len(windows)} страниц "
+                  f"({max_workers} параллельных запросов)...")
+            starts = iter(windows)
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            for start_at in islice(starts, max_workers * 2):
+                pending.append(executor.submit(client.search_page, params, start_at))
+
+            while pending:
+                _, issues = pending.popleft().result()
+                start_at = next(starts, None)
+                if start_at is not None:
+                    pending.append(executor.submit(client.search_page, params, start_at))
+                received += len(issues)
+                yield from issues
+
+        print(f"Получено {received} из {total_issues} задач")
+        stats = client.latency_stats()
+        if stats['requests']:
+            print(f"Запросов: {stats['requests']}, повторов: {stats['retries']}, "
+                  f"средняя задержка: {stats['mean']:.2f} с, p95: {stats['p95']:.2f} с")
+
     except Exception as e:
-        raise JiraApiError(f"Неожиданная ошибка при получении задач: {e}")
\ No newline at end of file
+        raise to_api_error(e, jira_url)
+    finally:
+        if executor is not None:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+        if owns_client:
+            client.close()
+
+def fetch_jira_issues(jira_url: str, project_key: str, max_results: int,
+                      max_workers: int = 4,
+                      updated_since: Optional[str] = None,
+                      client: Optional[JiraClient] = None,
+                      jql: Optional[str] = None,
+                      statuses: Optional[Sequence[str]] = DEFAULT_STATUSES,
+                      expand_changelog: bool = False,
+                      fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Получение всех задач проекта из JIRA API
+
+    Args:
+        jira_url: URL JIRA сервера
+        project_key: Ключ проекта
+        max_results: Размер страницы (maxResults одного запроса)
+        max_workers: Количество параллельных запросов
+        updated_since: Если задано, загружаются только задачи, обновленные
+            не раньше этого момента (формат JQL "yyyy-MM-dd HH:mm")
+        client: Клиент JIRA; если не задан, создается временный клиент
+        jql: Дополнительное условие JQL
+        statuses: Статусы задач; None - задачи в любом статусе
+        expand_changelog: Загрузить переходы между статусами из журнала изменений
+        fields: Запрашиваемые поля задач (по умолчанию SEARCH_FIELDS)
+
+    Returns:
+        Список задач JIRA, сокращенных до используемых полей
+
+    Raises:
+        JiraApiError: При ошибках API JIRA
+    """
+    return list(iter_jira_issues(jira_url, project_key, max_results, max_workers,
+                                 updated_since=updated_since, client=client,
+                                 jql=jql, statuses=statuses, expand_changelog=expand_changelog,
+                                 fields=fields))
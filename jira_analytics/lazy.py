@@ -0,0 +1,53 @@
+"""Модуль отложенного импорта тяжелых зависимостей"""
+import importlib
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+
+class LazyModule:
+    """
+    Модуль, импортируемый при первом обращении к его атрибуту
+
+    Позволяет оставить привычные обращения вида plt.figure() в коде,
+    не загружая модуль при импорте пакета.
+    """
+
+    def __init__(self, name: str, on_import: Optional[Callable[[ModuleType], None]] = None):
+        """
+        Инициализация отложенного модуля
+
+        Args:
+            name: Полное имя модуля
+            on_import: Функция настройки, вызываемая один раз после импорта
+        """
+        self._name = name
+        self._on_import = on_import
+        self._module: Optional[ModuleType] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Был ли модуль уже импортирован"""
+        return self._module is not None
+
+    def load(self) -> ModuleType:
+        """
+        Импорт модуля (повторные вызовы возвращают загруженный модуль)
+
+        Returns:
+            Модуль
+        """
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            if self._on_import is not None:
+                self._on_import(module)
+            self._module = module
+        return self._module
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__') or name in ('_name', '_on_import', '_module'):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self) -> str:
+        state = 'загружен' if self.loaded else 'не загружен'
+        return f"<LazyModule {self._name} ({state})>"
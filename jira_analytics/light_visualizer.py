@@ -0,0 +1,721 @@
+"""
+Облегченный бэкенд визуализации без matplotlib
+
+Графики описываются небольшой моделью (Chart и Layer) и выводятся
+напрямую в SVG или в спецификацию Vega-Lite из агрегированных массивов,
+без построения фигур matplotlib. Предназначен для пакетного режима
+и HTTP API, где графики строятся в больших количествах.
+"""
+import json
+import math
+import os
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from xml.sax.saxutils import escape
+import numpy as np
+from jira_analytics.exceptions import VisualizationError
+from jira_analytics.histograms import Histogram, compute_histogram
+from jira_analytics.survival import AgeReport
+from jira_analytics.timeline import EPOCH_DATE, Timeline, rolling_mean, timeline_arguments
+
+# Формат -> расширение файла
+LIGHT_FORMATS = {'svg': 'svg', 'vega': 'vl.json'}
+
+VEGA_LITE_SCHEMA = 'https://vega.github.io/schema/vega-lite/v5.json'
+
+# Размеры одной панели SVG и поля вокруг области построения
+PANEL_WIDTH = 800
+PANEL_HEIGHT = 450
+MARGIN_LEFT = 70
+MARGIN_RIGHT = 20
+MARGIN_BOTTOM = 60
+TITLE_LINE_HEIGHT = 18
+HORIZONTAL_LABEL_WIDTH = 110
+FONT_FAMILY = 'DejaVu Sans, Arial, sans-serif'
+
+ScaleValue = Union[float, str]
+
+
+class Layer:
+    """Слой графика: тип отметки и значения по осям"""
+
+    def __init__(self, mark: str, x: Sequence[ScaleValue] = (), y: Sequence[float] = (),
+                 color: str = '#2E86AB', label: Optional[str] = None,
+                 x2: Optional[Sequence[float]] = None, value_labels: bool = False):
+        """
+        Инициализация слоя
+
+        Args:
+            mark: Отметка: bar, line, area, step, hrule (горизонтальная линия
+                на уровне y[0]) или vrule (вертикальная линия на x[0])
+            x: Значения по оси X (числа, дни эпохи или категории)
+            y: Значения по оси Y
+            color: Цвет
+            label: Подпись в легенде
+            x2: Правые границы столбцов интервальной гистограммы
+            value_labels: Подписывать значения столбцов
+        """
+        self.mark = mark
+        self.x = list(x)
+        self.y = [float(value) for value in y]
+        self.color = color
+        self.label = label
+        self.x2 = None if x2 is None else [float(value) for value in x2]
+        self.value_labels = value_labels
+
+
+class Chart:
+    """Панель графика: заголовок, подписи осей и слои"""
+
+    def __init__(self, title: Union[str, Sequence[str]], x_label: str = '', y_label: str = '',
+                 x_type: str = 'quantitative', layers: Optional[List[Layer]] = None,
+                 horizontal: bool = False, log_x: bool = False,
+                 y_domain: Optional[Tuple[float, float]] = None, message: Optional[str] = None):
+        """
+        Инициализация панели
+
+        Args:
+            title: Заголовок (строка или строки)
+            x_label: Подпись оси X
+            y_label: Подпись оси Y
+            x_type: Тип оси X: quantitative, temporal (дни эпохи) или nominal
+            layers: Слои
+            horizontal: Категории по оси Y (горизонтальные столбцы)
+            log_x: Симметричная логарифмическая шкала X
+            y_domain: Явный диапазон оси Y
+            message: Текст вместо графика, если данных нет
+        """
+        self.title = [title] if isinstance(title, str) else list(title)
+        self.x_label = x_label
+        self.y_label = y_label
+        self.x_type = x_type
+        self.layers = layers or []
+        self.horizontal = horizontal
+        self.log_x = log_x
+        self.y_domain = y_domain
+        self.message = message
+
+
+def _symlog(value: float) -> float:
+    """Симметричный логарифм с линейным участком [-1, 1]"""
+    return value if abs(value) <= 1 else math.copysign(1 + math.log10(abs(value)), value)
+
+
+def _nice_ticks(low: float, high: float, count: int = 6) -> List[float]:
+    """Округленные значения делений оси"""
+    if high <= low:
+        return [low]
+    raw_step = (high - low) / count
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(factor * magnitude for factor in (1, 2, 2.5, 5, 10) if factor * magnitude >= raw_step)
+    first = math.ceil(low / step) * step
+    return [first + index * step for index in range(int((high - first) / step + 1e-9) + 1)]
+
+
+def _format_number(value: float) -> str:
+    """Подпись числа без лишних знаков"""
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return f'{value:.1f}'
+
+
+def _day_label(day: float) -> str:
+    """Подпись дня эпохи"""
+    return (EPOCH_DATE + timedelta(days=int(round(day)))).isoformat()
+
+
+class _Axis:
+    """Отображение значений оси в пиксели"""
+
+    def __init__(self, values: List[ScaleValue], start: float, end: float, kind: str,
+                 log: bool = False, domain: Optional[Tuple[float, float]] = None,
+                 include_zero: bool = False):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.log = log
+        if kind == 'nominal':
+            self.categories = list(dict.fromkeys(values))
+            return
+        numbers = [float(value) for value in values if not math.isnan(float(value))] or [0.0]
+        low, high = domain or (min(numbers), max(numbers))
+        if include_zero:
+            low, high = min(low, 0.0), max(high, 0.0)
+            if domain is None:
+                high *= 1.05
+        if log:
+            low, high = _symlog(low), _symlog(high)
+        self.low, self.high = (low, high) if high > low else (low - 1, low + 1)
+
+    @property
+    def band(self) -> float:
+        return abs(self.end - self.start) / max(len(self.categories), 1)
+
+    def position(self, value: ScaleValue) -> float:
+        if self.kind == 'nominal':
+            direction = 1 if self.end >= self.start else -1
+            return self.start + direction * self.band * (self.categories.index(value) + 0.5)
+        value = _symlog(float(value)) if self.log else float(value)
+        return self.start + (value - self.low) / (self.high - self.low) * (self.end - self.start)
+
+    def ticks(self) -> List[Tuple[float, str]]:
+        if self.kind == 'nominal':
+            return [(self.position(category), str(category)) for category in self.categories]
+        if self.log:
+            limit = int(max(abs(self.low), abs(self.high)))
+            values = [0.0] + [10.0 ** power for power in range(limit)]
+            values = [value for value in values if self.low <= _symlog(value) <= self.high]
+            return [(self.position(value), _format_number(value)) for value in values]
+        label = _day_label if self.kind == 'temporal' else _format_number
+        return [(self.position(value), label(value)) for value in _nice_ticks(self.low, self.high)]
+
+
+def _svg_text(x: float, y: float, text: str, size: int = 12, anchor: str = 'middle',
+              weight: str = 'normal', rotate: Optional[float] = None) -> str:
+    transform = f' transform="rotate({rotate} {x:.1f} {y:.1f})"' if rotate is not None else ''
+    return (f'<text x="{x:.1f}" y="{y:.1f}" font-size="{size}" text-anchor="{anchor}" '
+            f'font-weight="{weight}"{transform}>{escape(text)}</text>')
+
+
+def _svg_panel(chart: Chart, left: float, width: float, height: float) -> List[str]:
+    """Элементы SVG одной панели"""
+    top = 20 + TITLE_LINE_HEIGHT * len(chart.title)
+    plot_left, plot_right = left + MARGIN_LEFT, left + width - MARGIN_RIGHT
+    if chart.horizontal:
+        # Место для подписей категорий слева от оси
+        plot_left += HORIZONTAL_LABEL_WIDTH
+    plot_top, plot_bottom = top, height - MARGIN_BOTTOM
+    parts = [_svg_text(left + width / 2, 20 + TITLE_LINE_HEIGHT * index, line, 14, weight='bold')
+             for index, line in enumerate(chart.title)]
+    if chart.message is not None or not chart.layers:
+        parts.append(_svg_text(left + width / 2, (plot_top + plot_bottom) / 2,
+                               chart.message or 'Нет данных для построения графика'))
+        return parts
+
+    category_values = [value for layer in chart.layers if layer.mark not in ('hrule', 'vrule')
+                       for value in layer.x]
+    value_values = [value for layer in chart.layers if layer.mark != 'vrule' for value in layer.y]
+    if chart.horizontal:
+        x_axis = _Axis(value_values, plot_left, plot_right, 'quantitative', include_zero=True)
+        y_axis = _Axis(category_values, plot_top, plot_bottom, 'nominal')
+    else:
+        x_values = category_values + [value for layer in chart.layers for value in (layer.x2 or [])]
+        x_values += [value for layer in chart.layers if layer.mark == 'vrule' for value in layer.x]
+        x_axis = _Axis(x_values, plot_left, plot_right, chart.x_type, log=chart.log_x)
+        y_axis = _Axis(value_values, plot_bottom, plot_top, 'quantitative',
+                       domain=chart.y_domain, include_zero=True)
+
+    # Сетка и подписи делений
+    for position, label in y_axis.ticks():
+        if not chart.horizontal:
+            parts.append(f'<line x1="{plot_left:.1f}" y1="{position:.1f}" x2="{plot_right:.1f}" '
+                         f'y2="{position:.1f}" stroke="#ddd" stroke-width="1"/>')
+        parts.append(_svg_text(plot_left - 6, position + 4, label, 11, anchor='end'))
+    rotate = chart.x_type in ('temporal', 'nominal') and not chart.horizontal
+    for position, label in x_axis.ticks():
+        if chart.horizontal:
+            parts.append(f'<line x1="{position:.1f}" y1="{plot_top:.1f}" x2="{position:.1f}" '
+                         f'y2="{plot_bottom:.1f}" stroke="#ddd" stroke-width="1"/>')
+        if rotate:
+            parts.append(_svg_text(position, plot_bottom + 14, label, 11, anchor='end', rotate=-45))
+        else:
+            parts.append(_svg_text(position, plot_bottom + 16, label, 11))
+    parts.append(f'<path d="M{plot_left:.1f},{plot_top:.1f} V{plot_bottom:.1f} H{plot_right:.1f}" '
+                 f'fill="none" stroke="#333" stroke-width="1"/>')
+    parts.append(_svg_text((plot_left + plot_right) / 2, height - 8, chart.x_label, 12))
+    parts.append(_svg_text(left + 16, (plot_top + plot_bottom) / 2, chart.y_label, 12,
+                           rotate=-90))
+
+    for layer in chart.layers:
+        parts.extend(_svg_layer(layer, chart, x_axis, y_axis))
+
+    legend = [layer for layer in chart.layers if layer.label]
+    for index, layer in enumerate(legend):
+        y = plot_top + 8 + index * 16
+        parts.append(f'<rect x="{plot_left + 10:.1f}" y="{y - 8:.1f}" width="10" height="10" '
+                     f'fill="{layer.color}"/>')
+        parts.append(_svg_text(plot_left + 26, y + 1, layer.label, 11, anchor='start'))
+    return parts
+
+
+def _svg_layer(layer: Layer, chart: Chart, x_axis: _Axis, y_axis: _Axis) -> List[str]:
+    """Элементы SVG слоя"""
+    parts = []
+    if layer.mark == 'hrule':
+        y = y_axis.position(layer.y[0])
+        return [f'<line x1="{x_axis.start:.1f}" y1="{y:.1f}" x2="{x_axis.end:.1f}" y2="{y:.1f}" '
+                f'stroke="{layer.color}" stroke-dasharray="6 4"/>']
+    if layer.mark == 'vrule':
+        x = x_axis.position(layer.x[0])
+        return [f'<line x1="{x:.1f}" y1="{y_axis.start:.1f}" x2="{x:.1f}" y2="{y_axis.end:.1f}" '
+                f'stroke="{layer.color}" stroke-dasharray="6 4"/>']
+    if layer.mark == 'bar':
+        for index, value in enumerate(layer.y):
+            if chart.horizontal:
+                center, size = y_axis.position(layer.x[index]), y_axis.band * 0.8
+                x0, x1 = x_axis.position(0), x_axis.position(value)
+                box = (min(x0, x1), center - size / 2, abs(x1 - x0), size)
+                label_at = (box[0] + box[2] + 4, center + 4, 'start')
+            else:
+                if layer.x2 is not None:
+                    x0, x1 = x_axis.position(layer.x[index]), x_axis.position(layer.x2[index])
+                else:
+                    center, size = x_axis.position(layer.x[index]), x_axis.band * 0.8
+                    x0, x1 = center - size / 2, center + size / 2
+                y0, y1 = y_axis.position(0), y_axis.position(value)
+                box = (min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0))
+                label_at = (box[0] + box[2] / 2, box[1] - 4, 'middle')
+            parts.append(f'<rect x="{box[0]:.1f}" y="{box[1]:.1f}" width="{box[2]:.1f}" '
+                         f'height="{box[3]:.1f}" fill="{layer.color}" fill-opacity="0.7" '
+                         f'stroke="#333" stroke-width="0.5"/>')
+            if layer.value_labels:
+                parts.append(_svg_text(label_at[0], label_at[1], _format_number(value), 11,
+                                       anchor=label_at[2], weight='bold'))
+        return parts
+
+    points = [(x_axis.position(x), y_axis.position(y)) for x, y in zip(layer.x, layer.y)
+              if not math.isnan(y)]
+    if not points:
+        return parts
+    if layer.mark == 'step':
+        stepped = [points[0]]
+        for x, y in points[1:]:
+            stepped.extend([(x, stepped[-1][1]), (x, y)])
+        points = stepped
+    path = ' '.join(f'{x:.1f},{y:.1f}' for x, y in points)
+    if layer.mark == 'area':
+        base = y_axis.position(0)
+        parts.append(f'<polygon points="{points[0][0]:.1f},{base:.1f} {path} '
+                     f'{points[-1][0]:.1f},{base:.1f}" fill="{layer.color}" fill-opacity="0.3"/>')
+    parts.append(f'<polyline points="{path}" fill="none" stroke="{layer.color}" stroke-width="2"/>')
+    return parts
+
+
+def to_svg(charts: Sequence[Chart], panel_width: int = PANEL_WIDTH,
+           panel_height: int = PANEL_HEIGHT) -> str:
+    """
+    Документ SVG с панелями, расположенными по горизонтали
+
+    Args:
+        charts: Панели графика
+        panel_width: Ширина панели
+        panel_height: Высота панели
+
+    Returns:
+        Текст SVG
+    """
+    width = panel_width * len(charts)
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{panel_height}" '
+             f'viewBox="0 0 {width} {panel_height}" font-family="{FONT_FAMILY}">',
+             f'<rect width="{width}" height="{panel_height}" fill="white"/>']
+    for index, chart in enumerate(charts):
+        parts.extend(_svg_panel(chart, index * panel_width, panel_width, panel_height))
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+def _vega_value(value: ScaleValue, x_type: str) -> Any:
+    """Значение оси для данных Vega-Lite"""
+    if x_type == 'temporal':
+        return _day_label(value)
+    return value if isinstance(value, str) else float(value)
+
+
+def _vega_layers(chart: Chart) -> List[Dict[str, Any]]:
+    """Слои Vega-Lite панели"""
+    labels = [layer.label for layer in chart.layers if layer.label]
+    colors = [layer.color for layer in chart.layers if layer.label]
+    x_scale = {'type': 'symlog'} if chart.log_x else {}
+    # У горизонтальных столбцов подпись X относится к оси значений
+    x_title, y_title = ((chart.y_label, chart.x_label) if chart.horizontal
+                        else (chart.x_label, chart.y_label))
+    layers = []
+    for layer in chart.layers:
+        legend = ({'color': {'datum': layer.label, 'type': 'nominal', 'title': None,
+                             'scale': {'domain': labels, 'range': colors}}}
+                  if layer.label else {})
+        if layer.mark == 'hrule':
+            layers.append({'mark': {'type': 'rule', 'color': layer.color, 'strokeDash': [6, 4]},
+                           'encoding': dict(legend, y={'datum': layer.y[0]})})
+            continue
+        if layer.mark == 'vrule':
+            position = {'datum': _vega_value(layer.x[0], chart.x_type), 'type': chart.x_type}
+            layers.append({'mark': {'type': 'rule', 'color': layer.color, 'strokeDash': [6, 4]},
+                           'encoding': dict(legend, x=position)})
+            continue
+        values = []
+        for index, (x, y) in enumerate(zip(layer.x, layer.y)):
+            row = {'x': _vega_value(x, chart.x_type), 'y': None if math.isnan(y) else y}
+            if layer.x2 is not None:
+                row['x2'] = _vega_value(layer.x2[index], chart.x_type)
+            values.append(row)
+        mark = {'bar': 'bar', 'line': 'line', 'area': 'area', 'step': 'line'}[layer.mark]
+        mark_spec = {'type': mark, 'color': layer.color}
+        if layer.mark == 'step':
+            mark_spec['interpolate'] = 'step-after'
+        if layer.mark in ('bar', 'area'):
+            mark_spec['opacity'] = 0.7 if layer.mark == 'bar' else 0.3
+        category = {'field': 'x', 'type': chart.x_type, 'title': x_title}
+        if chart.x_type == 'nominal':
+            category['sort'] = None
+        elif x_scale:
+            category['scale'] = x_scale
+        value = {'field': 'y', 'type': 'quantitative', 'title': y_title}
+        if chart.y_domain is not None:
+            value['scale'] = {'domain': list(chart.y_domain)}
+        encoding = {'y': category, 'x': value} if chart.horizontal else {'x': category, 'y': value}
+        if layer.x2 is not None:
+            encoding['x2'] = {'field': 'x2'}
+        encoding.update(legend)
+        spec = {'data': {'values': values}, 'mark': mark_spec, 'encoding': encoding}
+        if layer.value_labels:
+            text_mark = {'type': 'text', 'fontWeight': 'bold'}
+            text_mark.update({'align': 'left', 'dx': 3} if chart.horizontal else {'baseline': 'bottom', 'dy': -3})
+            spec = {'data': spec['data'], 'layer': [
+                {'mark': mark_spec, 'encoding': encoding},
+                {'mark': text_mark, 'encoding': dict(encoding, text={'field': 'y', 'type': 'quantitative'})}
+            ]}
+        layers.append(spec)
+    return layers
+
+
+def to_vega_lite(charts: Sequence[Chart], panel_width: int = PANEL_WIDTH,
+                 panel_height: int = PANEL_HEIGHT) -> Dict[str, Any]:
+    """
+    Спецификация Vega-Lite с панелями, расположенными по горизонтали
+
+    Args:
+        charts: Панели графика
+        panel_width: Ширина панели
+        panel_height: Высота панели
+
+    Returns:
+        Спецификация (словарь, сериализуемый в JSON)
+    """
+    panels = []
+    for chart in charts:
+        panel = {'title': chart.title if len(chart.title) > 1 else chart.title[0],
+                 'width': panel_width - MARGIN_LEFT - MARGIN_RIGHT,
+                 'height': panel_height - MARGIN_BOTTOM - 20 - TITLE_LINE_HEIGHT * len(chart.title)}
+        if chart.message is not None or not chart.layers:
+            panel.update({'data': {'values': [{}]},
+                          'mark': {'type': 'text', 'size': 14},
+                          'encoding': {'text': {'value': chart.message or 'Нет данных для построения графика'}}})
+        else:
+            panel['layer'] = _vega_layers(chart)
+        panels.append(panel)
+    spec = {'$schema': VEGA_LITE_SCHEMA}
+    if len(panels) == 1:
+        spec.update(panels[0])
+    else:
+        spec['hconcat'] = panels
+    return spec
+
+
+class LightweightVisualizer:
+    """
+    Визуализатор с тем же набором методов plot_*, что и JiraVisualizer,
+    сохраняющий графики в SVG и Vega-Lite без matplotlib
+
+    Графики только сохраняются в файлы; интерактивный показ и текстовая
+    сводка в консоли остаются за JiraVisualizer.
+    """
+
+    def __init__(self, project_key: str, output_dir: Optional[str] = None,
+                 formats: Sequence[str] = ('svg',), timeline_days: int = 90,
+                 rolling_window: int = 7, timeline_period: str = 'day'):
+        """
+        Инициализация визуализатора
+
+        Args:
+            project_key: Ключ проекта
+            output_dir: Каталог для сохранения графиков
+            formats: Форматы файлов (svg, vega)
+            timeline_days: Глубина графика заведенных и закрытых задач в днях
+            rolling_window: Окно скользящего среднего в днях
+            timeline_period: Период агрегации графика (day, week, month)
+
+        Raises:
+            VisualizationError: Если каталог не задан или формат не поддерживается
+        """
+        unsupported = [file_format for file_format in formats if file_format not in LIGHT_FORMATS]
+        if unsupported:
+            raise VisualizationError(f"Облегченный бэкенд не поддерживает форматы: {unsupported} "
+                                     f"(доступны: {', '.join(LIGHT_FORMATS)})")
+        if output_dir is None:
+            raise VisualizationError("Облегченный бэкенд сохраняет графики только в файлы")
+        self.project_key = project_key
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.timeline_days = timeline_days
+        self.rolling_window = rolling_window
+        self.timeline_period = timeline_period
+        self.saved_files: List[str] = []
+
+    def _show(self, name: str, charts: Sequence[Chart]) -> None:
+        """
+        Сохранение панелей графика в файлы
+
+        Args:
+            name: Имя отчета для формирования имени файла
+            charts: Панели графика
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_name = re.sub(r'[^\w.-]+', '_', f"{self.project_key}_{name}")
+        for file_format in self.formats:
+            path = os.path.join(self.output_dir, f"{safe_name}.{LIGHT_FORMATS[file_format]}")
+            if file_format == 'svg':
+                content = to_svg(charts)
+            else:
+                content = json.dumps(to_vega_lite(charts), ensure_ascii=False)
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(content)
+            self.saved_files.append(path)
+
+    @staticmethod
+    def _histogram_layer(data: Union[Histogram, Sequence[float]], bins: int, color: str) -> Layer:
+        """Слой столбцов гистограммы"""
+        histogram = data if isinstance(data, Histogram) else compute_histogram(data, bins)
+        return Layer('bar', histogram.edges[:-1], histogram.counts, color, x2=histogram.edges[1:])
+
+    def _histogram_chart(self, name: str, data: Union[Histogram, Sequence[float]], bins: int,
+                         color: str, title: str, x_label: str, empty: str) -> None:
+        """Сохранение одиночной гистограммы"""
+        histogram = data if isinstance(data, Histogram) else compute_histogram(data, bins)
+        chart = Chart(f'{self.project_key}: {title}', x_label, 'Количество задач',
+                      log_x=histogram.log_scale,
+                      layers=[self._histogram_layer(histogram, bins, color)],
+                      message=None if histogram.total else empty)
+        self._show(name, [chart])
+
+    def plot_open_time_histogram(self, times: Union[Histogram, List[int]]) -> None:
+        """
+        Гистограмма времени в открытом состоянии
+
+        Args:
+            times: Гистограмма или список времен в днях
+        """
+        try:
+            self._histogram_chart('open_time', times, 15, '#2E86AB',
+                                  'Гистограмма времени в открытом состоянии',
+                                  'Дни в открытом состоянии', 'Нет данных для построения графика')
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении гистограммы времени: {e}")
+
+    def plot_time_distribution_by_status(self,
+                                         status_groups: Dict[str, Union[Histogram, List[int]]]) -> None:
+        """
+        Распределение времени по состояниям
+
+        Args:
+            status_groups: Словарь {статус: гистограмма или [времена в днях]}
+        """
+        try:
+            if not status_groups:
+                self._show('time_by_status', [Chart(f'{self.project_key}: Распределение времени по состояниям')])
+                return
+            colors = ['#3498db', '#27ae60', '#f39c12', '#9b59b6', '#e74c3c']
+            for i, (status, times) in enumerate(list(status_groups.items())[:5]):
+                self._histogram_chart(f'time_by_status_{status}', times, 10, colors[i],
+                                      f'Распределение времени в состоянии {status}',
+                                      f'Дни в состоянии {status}', 'Нет данных для построения графика')
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении распределения по статусам: {e}")
+
+    def plot_created_vs_closed_timeline(self, timeline: Union[Timeline, Mapping[date, int]],
+                                        issues_count: Union[int, Mapping[date, int]],
+                                        legacy_issues_count: Optional[int] = None) -> None:
+        """
+        График заведенных и закрытых задач за последние timeline_days дней
+
+        Прежняя форма вызова (created_dates, closed_dates, issues_count)
+        поддерживается, см. timeline_arguments.
+
+        Args:
+            timeline: Дневной ряд созданных и закрытых задач
+            issues_count: Общее количество задач
+            legacy_issues_count: Общее количество задач в прежней форме вызова
+        """
+        timeline, issues_count = timeline_arguments(timeline, issues_count, legacy_issues_count)
+        try:
+            end_date = date.today()
+            start_date = end_date - timedelta(days=self.timeline_days)
+            recent = timeline.last(self.timeline_days, end_date)
+            period_title = f'последние {self.timeline_days} дней'
+            num_days = recent.active_periods
+            title = f'{self.project_key}: График заведенных и закрытых задач ({period_title})'
+            if not num_days:
+                self._show('created_vs_closed', [Chart(title, message=f'Нет данных за {period_title}')])
+                return
+
+            recent = recent.resample(self.timeline_period)
+            created, closed = recent.created, recent.closed
+            if self.timeline_period == 'day' and num_days > 60:
+                created = rolling_mean(created, self.rolling_window)
+                closed = rolling_mean(closed, self.rolling_window)
+                labels = ('Создано (сглаженное)', 'Закрыто (сглаженное)')
+                y_label = f'Количество задач (скользящее среднее, {self.rolling_window} дней)'
+                marks = ('area', 'area')
+            else:
+                labels = ('Создано', 'Закрыто')
+                y_label = 'Количество задач'
+                marks = ('line', 'line')
+            period_str = f"{start_date.strftime('%d.%m.%Y')} - {end_date.strftime('%d.%m.%Y')}"
+            chart = Chart(
+                [f'{self.project_key}: График заведенных и закрытых задач',
+                 f'Период: {period_title} ({period_str})',
+                 f'Дней с данными: {num_days}, создано: {int(recent.created.sum())}, '
+                 f'закрыто: {int(recent.closed.sum())}'],
+                'Дата' if self.timeline_period == 'day' else f'Начало периода ({self.timeline_period})',
+                y_label, x_type='temporal',
+                layers=[Layer(marks[0], recent.starts, created, '#3498db', labels[0]),
+                        Layer(marks[1], recent.starts, closed, '#2ecc71', labels[1]),
+                        Layer('vrule', [(end_date - EPOCH_DATE).days], color='red', label='Сегодня')])
+            self._show('created_vs_closed', [chart])
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении временной шкалы: {e}")
+
+    def plot_top_users(self, user_stats: Dict[str, int]) -> None:
+        """
+        Топ пользователей по количеству задач
+
+        Args:
+            user_stats: Статистика по пользователям
+        """
+        try:
+            top_users = sorted(user_stats.items(), key=lambda x: x[1], reverse=True)[:30]
+            title = f'{self.project_key}: Топ пользователей по количеству задач'
+            if not top_users:
+                self._show('top_users', [Chart(title, message='Нет данных о пользователях')])
+                return
+            users, counts = zip(*top_users)
+            self._show('top_users', [Chart(title, 'Количество задач', 'Пользователи', x_type='nominal',
+                                           horizontal=True, layers=[Layer('bar', users, counts)])])
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении топа пользователей: {e}")
+
+    def plot_time_spent_histogram(self, times: Union[Histogram, List[float]]) -> None:
+        """
+        Гистограмма затраченного времени
+
+        Args:
+            times: Гистограмма или список затраченного времени в днях
+        """
+        try:
+            self._histogram_chart('time_spent', times, 15, '#A23B72',
+                                  'Гистограмма затраченного времени',
+                                  'Затраченное время (дни)', 'Нет данных о затраченном времени')
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении гистограммы затраченного времени: {e}")
+
+    def plot_priority_distribution(self, priority_stats: Dict[str, int]) -> None:
+        """
+        Распределение задач по приоритетам (доли указаны в подписях категорий)
+
+        Args:
+            priority_stats: Распределение по приоритетам
+        """
+        try:
+            if not priority_stats:
+                return
+            sorted_priorities = sorted(priority_stats.items(), key=lambda x: x[1], reverse=True)
+            total = sum(priority_stats.values())
+            labels = [f'{label} ({count / total * 100:.1f}%)' for label, count in sorted_priorities]
+            counts = [count for _, count in sorted_priorities]
+            self._show('priority', [Chart(
+                ['Количество задач по приоритетам', f'Проект: {self.project_key}'],
+                'Приоритет', 'Количество задач', x_type='nominal',
+                layers=[Layer('bar', labels, counts, 'purple', value_labels=True)])])
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении распределения по приоритетам: {e}")
+
+    def plot_backlog(self, timeline: Timeline, backlog: np.ndarray) -> None:
+        """
+        Открытый бэклог во времени
+
+        Args:
+            timeline: Дневной ряд созданных и закрытых задач
+            backlog: Количество открытых задач на конец каждого дня ряда
+        """
+        try:
+            if not len(timeline):
+                self._show('backlog', [Chart(f'{self.project_key}: Открытый бэклог во времени')])
+                return
+            self._show('backlog', [Chart(
+                [f'{self.project_key}: Открытый бэклог во времени',
+                 f'Сейчас открыто: {int(backlog[-1])}, максимум: {int(backlog.max())}'],
+                'Дата', 'Открытых задач', x_type='temporal',
+                layers=[Layer('area', timeline.starts, backlog, '#e67e22')])])
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении графика бэклога: {e}")
+
+    def plot_throughput(self, throughput: Timeline) -> None:
+        """
+        Пропускная способность: закрытые задачи по периодам
+
+        Args:
+            throughput: Ряд, агрегированный по неделям или месяцам
+        """
+        try:
+            if not throughput.closed.sum():
+                self._show('throughput', [Chart(f'{self.project_key}: Пропускная способность',
+                                                message='Нет закрытых задач')])
+                return
+            width = 6 if throughput.period == 'week' else 25
+            mean = float(throughput.closed.mean())
+            self._show('throughput', [Chart(
+                f'{self.project_key}: Пропускная способность ({throughput.period})',
+                'Начало периода', 'Закрыто задач', x_type='temporal',
+                layers=[Layer('bar', throughput.starts, throughput.closed, '#27ae60',
+                              x2=throughput.starts + width),
+                        Layer('hrule', y=[mean], color='gray', label=f'Среднее: {mean:.1f}')])])
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении пропускной способности: {e}")
+
+    def plot_lead_time_percentiles(self, percentiles: Dict[float, float], issue_count: int) -> None:
+        """
+        Перцентили времени выполнения задач
+
+        Args:
+            percentiles: Словарь {уровень квантиля: дни}
+            issue_count: Количество закрытых задач в выборке
+        """
+        try:
+            if not issue_count:
+                return
+            labels = [f'p{round(q * 100)}' for q in percentiles]
+            self._show('lead_time', [Chart(
+                f'{self.project_key}: Перцентили времени выполнения ({issue_count} задач)',
+                'Перцентиль', 'Время выполнения (дни)', x_type='nominal',
+                layers=[Layer('bar', labels, [round(value, 1) for value in percentiles.values()],
+                              '#8e44ad', value_labels=True)])])
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении перцентилей времени выполнения: {e}")
+
+    def plot_open_age(self, report: AgeReport) -> None:
+        """
+        Возраст открытых задач и кривая дожития всех задач
+
+        Args:
+            report: Отчет о возрасте задач
+        """
+        try:
+            histogram = report.open_histogram
+            age_chart = Chart([f'Возраст открытых задач ({report.open_count})', f'Проект: {self.project_key}'],
+                              'Возраст (дни)', 'Количество задач', log_x=histogram.log_scale,
+                              layers=[self._histogram_layer(histogram, 15, '#c0392b')],
+                              message=None if histogram.total else 'Нет открытых задач')
+            survival_chart = Chart(['Кривая дожития (Каплан-Мейер)', f'Проект: {self.project_key}'],
+                                   'Дни от создания', 'Доля открытых задач', y_domain=(0, 1.05),
+                                   message=None if len(report.survival_times) else 'Нет закрытых задач')
+            if len(report.survival_times):
+                survival_chart.layers.append(Layer('step', np.concatenate(([0], report.survival_times)),
+                                                   np.concatenate(([1.0], report.survival)), '#2980b9'))
+                median = report.median_lifetime
+                if np.isfinite(median):
+                    survival_chart.layers.append(Layer('vrule', [median], color='gray',
+                                                       label=f'Медиана: {median:.0f} дн.'))
+            self._show('open_age', [age_chart, survival_chart])
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении возраста открытых задач: {e}")
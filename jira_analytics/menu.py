@@ -1,26 +1,32 @@
 """Модуль меню приложения"""
+from typing import Callable, Optional
 from jira_analytics.data_processor import DataProcessor
+from jira_analytics.index import IssueFilter
 from jira_analytics.visualizer import JiraVisualizer
+from jira_analytics.reports import REPORTS, get_report
 
 
-def display_menu(project_key: str, issue_count: int) -> None:
+def display_menu(project_key: str, issue_count: int, can_refresh: bool = False,
+                 issue_filter: Optional[IssueFilter] = None) -> None:
     """
     Отображение меню выбора аналитических отчетов
 
     Args:
         project_key: Ключ проекта
         issue_count: Количество загруженных задач
+        can_refresh: Доступно быстрое обновление данных
+        issue_filter: Условия отбора задач для отчетов
     """
     print("\n" + "=" * 60)
     print(f"JIRA Analytics для проекта: {project_key}")
     print(f"Загружено задач: {issue_count}")
+    if issue_filter:
+        print(f"Отбор: {issue_filter}")
     print("=" * 60)
-    print("1. Гистограмма времени в открытом состоянии")
-    print("2. Распределение времени по состояниям")
-    print("3. График заведенных и закрытых задач")
-    print("4. Топ пользователей")
-    print("5. Гистограмма затраченного времени")
-    print("6. Распределение по приоритетам")
+    for report in REPORTS:
+        print(f"{report.choice}. {report.title}")
+    if can_refresh:
+        print("r. Обновить данные (изменения с последней синхронизации)")
     print("0. Выход")
     print("-" * 60)
 
@@ -28,16 +34,23 @@ def display_menu(project_key: str, issue_count: int) -> None:
 class MenuHandler:
     """Обработчик меню"""
 
-    def __init__(self, processor: DataProcessor, visualizer: JiraVisualizer):
+    def __init__(self, processor: DataProcessor, visualizer: JiraVisualizer,
+                 refresh: Optional[Callable[[], int]] = None,
+                 issue_filter: Optional[IssueFilter] = None):
         """
         Инициализация обработчика меню
 
         Args:
             processor: Процессор данных
             visualizer: Визуализатор
+            refresh: Функция быстрого обновления данных процессора,
+                возвращающая количество обновленных задач
+            issue_filter: Условия отбора задач для отчетов
         """
         self.processor = processor
         self.visualizer = visualizer
+        self.refresh = refresh
+        self.issue_filter = issue_filter
 
     def handle_choice(self, choice: str) -> bool:
         """
@@ -53,33 +66,15 @@ class MenuHandler:
             print("Выход из программы...")
             return False
 
-        if choice == '1':
-            times = self.processor.get_resolution_times(0, 3650)
-            self.visualizer.plot_open_time_histogram(times)
+        if choice.lower() == 'r' and self.refresh is not None:
+            updated = self.refresh()
+            print(f"Обновлено задач: {updated}, всего задач: {len(self.processor)}")
+            return True
 
-        elif choice == '2':
-            status_groups = self.processor.get_resolution_times_by_status(0, 3650)
-            self.visualizer.plot_time_distribution_by_status(status_groups)
-
-        elif choice == '3':
-            created_dates, closed_dates = self.processor.get_created_closed_counts()
-            self.visualizer.plot_created_vs_closed_timeline(
-                created_dates, closed_dates, len(self.processor.issues)
-            )
-
-        elif choice == '4':
-            user_stats = self.processor.get_user_stats()
-            self.visualizer.plot_top_users(user_stats)
-
-        elif choice == '5':
-            times = self.processor.get_time_spent_data()
-            self.visualizer.plot_time_spent_histogram(times)
-
-        elif choice == '6':
-            priority_stats = self.processor.get_priority_distribution()
-            self.visualizer.plot_priority_distribution(priority_stats)
-
-        else:
+        report = get_report(choice) if choice else None
+        if report is None:
             print("Неверный выбор. Попробуйте снова.")
+            return True
 
-        return True
\ No newline at end of file
+        report.render(self.visualizer, report.collect_data(self.processor, self.issue_filter))
+        return True
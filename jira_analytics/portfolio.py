@@ -0,0 +1,207 @@
+"""Модуль пакетного построения отчетов по портфелю проектов"""
+import html
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from jira_analytics.exceptions import JiraAnalyticsError
+from jira_analytics.index import IssueFilter
+
+# Имя страницы со сводкой по проектам
+INDEX_NAME = 'index.html'
+
+# Форматы, которые показываются на странице сводки как изображения
+IMAGE_FORMATS = ('.svg', '.png')
+
+
+def _init_worker() -> None:
+    """Выбор неинтерактивного бэкенда Agg до первого импорта pyplot в процессе"""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _project_worker(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Обработка и отрисовка одного проекта в процессе пула
+
+    Набор задач открывается из файла снимка (колонки отображаются в память),
+    поэтому в процесс передается только путь, а не сами задачи.
+
+    Args:
+        job: Параметры проекта: project_key, snapshot, output_dir, formats,
+            backend, report_names, visualizer_options, histogram_bins,
+            histogram_log_scale, issue_filter, render_cache_dir, render_cache_bytes
+
+    Returns:
+        Сводка проекта: количество задач, открытые задачи, перцентили
+        времени выполнения, файлы отчетов и время обработки (или ошибка)
+    """
+    from jira_analytics.batch import render_reports
+    from jira_analytics.data_processor import DataProcessor
+    from jira_analytics.render_cache import RenderCache
+
+    started = time.perf_counter()
+    project_key = job['project_key']
+    summary = {'project_key': project_key, 'files': [], 'error': None}
+    try:
+        processor = DataProcessor(job['snapshot'], histogram_bins=job['histogram_bins'],
+                                  histogram_log_scale=job['histogram_log_scale'])
+        issue_filter = job['issue_filter']
+        render_cache = None
+        if job['render_cache_dir']:
+            render_cache = RenderCache(os.path.join(job['render_cache_dir'], project_key),
+                                       job['render_cache_bytes'])
+        # Проекты уже распределены по процессам, отчеты проекта строятся последовательно
+        files = render_reports(processor, project_key, job['output_dir'], job['formats'],
+                               report_names=job['report_names'],
+                               visualizer_options=job['visualizer_options'],
+                               issue_filter=issue_filter, render_cache=render_cache,
+                               backend=job['backend'], in_process=True)
+        lead_times = processor.get_flow_metrics(issue_filter).lead_time_percentiles()
+        summary.update({
+            'issue_count': len(processor.select(issue_filter)),
+            'open_count': processor.get_age_report(issue_filter=issue_filter).open_count,
+            'lead_time': {f'p{round(q * 100)}': float(value) for q, value in lead_times.items()},
+            'files': files,
+            'cached': render_cache.hits if render_cache is not None else 0
+        })
+    except JiraAnalyticsError as e:
+        summary['error'] = str(e)
+    summary['seconds'] = time.perf_counter() - started
+    return summary
+
+
+def render_portfolio(snapshots: Dict[str, str], output_dir: str,
+                     formats: Sequence[str] = ('png',), max_workers: Optional[int] = None,
+                     report_names: Optional[Sequence[str]] = None,
+                     visualizer_options: Optional[Dict[str, Any]] = None,
+                     issue_filter: Optional[IssueFilter] = None,
+                     backend: str = 'matplotlib', histogram_bins: Any = 15,
+                     histogram_log_scale: bool = False,
+                     render_cache_dir: Optional[str] = None,
+                     render_cache_bytes: int = 0,
+                     title: str = 'JIRA Analytics') -> List[Dict[str, Any]]:
+    """
+    Построение отчетов по нескольким проектам с распределением проектов по процессам
+
+    Каждый процесс пула целиком обрабатывает свой проект: открывает снимок,
+    считает агрегаты и строит графики в подкаталог проекта. Крупные проекты
+    запускаются первыми, чтобы процессы завершали работу примерно одновременно.
+    По результатам пишется страница index.html со сводкой и ссылками.
+
+    Args:
+        snapshots: Словарь {ключ проекта: путь к файлу снимка}
+        output_dir: Каталог для подкаталогов проектов и сводки
+        formats: Форматы файлов
+        max_workers: Количество процессов (по умолчанию - число ядер)
+        report_names: Имена отчетов (по умолчанию - все)
+        visualizer_options: Параметры визуализатора
+        issue_filter: Условия отбора задач
+        backend: Бэкенд визуализации (matplotlib или light)
+        histogram_bins: Количество интервалов или границы гистограмм
+        histogram_log_scale: Логарифмические интервалы гистограмм
+        render_cache_dir: Каталог кэша графиков (у каждого проекта свой подкаталог)
+        render_cache_bytes: Ограничение кэша графиков одного проекта
+        title: Заголовок страницы сводки
+
+    Returns:
+        Сводки проектов в порядке snapshots
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [{
+        'project_key': project_key,
+        'snapshot': path,
+        'output_dir': os.path.join(output_dir, project_key),
+        'formats': tuple(formats),
+        'backend': backend,
+        'report_names': report_names,
+        'visualizer_options': visualizer_options or {},
+        'histogram_bins': histogram_bins,
+        'histogram_log_scale': histogram_log_scale,
+        'issue_filter': issue_filter,
+        'render_cache_dir': render_cache_dir,
+        'render_cache_bytes': render_cache_bytes
+    } for project_key, path in snapshots.items()]
+
+    # Самые крупные наборы задач - первыми (размер снимка пропорционален числу задач)
+    order = sorted(jobs, key=lambda job: os.path.getsize(job['snapshot'])
+                   if os.path.exists(job['snapshot']) else 0, reverse=True)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+        futures = {job['project_key']: executor.submit(_project_worker, job) for job in order}
+        summaries = [futures[job['project_key']].result() for job in jobs]
+
+    write_portfolio_index(summaries, output_dir, title)
+    return summaries
+
+
+def _format_days(value: Optional[float]) -> str:
+    """Подпись количества дней для таблицы сводки"""
+    return '-' if value is None or not np.isfinite(value) else f'{value:.1f}'
+
+
+def write_portfolio_index(summaries: List[Dict[str, Any]], output_dir: str,
+                          title: str = 'JIRA Analytics') -> str:
+    """
+    Страница сводки по проектам со ссылками на отчеты
+
+    Args:
+        summaries: Сводки проектов (результаты render_portfolio)
+        output_dir: Каталог портфеля
+        title: Заголовок страницы
+
+    Returns:
+        Путь к странице
+    """
+    rows, sections = [], []
+    for summary in summaries:
+        key = html.escape(summary['project_key'])
+        if summary['error']:
+            rows.append(f'<tr><td>{key}</td><td colspan="5" class="error">'
+                        f'{html.escape(summary["error"])}</td></tr>')
+            continue
+        lead_time = summary['lead_time']
+        rows.append(f'<tr><td><a href="#{key}">{key}</a></td><td>{summary["issue_count"]}</td>'
+                    f'<td>{summary["open_count"]}</td><td>{_format_days(lead_time.get("p50"))}</td>'
+                    f'<td>{_format_days(lead_time.get("p85"))}</td><td>{len(summary["files"])}</td></tr>')
+        links = []
+        for path in summary['files']:
+            relative = html.escape(os.path.relpath(path, output_dir).replace(os.sep, '/'))
+            name = html.escape(os.path.basename(path))
+            if path.endswith(IMAGE_FORMATS):
+                links.append(f'<a href="{relative}"><img src="{relative}" alt="{name}" loading="lazy"></a>')
+            else:
+                links.append(f'<a href="{relative}">{name}</a>')
+        sections.append(f'<h2 id="{key}">{key}</h2>\n<div class="reports">{"".join(links)}</div>')
+
+    page = f"""<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; }}
+th, td {{ border: 1px solid #ccc; padding: 4px 10px; text-align: right; }}
+td:first-child, th:first-child {{ text-align: left; }}
+.error {{ color: #c0392b; text-align: left; }}
+.reports img {{ width: 320px; margin: 4px; border: 1px solid #eee; }}
+.reports a {{ margin-right: 8px; }}
+</style>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+<p>Проектов: {len(summaries)}, сформировано {time.strftime('%Y-%m-%d %H:%M')}</p>
+<table>
+<tr><th>Проект</th><th>Задач</th><th>Открыто</th><th>Время выполнения p50, дн.</th>
+<th>p85, дн.</th><th>Файлов</th></tr>
+{chr(10).join(rows)}
+</table>
+{chr(10).join(sections)}
+</body>
+</html>
+"""
+    path = os.path.join(output_dir, INDEX_NAME)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(page)
+    return path
@@ -0,0 +1,257 @@
+"""Модуль дискового кэша построенных графиков"""
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+from collections import OrderedDict
+from datetime import date
+from importlib import metadata
+from typing import Any, Dict, List, Optional, Sequence
+from jira_analytics.data_processor import DataProcessor
+from jira_analytics.exceptions import VisualizationError
+from jira_analytics.index import IssueFilter
+from jira_analytics.reports import Report
+
+# Версия формата ключа и записей кэша
+RENDER_CACHE_VERSION = 1
+
+# Ограничение размера кэша по умолчанию
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Список файлов записи в порядке построения
+MANIFEST_NAME = 'files.json'
+
+# Имя каталога записи (render_key) или ее недописанной временной копии;
+# остальные каталоги в корне кэша не принадлежат ему и не трогаются
+_ENTRY_NAME = re.compile(r'^[0-9a-f]{64}(\.tmp-\d+)?$')
+
+
+@functools.lru_cache(maxsize=None)
+def _renderer_version() -> str:
+    """Версия matplotlib (без импорта самого пакета)"""
+    try:
+        return metadata.version('matplotlib')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def render_key(processor: DataProcessor, report: Report, project_key: str,
+               formats: Sequence[str], visualizer_options: Optional[Dict[str, Any]] = None,
+               issue_filter: Optional[IssueFilter] = None, backend: str = 'matplotlib') -> str:
+    """
+    Ключ графика отчета в кэше
+
+    Ключ не требует расчета данных отчета: он строится по отпечатку набора
+    задач, параметрам процессора и визуализатора, стилю и версии matplotlib.
+    Для отчетов, зависящих от текущей даты, в ключ входит сегодняшняя дата.
+
+    Args:
+        processor: Процессор данных
+        report: Описание отчета
+        project_key: Ключ проекта (входит в заголовки и имена файлов)
+        formats: Форматы файлов
+        visualizer_options: Параметры визуализатора
+        issue_filter: Условия отбора задач
+        backend: Бэкенд визуализации
+
+    Returns:
+        Шестнадцатеричный хеш параметров построения
+    """
+    from jira_analytics.visualizer import PLOT_STYLE
+
+    parts = {
+        'cache_version': RENDER_CACHE_VERSION,
+        'dataset': processor.get_fingerprint(),
+        'report': report.name,
+        'project_key': project_key,
+        'formats': list(formats),
+        'options': visualizer_options or {},
+        'histogram_bins': processor.histogram_bins,
+        'histogram_log_scale': processor.histogram_log_scale,
+        'filter': repr(issue_filter) if issue_filter else None,
+        'backend': backend,
+        'style': PLOT_STYLE if backend == 'matplotlib' else None,
+        'matplotlib': _renderer_version() if backend == 'matplotlib' else None,
+        'day': date.today().isoformat() if report.daily else None
+    }
+    encoded = json.dumps(parts, sort_keys=True, default=repr).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class RenderCache:
+    """
+    Дисковый кэш файлов графиков с вытеснением давно не использованных записей
+
+    Запись - каталог с файлами одного отчета (отчет может состоять из
+    нескольких графиков и форматов). Время последнего обращения хранится
+    во времени изменения каталога, поэтому порядок вытеснения сохраняется
+    между запусками. Кэш рассчитан на одного пишущего.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Открытие кэша
+
+        Args:
+            path: Каталог кэша
+            max_bytes: Максимальный суммарный размер файлов
+
+        Raises:
+            VisualizationError: Если каталог кэша не удается создать
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError as e:
+            raise VisualizationError(f"Не удалось создать каталог кэша графиков {path}: {e}")
+        self._entries: 'OrderedDict[str, int]' = OrderedDict()
+        self._load_entries()
+
+    def _load_entries(self) -> None:
+        """Чтение записей с диска в порядке последнего обращения"""
+        entries = []
+        for name in os.listdir(self.path):
+            if not _ENTRY_NAME.match(name):
+                continue
+            entry_path = os.path.join(self.path, name)
+            if '.tmp-' in name or not os.path.isfile(os.path.join(entry_path, MANIFEST_NAME)):
+                # Недописанные записи прерванного запуска
+                shutil.rmtree(entry_path, ignore_errors=True)
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(entry_path))
+            entries.append((os.stat(entry_path).st_mtime, name, size))
+        for _, name, size in sorted(entries):
+            self._entries[name] = size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @property
+    def size(self) -> int:
+        """Суммарный размер файлов в байтах"""
+        return sum(self._entries.values())
+
+    def get(self, key: str) -> Optional[Dict[str, bytes]]:
+        """
+        Файлы записи кэша
+
+        Args:
+            key: Ключ записи (render_key)
+
+        Returns:
+            Словарь {имя файла: содержимое} в порядке построения или None
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        entry_path = os.path.join(self.path, key)
+        try:
+            with open(os.path.join(entry_path, MANIFEST_NAME), 'r', encoding='utf-8') as file:
+                names = json.load(file)
+            files = {}
+            for name in names:
+                with open(os.path.join(entry_path, name), 'rb') as file:
+                    files[name] = file.read()
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            # Запись повреждена или удалена извне - считаем промахом
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return files
+
+    def put(self, key: str, files: Dict[str, bytes]) -> None:
+        """
+        Сохранение файлов отчета с вытеснением старых записей
+
+        Записи больше ограничения размера кэша не сохраняются.
+
+        Args:
+            key: Ключ записи (render_key)
+            files: Словарь {имя файла: содержимое} в порядке построения
+        """
+        size = sum(len(content) for content in files.values())
+        if size > self.max_bytes:
+            return
+        self._remove(key)
+        entry_path = os.path.join(self.path, key)
+        temp_path = f'{entry_path}.tmp-{os.getpid()}'
+        try:
+            os.makedirs(temp_path, exist_ok=True)
+            for name, content in files.items():
+                with open(os.path.join(temp_path, os.path.basename(name)), 'wb') as file:
+                    file.write(content)
+            # Манифест пишется последним: запись без него считается недописанной
+            with open(os.path.join(temp_path, MANIFEST_NAME), 'w', encoding='utf-8') as file:
+                json.dump([os.path.basename(name) for name in files], file)
+            os.rename(temp_path, entry_path)
+        except OSError as e:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            raise VisualizationError(f"Ошибка записи кэша графиков {self.path}: {e}")
+        self._entries[key] = size
+        self._evict()
+
+    def store_files(self, key: str, paths: List[str]) -> None:
+        """
+        Сохранение построенных файлов отчета
+
+        Args:
+            key: Ключ записи (render_key)
+            paths: Пути файлов в порядке построения
+        """
+        files = {}
+        for path in paths:
+            with open(path, 'rb') as file:
+                files[os.path.basename(path)] = file.read()
+        self.put(key, files)
+
+    def restore_files(self, key: str, output_dir: str) -> Optional[List[str]]:
+        """
+        Запись файлов отчета из кэша в каталог
+
+        Args:
+            key: Ключ записи (render_key)
+            output_dir: Каталог для файлов
+
+        Returns:
+            Пути записанных файлов или None, если записи нет в кэше
+        """
+        files = self.get(key)
+        if files is None:
+            return None
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for name, content in files.items():
+            path = os.path.join(output_dir, name)
+            with open(path, 'wb') as file:
+                file.write(content)
+            paths.append(path)
+        return paths
+
+    def _remove(self, key: str) -> None:
+        """Удаление записи"""
+        self._entries.pop(key, None)
+        shutil.rmtree(os.path.join(self.path, key), ignore_errors=True)
+
+    def _evict(self) -> None:
+        """Вытеснение давно не использованных записей до ограничения размера"""
+        total = self.size
+        while total > self.max_bytes and self._entries:
+            key, size = next(iter(self._entries.items()))
+            self._remove(key)
+            total -= size
+
+    def clear(self) -> None:
+        """Удаление всех записей"""
+        for key in list(self._entries):
+            self._remove(key)
@@ -0,0 +1,171 @@
+"""Модуль реестра аналитических отчетов"""
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from jira_analytics.data_processor import DataProcessor
+from jira_analytics.exceptions import ConfigError
+from jira_analytics.index import IssueFilter
+from jira_analytics.jira_client import SEARCH_FIELDS
+
+# Поля, нужные всем отчетам: по updated ведется инкрементальная синхронизация
+BASE_FIELDS = ('updated',)
+# Поля дат создания и разрешения
+DATE_FIELDS = ('created', 'resolutiondate')
+
+
+class Report:
+    """Описание отчета: пункт меню, сбор данных и метод визуализатора"""
+
+    def __init__(self, choice: str, name: str, title: str, plot_method: str,
+                 collect: Callable[[Any], Tuple[Any, ...]], source: str = 'bundle',
+                 fields: Tuple[str, ...] = DATE_FIELDS, daily: bool = False):
+        """
+        Инициализация описания отчета
+
+        Args:
+            choice: Пункт меню
+            name: Машинное имя отчета (используется в именах файлов)
+            title: Название отчета для меню
+            plot_method: Имя метода JiraVisualizer
+            collect: Функция выбора аргументов метода визуализатора
+                из источника данных (для источника processor - из процессора
+                и условий отбора)
+            source: Источник данных: bundle - набор агрегатов (ReportBundle),
+                flow - метрики потока (FlowMetrics), processor - сам процессор
+            fields: Поля задач JIRA, необходимые отчету
+            daily: Отчет зависит от текущей даты (строится относительно
+                сегодняшнего дня), поэтому его график кэшируется в пределах дня
+        """
+        self.choice = choice
+        self.name = name
+        self.title = title
+        self.plot_method = plot_method
+        self.collect = collect
+        self.source = source
+        self.fields = fields
+        self.daily = daily
+
+    def collect_data(self, processor: DataProcessor,
+                     issue_filter: Optional[IssueFilter] = None) -> Tuple[Any, ...]:
+        """
+        Получить данные отчета из общего набора агрегатов или метрик потока
+
+        Args:
+            processor: Процессор данных
+            issue_filter: Условия отбора задач
+
+        Returns:
+            Аргументы метода визуализатора
+        """
+        if self.source == 'flow':
+            return self.collect(processor.get_flow_metrics(issue_filter))
+        if self.source == 'processor':
+            return self.collect(processor, issue_filter)
+        return self.collect(processor.get_report_bundle(issue_filter=issue_filter))
+
+    def render(self, visualizer: Any, data: Tuple[Any, ...]) -> None:
+        """
+        Построить отчет по подготовленным данным
+
+        Args:
+            visualizer: Визуализатор
+            data: Аргументы метода визуализатора
+        """
+        getattr(visualizer, self.plot_method)(*data)
+
+
+REPORTS: List[Report] = [
+    Report('1', 'open_time', 'Гистограмма времени в открытом состоянии',
+           'plot_open_time_histogram',
+           lambda bundle: (bundle.resolution_histogram,)),
+    Report('2', 'time_by_status', 'Распределение времени по состояниям',
+           'plot_time_distribution_by_status',
+           lambda bundle: (bundle.status_histograms,),
+           fields=DATE_FIELDS + ('status',)),
+    Report('3', 'created_vs_closed', 'График заведенных и закрытых задач',
+           'plot_created_vs_closed_timeline',
+           lambda bundle: (bundle.timeline, bundle.issue_count), daily=True),
+    Report('4', 'top_users', 'Топ пользователей',
+           'plot_top_users',
+           lambda bundle: (bundle.user_stats,),
+           fields=('assignee', 'reporter')),
+    Report('5', 'time_spent', 'Гистограмма затраченного времени',
+           'plot_time_spent_histogram',
+           lambda bundle: (bundle.time_spent_histogram,),
+           fields=DATE_FIELDS + ('timespent',)),
+    Report('6', 'priority', 'Распределение по приоритетам',
+           'plot_priority_distribution',
+           lambda bundle: (bundle.priority_distribution,),
+           fields=('priority',)),
+    Report('7', 'backlog', 'Открытый бэклог во времени',
+           'plot_backlog',
+           lambda flow: (flow.timeline(), flow.backlog()), source='flow'),
+    Report('8', 'throughput', 'Пропускная способность по неделям',
+           'plot_throughput',
+           lambda flow: (flow.throughput('week'),), source='flow'),
+    Report('9', 'lead_time', 'Перцентили времени выполнения',
+           'plot_lead_time_percentiles',
+           lambda flow: (flow.lead_time_percentiles(), flow.lead_times.count), source='flow'),
+    Report('10', 'open_age', 'Возраст открытых задач и кривая дожития',
+           'plot_open_age',
+           lambda processor, issue_filter: (processor.get_age_report(issue_filter=issue_filter),),
+           source='processor', daily=True),
+]
+
+
+def get_report(key: str) -> Optional[Report]:
+    """
+    Поиск отчета по пункту меню или имени
+
+    Args:
+        key: Пункт меню или машинное имя отчета
+
+    Returns:
+        Описание отчета или None
+    """
+    for report in REPORTS:
+        if key in (report.choice, report.name):
+            return report
+    return None
+
+
+def select_reports(keys: Optional[Iterable[str]] = None) -> List[Report]:
+    """
+    Выбор отчетов по пунктам меню или именам
+
+    Args:
+        keys: Пункты меню или машинные имена (None - все отчеты)
+
+    Returns:
+        Описания отчетов в порядке реестра
+
+    Raises:
+        ConfigError: Если отчет не найден
+    """
+    if keys is None:
+        return list(REPORTS)
+    selected = set()
+    for key in keys:
+        report = get_report(key)
+        if report is None:
+            raise ConfigError(f"Неизвестный отчет: {key}")
+        selected.add(report.name)
+    return [report for report in REPORTS if report.name in selected]
+
+
+def required_fields(keys: Optional[Iterable[str]] = None,
+                    issue_filter: Optional[IssueFilter] = None) -> List[str]:
+    """
+    Объединение полей JIRA, необходимых выбранным отчетам и условиям отбора
+
+    Args:
+        keys: Пункты меню или машинные имена отчетов (None - все отчеты)
+        issue_filter: Условия отбора задач для отчетов
+
+    Returns:
+        Имена полей в порядке SEARCH_FIELDS
+    """
+    needed = set(BASE_FIELDS)
+    if issue_filter is not None:
+        needed.update(issue_filter.fields)
+    for report in select_reports(keys):
+        needed.update(report.fields)
+    return [name for name in SEARCH_FIELDS if name in needed]
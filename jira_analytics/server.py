@@ -0,0 +1,471 @@
+"""Модуль HTTP API с готовыми данными аналитических отчетов"""
+import hashlib
+import inspect
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+from jira_analytics.data_processor import DataProcessor
+from jira_analytics.exceptions import DataProcessingError, JiraApiError
+from jira_analytics.histograms import Histogram
+from jira_analytics.constants import FILTER_KEYS
+from jira_analytics.index import IssueFilter
+from jira_analytics.render_cache import RenderCache, render_key
+from jira_analytics.reports import REPORTS, Report, get_report
+from jira_analytics.survival import AgeReport
+from jira_analytics.timeline import Timeline
+
+# Адрес сервера по умолчанию (только локальные подключения)
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+
+# Форматы ответа отчета
+RESPONSE_FORMATS = {'json': 'application/json; charset=utf-8', 'png': 'image/png',
+                    'svg': 'image/svg+xml', 'vega': 'application/json; charset=utf-8'}
+
+# Графические форматы -> бэкенд визуализации (SVG и Vega-Lite строятся без matplotlib)
+FORMAT_BACKENDS = {'png': 'matplotlib', 'svg': 'light', 'vega': 'light'}
+
+# Наибольшее число ответов в кэше (давно не запрошенные вытесняются)
+MAX_RESPONSES = 256
+
+
+def to_json_value(value: Any) -> Any:
+    """
+    Преобразование данных отчета в значения, представимые в JSON
+
+    Args:
+        value: Данные отчета (массивы NumPy, гистограммы, временные ряды и т.д.)
+
+    Returns:
+        Значение из словарей, списков, строк и чисел (NaN заменяется на None)
+    """
+    if isinstance(value, Histogram):
+        return {'counts': value.counts.tolist(), 'edges': to_json_value(value.edges),
+                'log_scale': value.log_scale}
+    if isinstance(value, Timeline):
+        return {'period': value.period, 'dates': [day.isoformat() for day in value.dates],
+                'created': value.created.tolist(), 'closed': value.closed.tolist()}
+    if isinstance(value, AgeReport):
+        return to_json_value({
+            'open_count': value.open_count, 'closed_count': value.closed_count,
+            'median_lifetime': value.median_lifetime, 'age_percentiles': value.age_percentiles,
+            'open_histogram': value.open_histogram,
+            'survival': {'days': value.survival_times, 'share_open': value.survival}
+        })
+    if isinstance(value, dict):
+        return {str(key): to_json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return to_json_value(value.tolist())
+    if isinstance(value, np.generic):
+        return to_json_value(value.item())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def parse_filter(query: Dict[str, List[str]]) -> IssueFilter:
+    """
+    Условия отбора из параметров запроса
+
+    Параметры created_from и created_to - даты ISO, остальные условия
+    можно повторять (?priority=Major&priority=Critical).
+
+    Args:
+        query: Параметры запроса (результат parse_qs)
+
+    Returns:
+        Условия отбора
+
+    Raises:
+        DataProcessingError: При неизвестном параметре или некорректной дате
+    """
+    unknown = set(query) - set(FILTER_KEYS)
+    if unknown:
+        raise DataProcessingError(f"Неизвестные параметры отбора: {', '.join(sorted(unknown))}")
+    conditions = {key: values if key not in ('created_from', 'created_to') else values[-1]
+                  for key, values in query.items()}
+    return IssueFilter(**conditions)
+
+
+class AnalyticsService:
+    """
+    Данные отчетов для HTTP API
+
+    Ответы кэшируются по версии набора задач, отчету и условиям отбора
+    (для отчетов, зависящих от текущей даты, - еще и по дню); версия набора
+    задач определяет ETag, момент ее смены - Last-Modified. Кэш хранит
+    не более MAX_RESPONSES последних запрошенных ответов.
+    Расчеты и отрисовка выполняются под общей блокировкой.
+    """
+
+    def __init__(self, processor: DataProcessor, project_key: str,
+                 visualizer_options: Optional[Dict[str, Any]] = None,
+                 refresh: Optional[Callable[[], int]] = None,
+                 render_cache: Optional[RenderCache] = None):
+        """
+        Инициализация сервиса
+
+        Args:
+            processor: Процессор данных
+            project_key: Ключ проекта
+            visualizer_options: Параметры визуализаторов графиков
+            refresh: Функция быстрого обновления данных процессора
+            render_cache: Дисковый кэш графиков (сохраняется между запусками)
+        """
+        self.processor = processor
+        self.project_key = project_key
+        self.visualizer_options = visualizer_options or {}
+        self.refresh_data = refresh
+        self.render_cache = render_cache
+        self.lock = threading.Lock()
+        # Отличает ETag разных запусков сервера при одинаковой версии данных
+        self.instance = f'{time.time_ns():x}'
+        self.version = processor.version
+        self.modified = time.time()
+        self._responses: 'OrderedDict[Tuple[str, str, IssueFilter, Optional[str]], bytes]' = OrderedDict()
+
+    def _sync_version(self) -> None:
+        """Сброс кэша ответов после изменения набора задач"""
+        if self.processor.version != self.version:
+            self.version = self.processor.version
+            self.modified = time.time()
+            self._responses.clear()
+
+    def _etag(self, key: str, day: Optional[str]) -> str:
+        """
+        ETag ответа для текущей версии набора задач (вызывается под блокировкой)
+
+        Args:
+            key: Путь и параметры запроса
+            day: Дата ISO для ответов, зависящих от текущей даты (ETag меняется каждый день)
+
+        Returns:
+            Значение заголовка ETag
+        """
+        if day is not None:
+            key = f'{key}@{day}'
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+        return f'"{self.instance}-{self.version}-{digest}"'
+
+    def _last_modified(self, day: Optional[str]) -> float:
+        """
+        Момент последнего изменения ответа (вызывается под блокировкой)
+
+        Args:
+            day: Дата ISO для ответов, зависящих от текущей даты (изменяются не реже раза в день)
+
+        Returns:
+            Секунды эпохи
+        """
+        if day is None:
+            return self.modified
+        midnight = time.mktime(date.fromisoformat(day).timetuple())
+        return max(self.modified, midnight)
+
+    def status(self) -> bytes:
+        """Состояние набора задач в JSON"""
+        with self.lock:
+            self._sync_version()
+            return json.dumps({
+                'project_key': self.project_key,
+                'issue_count': len(self.processor),
+                'version': self.version,
+                'modified': formatdate(self.modified, usegmt=True),
+                'can_refresh': self.refresh_data is not None
+            }, ensure_ascii=False).encode('utf-8')
+
+    def report_list(self) -> bytes:
+        """Список отчетов в JSON"""
+        return json.dumps([
+            {'choice': report.choice, 'name': report.name, 'title': report.title,
+             'formats': list(RESPONSE_FORMATS)}
+            for report in REPORTS
+        ], ensure_ascii=False).encode('utf-8')
+
+    def report(self, report: Report, response_format: str, issue_filter: IssueFilter) -> bytes:
+        """
+        Тело ответа отчета (из кэша или с расчетом)
+
+        Args:
+            report: Описание отчета
+            response_format: json, png, svg или vega
+            issue_filter: Условия отбора задач
+
+        Returns:
+            Содержимое ответа
+        """
+        with self.lock:
+            self._sync_version()
+            return self._report(report, response_format, issue_filter,
+                                date.today().isoformat() if report.daily else None)
+
+    def report_response(self, key: str, report: Report, response_format: str, issue_filter: IssueFilter,
+                        not_modified: Callable[[str, float], bool]) -> Tuple[str, float, Optional[bytes]]:
+        """
+        ETag, Last-Modified и тело ответа отчета для одной версии набора задач
+
+        Версия, ETag и тело определяются под одной блокировкой, поэтому ETag
+        всегда соответствует версии, по которой построено тело. При актуальной
+        копии у клиента отчет не рассчитывается и не отрисовывается.
+
+        Args:
+            key: Путь и параметры запроса
+            report: Описание отчета
+            response_format: json, png, svg или vega
+            issue_filter: Условия отбора задач
+            not_modified: Проверка условного запроса по ETag и моменту изменения
+
+        Returns:
+            ETag, момент последнего изменения (секунды эпохи) и тело ответа
+            (None, если копия клиента актуальна)
+        """
+        with self.lock:
+            self._sync_version()
+            day = date.today().isoformat() if report.daily else None
+            etag = self._etag(key, day)
+            modified = self._last_modified(day)
+            if not_modified(etag, modified):
+                return etag, modified, None
+            return etag, modified, self._report(report, response_format, issue_filter, day)
+
+    def _report(self, report: Report, response_format: str, issue_filter: IssueFilter,
+                day: Optional[str]) -> bytes:
+        """Тело ответа отчета из кэша или с расчетом (вызывается под блокировкой)"""
+        key = (report.name, response_format, issue_filter, day)
+        body = self._responses.get(key)
+        if body is not None:
+            self._responses.move_to_end(key)
+            return body
+        if response_format in FORMAT_BACKENDS:
+            body = self._render(report, response_format, issue_filter)
+        else:
+            body = self._report_json(report, report.collect_data(self.processor, issue_filter),
+                                     issue_filter)
+        self._responses[key] = body
+        if len(self._responses) > MAX_RESPONSES:
+            self._responses.popitem(last=False)
+        return body
+
+    def _report_json(self, report: Report, data: Tuple[Any, ...], issue_filter: IssueFilter) -> bytes:
+        """Данные отчета с именами аргументов метода визуализатора"""
+        from jira_analytics.visualizer import JiraVisualizer
+        parameters = list(inspect.signature(getattr(JiraVisualizer, report.plot_method)).parameters)[1:]
+        return json.dumps({
+            'report': report.name,
+            'title': report.title,
+            'version': self.version,
+            'filter': repr(issue_filter) if issue_filter else None,
+            'data': {name: to_json_value(value) for name, value in zip(parameters, data)}
+        }, ensure_ascii=False).encode('utf-8')
+
+    def _render(self, report: Report, response_format: str, issue_filter: IssueFilter) -> bytes:
+        """Построение графика отчета (первого графика отчета) с учетом дискового кэша"""
+        from jira_analytics.visualizer import create_visualizer
+        backend = FORMAT_BACKENDS[response_format]
+        cache_key = None
+        if self.render_cache is not None:
+            cache_key = render_key(self.processor, report, self.project_key, (response_format,),
+                                   self.visualizer_options, issue_filter, backend)
+            files = self.render_cache.get(cache_key)
+            if files:
+                return next(iter(files.values()))
+        with tempfile.TemporaryDirectory() as output_dir:
+            visualizer = create_visualizer(self.project_key, backend, output_dir=output_dir,
+                                           formats=(response_format,), **self.visualizer_options)
+            report.render(visualizer, report.collect_data(self.processor, issue_filter))
+            if not visualizer.saved_files:
+                raise DataProcessingError(f"Нет данных для графика отчета {report.name}")
+            if cache_key is not None:
+                self.render_cache.store_files(cache_key, visualizer.saved_files)
+            with open(visualizer.saved_files[0], 'rb') as file:
+                return file.read()
+
+    def warm(self) -> None:
+        """Предварительный расчет JSON всех отчетов без отбора"""
+        for report in REPORTS:
+            self.report(report, 'json', IssueFilter())
+
+    def refresh(self) -> int:
+        """
+        Быстрое обновление набора задач
+
+        Returns:
+            Количество обновленных задач
+        """
+        with self.lock:
+            updated = self.refresh_data()
+            self._sync_version()
+            return updated
+
+
+class AnalyticsRequestHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик запросов API
+
+    GET /api/status, GET /api/reports, GET /api/reports/<имя>[.json|.png|.svg|.vega]
+    (параметры запроса - условия отбора), POST /api/refresh.
+    """
+
+    service: AnalyticsService = None
+    quiet = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status: int, body: bytes = b'', content_type: str = RESPONSE_FORMATS['json'],
+              headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body:
+            self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str) -> None:
+        self._send(status, json.dumps({'error': message}, ensure_ascii=False).encode('utf-8'))
+
+    def _not_modified(self, etag: str, modified: float) -> bool:
+        """Проверка условного запроса по ETag, а при его отсутствии - по дате"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match == '*'
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return int(modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send_report(self, report: Report, response_format: str, issue_filter: IssueFilter) -> None:
+        """
+        Ответ отчета с ETag и Last-Modified версии набора задач, по которой построено тело
+
+        Тело строится только при промахе условного запроса: на 304
+        отчет не рассчитывается и не отрисовывается.
+        """
+        etag, modified, body = self.service.report_response(self.path, report, response_format,
+                                                            issue_filter, self._not_modified)
+        headers = {'ETag': etag, 'Last-Modified': formatdate(modified, usegmt=True),
+                   'Cache-Control': 'no-cache'}
+        if body is None:
+            self._send(304, headers=headers)
+        else:
+            self._send(200, body, RESPONSE_FORMATS[response_format], headers)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        try:
+            if parts == ['api', 'status']:
+                self._send(200, self.service.status())
+            elif parts == ['api', 'reports']:
+                self._send(200, self.service.report_list())
+            elif len(parts) == 3 and parts[:2] == ['api', 'reports']:
+                name, _, response_format = parts[2].partition('.')
+                response_format = response_format or 'json'
+                report = get_report(name)
+                if report is None or response_format not in RESPONSE_FORMATS:
+                    self._send_error(404, f"Отчет не найден: {parts[2]}")
+                    return
+                issue_filter = parse_filter(parse_qs(url.query))
+                self._send_report(report, response_format, issue_filter)
+            else:
+                self._send_error(404, f"Неизвестный путь: {url.path}")
+        except DataProcessingError as e:
+            self._send_error(400, str(e))
+        except Exception as e:
+            self._send_error(500, f"Ошибка построения отчета: {e}")
+
+    do_HEAD = do_GET
+
+    def do_POST(self) -> None:
+        if urlparse(self.path).path.rstrip('/') != '/api/refresh':
+            self._send_error(404, f"Неизвестный путь: {self.path}")
+            return
+        if self.service.refresh_data is None:
+            self._send_error(405, "Обновление данных недоступно")
+            return
+        try:
+            updated = self.service.refresh()
+        except JiraApiError as e:
+            self._send_error(502, f"Ошибка обновления данных: {e}")
+            return
+        except DataProcessingError as e:
+            self._send_error(500, f"Ошибка обработки данных: {e}")
+            return
+        except Exception as e:
+            self._send_error(500, f"Ошибка обновления данных: {e}")
+            return
+        self._send(200, json.dumps({'updated': updated, 'version': self.service.version,
+                                    'issue_count': len(self.service.processor)}).encode('utf-8'))
+
+
+def create_server(service: AnalyticsService, host: str = DEFAULT_HOST,
+                  port: int = DEFAULT_PORT, quiet: bool = True) -> ThreadingHTTPServer:
+    """
+    Создание HTTP-сервера API
+
+    Args:
+        service: Сервис данных отчетов
+        host: Адрес
+        port: Порт (0 - любой свободный)
+        quiet: Не выводить журнал запросов
+
+    Returns:
+        Сервер (запускается вызовом serve_forever)
+    """
+    # PNG отрисовываются в потоках сервера без интерактивного бэкенда
+    import matplotlib
+    matplotlib.use('Agg')
+    handler = type('BoundAnalyticsRequestHandler', (AnalyticsRequestHandler,),
+                   {'service': service, 'quiet': quiet})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(processor: DataProcessor, project_key: str, host: str = DEFAULT_HOST,
+          port: int = DEFAULT_PORT, visualizer_options: Optional[Dict[str, Any]] = None,
+          refresh: Optional[Callable[[], int]] = None,
+          render_cache: Optional[RenderCache] = None) -> None:
+    """
+    Запуск сервера API до прерывания
+
+    Args:
+        processor: Процессор данных
+        project_key: Ключ проекта
+        host: Адрес
+        port: Порт
+        visualizer_options: Параметры визуализаторов графиков
+        refresh: Функция быстрого обновления данных
+        render_cache: Дисковый кэш графиков
+    """
+    service = AnalyticsService(processor, project_key, visualizer_options, refresh, render_cache)
+    print("Предварительный расчет отчетов...")
+    service.warm()
+    server = create_server(service, host, port, quiet=False)
+    print(f"API отчетов: http://{host}:{server.server_address[1]}/api/reports "
+          f"(PID {os.getpid()}, Ctrl+C для остановки)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nСервер остановлен")
+    finally:
+        server.server_close()
@@ -0,0 +1,210 @@
+"""Модуль снимков набора задач для анализа без доступа к JIRA"""
+import hashlib
+import io
+import json
+import os
+import struct
+import zipfile
+from typing import Any, Dict, Union
+import numpy as np
+from jira_analytics.exceptions import DataProcessingError
+from jira_analytics.issue_table import IssueTable
+from jira_analytics.transitions import TransitionLog
+
+# Версия формата снимка
+SNAPSHOT_VERSION = 1
+
+# Служебный элемент архива со словарями строк и параметрами снимка
+META_NAME = 'meta.json'
+
+# Выравнивание данных несжатых колонок в файле (для отображения в память)
+DATA_ALIGNMENT = 64
+
+# Идентификатор дополнительного поля ZIP, которым выравниваются данные
+_PADDING_HEADER_ID = 0x6a61
+
+# Размер локального заголовка элемента ZIP без имени и дополнительного поля
+_LOCAL_HEADER_SIZE = 30
+
+PathLike = Union[str, 'os.PathLike[str]']
+
+
+def _table_columns(table: IssueTable) -> Dict[str, np.ndarray]:
+    """Колонки таблицы в виде плоского словаря массивов"""
+    columns = {
+        'keys': table.keys,
+        'created': table.created,
+        'resolved': table.resolved,
+        'has_resolution': table.has_resolution,
+        'timespent': table.timespent
+    }
+    for column, codes in table.codes.items():
+        columns[f'codes.{column}'] = codes
+    if table.transitions is not None:
+        log = table.transitions
+        columns.update({'transitions.rows': log.rows, 'transitions.times': log.times,
+                        'transitions.from_codes': log.from_codes,
+                        'transitions.to_codes': log.to_codes})
+    return columns
+
+
+def table_fingerprint(table: IssueTable) -> str:
+    """
+    Отпечаток содержимого таблицы задач
+
+    В отличие от версии процессора, отпечаток не зависит от запуска
+    приложения и совпадает у таблиц с одинаковыми данными.
+
+    Args:
+        table: Таблица задач
+
+    Returns:
+        Шестнадцатеричный хеш колонок и словарей строк
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for name, values in _table_columns(table).items():
+        values = np.ascontiguousarray(values)
+        digest.update(f'{name}:{values.dtype.str}:{values.shape}'.encode('utf-8'))
+        digest.update(values.data)
+    digest.update(json.dumps(table.dictionaries, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _padding_extra(offset: int, name: str, header_size: int) -> bytes:
+    """
+    Дополнительное поле ZIP, выравнивающее начало данных массива
+
+    Args:
+        offset: Смещение локального заголовка элемента в файле
+        name: Имя элемента
+        header_size: Размер заголовка .npy
+
+    Returns:
+        Содержимое дополнительного поля
+    """
+    start = offset + _LOCAL_HEADER_SIZE + len(name.encode()) + 4 + header_size
+    padding = -start % DATA_ALIGNMENT
+    return struct.pack('<HH', _PADDING_HEADER_ID, padding) + b'\0' * padding
+
+
+def save_snapshot(table: IssueTable, path: PathLike, compress: bool = False) -> None:
+    """
+    Сохранение таблицы задач в файл снимка
+
+    Снимок - архив .npz: каждая колонка хранится отдельным массивом .npy,
+    словари строк - в элементе meta.json. Несжатые колонки выравниваются
+    в файле, поэтому load_snapshot отображает их в память без копирования.
+
+    Args:
+        table: Таблица задач
+        path: Путь к файлу снимка
+        compress: Сжимать колонки (меньше файл, но загрузка с распаковкой в память)
+
+    Raises:
+        DataProcessingError: При ошибке записи файла
+    """
+    meta = {
+        'version': SNAPSHOT_VERSION,
+        'issue_count': len(table),
+        'dictionaries': table.dictionaries,
+        'has_transitions': table.transitions is not None
+    }
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    try:
+        with open(path, 'wb') as file, zipfile.ZipFile(file, 'w', compression) as archive:
+            for name, values in _table_columns(table).items():
+                buffer = io.BytesIO()
+                np.lib.format.write_array(buffer, np.ascontiguousarray(values), allow_pickle=False)
+                data = buffer.getbuffer()
+                info = zipfile.ZipInfo(f'{name}.npy', date_time=(1980, 1, 1, 0, 0, 0))
+                info.compress_type = compression
+                if not compress:
+                    info.extra = _padding_extra(file.tell(), info.filename,
+                                                len(data) - values.nbytes)
+                archive.writestr(info, data)
+            archive.writestr(META_NAME, json.dumps(meta, ensure_ascii=False))
+    except OSError as e:
+        raise DataProcessingError(f"Ошибка записи снимка {path}: {e}")
+
+
+def _map_member(file: Any, path: PathLike, info: zipfile.ZipInfo) -> np.ndarray:
+    """
+    Отображение несжатого массива архива в память
+
+    Args:
+        file: Открытый файл архива
+        path: Путь к файлу архива
+        info: Описание элемента архива
+
+    Returns:
+        Массив только для чтения, данные которого остаются в файле
+    """
+    file.seek(info.header_offset)
+    header = file.read(_LOCAL_HEADER_SIZE)
+    name_size, extra_size = struct.unpack('<HH', header[26:30])
+    file.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_size + extra_size)
+    version = np.lib.format.read_magic(file)
+    read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                   else np.lib.format.read_array_header_2_0)
+    shape, fortran_order, dtype = read_header(file)
+    if dtype.hasobject:
+        raise DataProcessingError(f"Недопустимый тип колонки {info.filename}")
+    if not int(np.prod(shape)):
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=file.tell(), shape=shape,
+                     order='F' if fortran_order else 'C')
+
+
+def load_snapshot(path: PathLike, mmap: bool = True) -> IssueTable:
+    """
+    Загрузка таблицы задач из файла снимка
+
+    Несжатые колонки отображаются в память: открытие снимка не читает
+    данные целиком, а страницы файла разделяются между процессами.
+
+    Args:
+        path: Путь к файлу снимка
+        mmap: Отображать несжатые колонки в память (False - читать в память)
+
+    Returns:
+        Таблица задач
+
+    Raises:
+        DataProcessingError: Если файл не является снимком или поврежден
+    """
+    try:
+        with open(path, 'rb') as file, zipfile.ZipFile(file) as archive:
+            meta = json.loads(archive.read(META_NAME))
+            if meta.get('version') != SNAPSHOT_VERSION:
+                raise DataProcessingError(
+                    f"Неподдерживаемая версия снимка {path}: {meta.get('version')}")
+
+            columns = {}
+            for info in archive.infolist():
+                if not info.filename.endswith('.npy'):
+                    continue
+                name = info.filename[:-len('.npy')]
+                if mmap and info.compress_type == zipfile.ZIP_STORED:
+                    columns[name] = _map_member(file, path, info)
+                else:
+                    with archive.open(info) as member:
+                        columns[name] = np.lib.format.read_array(member, allow_pickle=False)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        raise DataProcessingError(f"Ошибка чтения снимка {path}: {e}")
+
+    transitions = None
+    if meta['has_transitions']:
+        transitions = TransitionLog(columns['transitions.rows'], columns['transitions.times'],
+                                    columns['transitions.from_codes'],
+                                    columns['transitions.to_codes'])
+    return IssueTable(
+        keys=columns['keys'],
+        created=columns['created'],
+        resolved=columns['resolved'],
+        has_resolution=columns['has_resolution'],
+        timespent=columns['timespent'],
+        codes={name[len('codes.'):]: values for name, values in columns.items()
+               if name.startswith('codes.')},
+        dictionaries=meta['dictionaries'],
+        transitions=transitions
+    )
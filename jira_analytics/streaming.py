@@ -0,0 +1,286 @@
+"""Модуль потокового разбора ответов поиска JIRA"""
+import codecs
+import json
+import re
+from typing import Dict, Iterable, Iterator, Any, List, Optional, Tuple
+
+# Поля задачи, сохраняемые при проекции: None - скалярное значение,
+# кортеж - список сохраняемых подполей вложенного объекта
+ISSUE_FIELDS = {
+    'created': None,
+    'updated': None,
+    'resolutiondate': None,
+    'timespent': None,
+    'status': ('name',),
+    'priority': ('name',),
+    'assignee': ('displayName',),
+    'reporter': ('displayName',)
+}
+
+# Проекция: имя поля -> сохраняемые подполя (None - значение целиком)
+Projection = Dict[str, Optional[Tuple[str, ...]]]
+
+_SCALAR_FIELD = re.compile(r'"(\w+)"\s*:\s*(-?\d+|true|false|null|"[^"\\]*")')
+_WHITESPACE = ' \t\r\n'
+_STRUCTURE = re.compile(r'[{}\[\]"]')
+_STRING_END = re.compile(r'["\\]')
+
+
+def status_transitions(histories: Iterable[Dict[str, Any]]) -> List[List[Optional[str]]]:
+    """
+    Выборка переходов между статусами из записей журнала изменений
+
+    Args:
+        histories: Записи changelog.histories (или values постраничного API)
+
+    Returns:
+        Список переходов [дата, исходный статус, новый статус]
+    """
+    return [
+        [history.get('created'), item.get('fromString'), item.get('toString')]
+        for history in histories
+        for item in history.get('items') or ()
+        if item.get('field') == 'status'
+    ]
+
+
+def project_changelog(changelog: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Сокращение журнала изменений задачи до переходов между статусами
+
+    Args:
+        changelog: Объект changelog из ответа с expand=changelog
+
+    Returns:
+        Словарь {total, received, transitions}: общее и полученное
+        количество записей журнала и переходы [дата, из, в]
+    """
+    if 'transitions' in changelog:
+        # Журнал уже сокращен (например, задача из локального кэша)
+        return changelog
+    histories = changelog.get('histories') or []
+    return {
+        'total': changelog.get('total', len(histories)),
+        'received': len(histories),
+        'transitions': status_transitions(histories)
+    }
+
+
+def build_projection(fields: Iterable[str]) -> Projection:
+    """
+    Проекция для набора запрошенных полей
+
+    Args:
+        fields: Имена полей задачи
+
+    Returns:
+        Описание сохраняемых полей; для полей вне ISSUE_FIELDS
+        значение сохраняется целиком
+    """
+    return {name: ISSUE_FIELDS.get(name) for name in fields if name != 'key'}
+
+
+def project_issue(issue: Dict[str, Any], fields: Optional[Projection] = None) -> Dict[str, Any]:
+    """
+    Проекция задачи на поля, используемые отчетами
+
+    Журнал изменений (при запросе с expand=changelog) сокращается
+    до переходов между статусами.
+
+    Args:
+        issue: Задача JIRA в исходном виде
+        fields: Описание сохраняемых полей (по умолчанию ISSUE_FIELDS)
+
+    Returns:
+        Задача только с ключом и нужными полями
+    """
+    source = issue.get('fields') or {}
+    projected = {}
+    for name, subfields in (fields or ISSUE_FIELDS).items():
+        value = source.get(name)
+        if subfields is not None and isinstance(value, dict):
+            value = {subfield: value[subfield] for subfield in subfields if subfield in value}
+        projected[name] = value
+    result = {'key': issue.get('key'), 'fields': projected}
+    if isinstance(issue.get('changelog'), dict):
+        result['changelog'] = project_changelog(issue['changelog'])
+    return result
+
+
+class SearchResponseStream:
+    """
+    Потоковый разбор ответа /rest/api/2/search
+
+    Элементы массива issues разбираются по мере поступления данных,
+    скалярные поля верхнего уровня (total, startAt, maxResults)
+    сохраняются в header. Конец объекта, не уместившегося в буфер,
+    ищется сканированием скобок по каждому новому фрагменту, поэтому
+    задача декодируется один раз независимо от числа фрагментов.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], array_key: str = 'issues'):
+        """
+        Инициализация разборщика
+
+        Args:
+            chunks: Последовательность фрагментов тела ответа
+            array_key: Имя разбираемого массива верхнего уровня
+        """
+        self.header: Dict[str, Any] = {}
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._array_start = re.compile(r'"%s"\s*:\s*\[' % re.escape(array_key))
+        self._buffer = ''
+        self._pos = 0
+        self._exhausted = False
+        # Состояние поиска конца текущего элемента
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def _next_text(self) -> str:
+        """
+        Декодировать следующий фрагмент тела ответа
+
+        Returns:
+            Текст фрагмента (остаток декодера, если данные закончились)
+        """
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._exhausted = True
+            return self._decoder.decode(b'', final=True)
+        return self._decoder.decode(chunk)
+
+    def _read_more(self) -> bool:
+        """
+        Дочитать следующий фрагмент в буфер, отбросив разобранную часть
+
+        Returns:
+            False, если данные закончились
+        """
+        if self._exhausted:
+            return False
+        text = self._next_text()
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return not self._exhausted
+
+    def _scan_item(self, text: str, position: int) -> Optional[int]:
+        """
+        Продолжить поиск конца объекта или массива во фрагменте текста
+
+        Глубина вложенности и признак строки сохраняются между вызовами,
+        поэтому каждый символ просматривается один раз.
+
+        Args:
+            text: Фрагмент текста
+            position: Позиция начала просмотра
+
+        Returns:
+            Позиция после закрывающей скобки или None, если элемент
+            во фрагменте не завершен
+        """
+        while True:
+            if self._escaped:
+                if position >= len(text):
+                    return None
+                position += 1
+                self._escaped = False
+            if self._in_string:
+                match = _STRING_END.search(text, position)
+                if match is None:
+                    return None
+                position = match.end()
+                if match.group() == '\\':
+                    self._escaped = True
+                else:
+                    self._in_string = False
+                continue
+
+            match = _STRUCTURE.search(text, position)
+            if match is None:
+                return None
+            char = match.group()
+            position = match.end()
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return position
+
+    def _complete_item(self) -> None:
+        """
+        Дочитать данные до конца объекта, начатого в позиции _pos
+
+        Новые фрагменты просматриваются по отдельности и склеиваются
+        с буфером один раз, когда конец объекта найден.
+        """
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        if self._scan_item(self._buffer, self._pos) is not None:
+            return
+
+        pieces = [self._buffer[self._pos:]]
+        found = None
+        while found is None:
+            if self._exhausted:
+                raise json.JSONDecodeError("Неожиданный конец ответа", ''.join(pieces), 0)
+            text = self._next_text()
+            pieces.append(text)
+            found = self._scan_item(text, 0)
+        self._buffer = ''.join(pieces)
+        self._pos = 0
+
+    def _read_scalars(self, text: str) -> None:
+        """
+        Сохранить скалярные поля верхнего уровня из фрагмента вне массива
+
+        Args:
+            text: Фрагмент JSON до или после массива
+        """
+        for name, raw in _SCALAR_FIELD.findall(text):
+            self.header.setdefault(name, json.loads(raw))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        match = self._array_start.search(self._buffer)
+        while match is None:
+            if not self._read_more():
+                # Массива нет (например, пустой ответ) - разбираем только заголовок
+                self._read_scalars(self._buffer)
+                return
+            match = self._array_start.search(self._buffer)
+
+        self._read_scalars(self._buffer[:match.start()])
+        self._pos = match.end()
+
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE + ',':
+                self._pos += 1
+            if self._pos >= len(self._buffer):
+                if not self._read_more():
+                    raise json.JSONDecodeError("Неожиданный конец ответа", self._buffer, self._pos)
+                continue
+            if self._buffer[self._pos] == ']':
+                self._pos += 1
+                break
+            if self._buffer[self._pos] in '{[':
+                self._complete_item()
+            try:
+                item, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Скалярный элемент получен не полностью - дочитываем данные
+                if not self._read_more():
+                    raise
+                continue
+            self._pos = end
+            yield item
+
+        while self._read_more():
+            pass
+        self._read_scalars(self._buffer[self._pos:])
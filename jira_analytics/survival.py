@@ -0,0 +1,138 @@
+"""Модуль возраста открытых задач и кривой дожития"""
+from typing import Dict, Sequence, Tuple
+import numpy as np
+from jira_analytics.histograms import Bins, DEFAULT_BINS, Histogram, compute_histogram
+from jira_analytics.issue_table import IssueTable, SECONDS_PER_DAY
+
+# Перцентили возраста открытых задач
+AGE_QUANTILES = (0.5, 0.85, 0.95)
+
+
+def issue_durations(table: IssueTable, reference: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Длительность жизни задач в полных днях
+
+    Для закрытых задач - от создания до разрешения, для открытых -
+    от создания до момента reference (цензурированные наблюдения).
+
+    Args:
+        table: Таблица задач
+        reference: Момент расчета возраста (секунды эпохи UTC)
+
+    Returns:
+        Кортеж (длительности в днях, признак закрытия); задачи без
+        корректной даты создания пропускаются
+    """
+    closed = table.has_resolution & np.isfinite(table.resolved)
+    end = np.where(closed, table.resolved, reference)
+    valid = np.isfinite(table.created) & (table.has_resolution == closed)
+    days = np.floor(np.maximum(end[valid] - table.created[valid], 0) / SECONDS_PER_DAY)
+    return days.astype(np.int64), closed[valid]
+
+
+def kaplan_meier(durations: np.ndarray, observed: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Оценка Каплана-Мейера доли задач, остающихся открытыми
+
+    Args:
+        durations: Длительности
+        observed: True для закрытых задач, False для еще открытых
+
+    Returns:
+        Кортеж (моменты закрытия, доля открытых после момента)
+    """
+    if len(durations) == 0:
+        return np.zeros(0, dtype=durations.dtype), np.zeros(0)
+
+    order = np.argsort(durations, kind='stable')
+    durations, observed = durations[order], observed[order]
+    times, first = np.unique(durations, return_index=True)
+    events = np.add.reduceat(observed.astype(np.int64), first)
+    at_risk = len(durations) - first
+    survival = np.cumprod(1.0 - events / at_risk)
+    has_events = events > 0
+    return times[has_events], survival[has_events]
+
+
+def median_survival(times: np.ndarray, survival: np.ndarray) -> float:
+    """
+    Медиана по кривой дожития
+
+    Args:
+        times: Моменты закрытия
+        survival: Доля открытых задач после момента
+
+    Returns:
+        Первый момент, когда открыто не больше половины задач, или NaN
+    """
+    reached = np.flatnonzero(survival <= 0.5)
+    return float(times[reached[0]]) if len(reached) else float('nan')
+
+
+class AgeReport:
+    """Возраст открытых задач и кривая дожития всех задач на момент расчета"""
+
+    def __init__(self, reference: float, open_ages: np.ndarray, open_histogram: Histogram,
+                 age_percentiles: Dict[float, float], survival_times: np.ndarray,
+                 survival: np.ndarray, closed_count: int):
+        """
+        Инициализация отчета
+
+        Args:
+            reference: Момент расчета (секунды эпохи UTC)
+            open_ages: Возраст открытых задач в днях
+            open_histogram: Гистограмма возраста открытых задач
+            age_percentiles: Перцентили возраста открытых задач
+            survival_times: Моменты закрытия (дни от создания)
+            survival: Доля задач, остающихся открытыми после момента
+            closed_count: Количество закрытых задач
+        """
+        self.reference = reference
+        self.open_ages = open_ages
+        self.open_histogram = open_histogram
+        self.age_percentiles = age_percentiles
+        self.survival_times = survival_times
+        self.survival = survival
+        self.closed_count = closed_count
+
+    @property
+    def open_count(self) -> int:
+        """Количество открытых задач"""
+        return len(self.open_ages)
+
+    @property
+    def median_lifetime(self) -> float:
+        """Медиана времени жизни задачи по кривой дожития"""
+        return median_survival(self.survival_times, self.survival)
+
+
+def build_age_report(table: IssueTable, reference: float, bins: Bins = DEFAULT_BINS,
+                     log_scale: bool = False,
+                     quantiles: Sequence[float] = AGE_QUANTILES) -> AgeReport:
+    """
+    Расчет возраста открытых задач и кривой дожития за один проход
+
+    Args:
+        table: Таблица задач
+        reference: Момент расчета (секунды эпохи UTC)
+        bins: Количество интервалов или явные границы гистограммы возраста
+        log_scale: Логарифмические интервалы гистограммы
+        quantiles: Уровни перцентилей возраста
+
+    Returns:
+        Отчет о возрасте задач
+    """
+    durations, observed = issue_durations(table, reference)
+    open_ages = durations[~observed]
+    times, survival = kaplan_meier(durations, observed)
+    percentiles = {q: float(np.quantile(open_ages, q)) if len(open_ages) else float('nan')
+                   for q in quantiles}
+    return AgeReport(
+        reference=reference,
+        open_ages=open_ages,
+        open_histogram=compute_histogram(open_ages, bins, log_scale),
+        age_percentiles=percentiles,
+        survival_times=times,
+        survival=survival,
+        closed_count=int(np.count_nonzero(observed))
+    )
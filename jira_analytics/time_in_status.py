@@ -0,0 +1,74 @@
+"""Модуль расчета времени пребывания задач в статусах по журналу переходов"""
+from typing import Dict, Tuple
+import numpy as np
+from jira_analytics.issue_table import IssueTable, MISSING, SECONDS_PER_DAY
+
+
+def status_segments(table: IssueTable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Завершенные интервалы пребывания задач в статусах
+
+    Интервал начинается с создания задачи или предыдущего перехода и
+    заканчивается переходом; статус интервала - исходный статус перехода.
+    Текущий (незавершенный) статус задачи не учитывается.
+
+    Args:
+        table: Таблица задач с журналом переходов
+
+    Returns:
+        Кортеж (строки задач, коды статусов, длительности в днях)
+    """
+    log = table.transitions
+    if log is None or len(log) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty.astype(np.int32), np.zeros(0)
+
+    order = np.lexsort((log.times, log.rows))
+    rows = log.rows[order]
+    times = log.times[order]
+    codes = log.from_codes[order]
+
+    # Начало интервала: предыдущий переход той же задачи или создание задачи
+    starts = np.empty_like(times)
+    starts[1:] = times[:-1]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = rows[1:] != rows[:-1]
+    starts[first] = table.created[rows[first]]
+
+    with np.errstate(invalid='ignore'):
+        days = (times - starts) / SECONDS_PER_DAY
+    valid = np.isfinite(days) & (codes != MISSING)
+    return rows[valid].astype(np.int64), codes[valid], np.maximum(days[valid], 0.0)
+
+
+def dwell_by_status(table: IssueTable, min_days: float = 0,
+                    max_days: float = 3650) -> Dict[str, np.ndarray]:
+    """
+    Суммарное время пребывания каждой задачи в каждом статусе
+
+    Повторные возвраты задачи в статус суммируются. Расчет выполняется
+    группировкой пар (задача, статус) без циклов по переходам.
+
+    Args:
+        table: Таблица задач с журналом переходов
+        min_days: Минимальное суммарное время в статусе
+        max_days: Максимальное суммарное время в статусе
+
+    Returns:
+        Словарь {статус: массив дней по задачам, побывавшим в статусе}
+    """
+    rows, codes, days = status_segments(table)
+    labels = table.labels('status')
+    if len(rows) == 0:
+        return {}
+
+    pairs, inverse = np.unique(rows * len(labels) + codes, return_inverse=True)
+    totals = np.bincount(inverse, weights=days)
+    status_codes = pairs % len(labels)
+
+    in_range = (totals >= min_days) & (totals <= max_days)
+    status_codes, totals = status_codes[in_range], totals[in_range]
+    order = np.argsort(status_codes, kind='stable')
+    status_codes, totals = status_codes[order], totals[order]
+    present, starts = np.unique(status_codes, return_index=True)
+    return {labels[code]: group for code, group in zip(present, np.split(totals, starts[1:]))}
@@ -0,0 +1,287 @@
+"""Модуль плотных календарных рядов созданных и закрытых задач"""
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import DefaultDict, List, Mapping, Optional, Tuple, Union
+import numpy as np
+from jira_analytics.constants import PERIODS
+from jira_analytics.exceptions import DataProcessingError
+
+EPOCH_DATE = date(1970, 1, 1)
+
+
+def to_epoch_day(value: date) -> int:
+    """
+    Номер дня эпохи для даты
+
+    Args:
+        value: Дата
+
+    Returns:
+        Количество дней от 1970-01-01
+    """
+    return (value - EPOCH_DATE).days
+
+
+def rolling_sum(values: np.ndarray, window: int, center: bool = True) -> np.ndarray:
+    """
+    Скользящая сумма через кумулятивные суммы
+
+    На краях ряда окно усекается, поэтому длина результата равна длине ряда.
+
+    Args:
+        values: Значения ряда
+        window: Размер окна
+        center: Центрированное окно; иначе окно заканчивается на текущей точке
+
+    Returns:
+        Массив сумм
+    """
+    sums, _ = _rolling(values, window, center)
+    return sums
+
+
+def rolling_mean(values: np.ndarray, window: int, center: bool = True) -> np.ndarray:
+    """
+    Скользящее среднее через кумулятивные суммы
+
+    Args:
+        values: Значения ряда
+        window: Размер окна
+        center: Центрированное окно; иначе окно заканчивается на текущей точке
+
+    Returns:
+        Массив средних по фактическому (усеченному на краях) окну
+    """
+    sums, sizes = _rolling(values, window, center)
+    return sums / np.maximum(sizes, 1)
+
+
+def _rolling(values: np.ndarray, window: int, center: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Скользящие суммы и размеры окон
+
+    Args:
+        values: Значения ряда
+        window: Размер окна
+        center: Центрированное окно
+
+    Returns:
+        Кортеж (суммы, размеры окон)
+    """
+    if window <= 0:
+        raise DataProcessingError(f"Размер окна должен быть положительным: {window}")
+
+    values = np.asarray(values, dtype=np.float64)
+    count = len(values)
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    index = np.arange(count)
+    if center:
+        low = np.maximum(index - window // 2, 0)
+        high = np.minimum(index + window // 2 + 1, count)
+    else:
+        low = np.maximum(index - window + 1, 0)
+        high = index + 1
+    return cumulative[high] - cumulative[low], high - low
+
+
+class Timeline:
+    """Количества созданных и закрытых задач по последовательным периодам"""
+
+    def __init__(self, starts: np.ndarray, created: np.ndarray, closed: np.ndarray,
+                 period: str = 'day'):
+        """
+        Инициализация ряда
+
+        Args:
+            starts: Номера дней эпохи начала каждого периода
+            created: Количество созданных задач по периодам
+            closed: Количество закрытых задач по периодам
+            period: Период агрегации (day, week, month)
+        """
+        self.starts = starts
+        self.created = created
+        self.closed = closed
+        self.period = period
+
+    @classmethod
+    def from_days(cls, created_days: np.ndarray, closed_days: np.ndarray,
+                  first_day: Optional[int] = None, last_day: Optional[int] = None) -> 'Timeline':
+        """
+        Построение дневного ряда по номерам дней событий
+
+        Пропущенные дни заполняются нулями. Если границы не заданы,
+        ряд охватывает все события.
+
+        Args:
+            created_days: Номера дней эпохи создания задач
+            closed_days: Номера дней эпохи закрытия задач
+            first_day: Первый день ряда
+            last_day: Последний день ряда (включительно)
+
+        Returns:
+            Дневной ряд
+        """
+        events = np.concatenate((created_days, closed_days))
+        if first_day is None:
+            first_day = int(events.min()) if len(events) else 0
+        if last_day is None:
+            last_day = int(events.max()) if len(events) else first_day - 1
+        length = max(last_day - first_day + 1, 0)
+
+        def count(days: np.ndarray) -> np.ndarray:
+            days = days[(days >= first_day) & (days <= last_day)] - first_day
+            return np.bincount(days, minlength=length).astype(np.int64)
+
+        starts = np.arange(first_day, first_day + length, dtype=np.int64)
+        return cls(starts, count(created_days), count(closed_days))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def dates(self) -> List[date]:
+        """Даты начала периодов"""
+        return [EPOCH_DATE + timedelta(days=day) for day in self.starts.tolist()]
+
+    @property
+    def active_periods(self) -> int:
+        """Количество периодов, в которых были созданные или закрытые задачи"""
+        return int(np.count_nonzero((self.created > 0) | (self.closed > 0)))
+
+    def window(self, start: date, end: date) -> 'Timeline':
+        """
+        Дневной ряд за период с заполнением нулями дней вне данных
+
+        Args:
+            start: Первая дата
+            end: Последняя дата (включительно)
+
+        Returns:
+            Дневной ряд за период
+
+        Raises:
+            DataProcessingError: Если ряд уже агрегирован по неделям или месяцам
+        """
+        if self.period != 'day':
+            raise DataProcessingError("Окно по датам доступно только для дневного ряда")
+
+        first_day, last_day = to_epoch_day(start), to_epoch_day(end)
+        length = max(last_day - first_day + 1, 0)
+        created = np.zeros(length, dtype=np.int64)
+        closed = np.zeros(length, dtype=np.int64)
+
+        if len(self):
+            offset = int(self.starts[0])
+            low = max(first_day, offset)
+            high = min(last_day, offset + len(self) - 1)
+            if low <= high:
+                created[low - first_day:high - first_day + 1] = self.created[low - offset:high - offset + 1]
+                closed[low - first_day:high - first_day + 1] = self.closed[low - offset:high - offset + 1]
+
+        starts = np.arange(first_day, first_day + length, dtype=np.int64)
+        return Timeline(starts, created, closed)
+
+    def last(self, days: int, end: Optional[date] = None) -> 'Timeline':
+        """
+        Дневной ряд за последние дни
+
+        Args:
+            days: Количество дней до конечной даты
+            end: Конечная дата (по умолчанию - сегодня)
+
+        Returns:
+            Дневной ряд за период [end - days, end]
+        """
+        end = end or date.today()
+        return self.window(end - timedelta(days=days), end)
+
+    def resample(self, period: str) -> 'Timeline':
+        """
+        Агрегация дневного ряда по неделям (с понедельника) или месяцам
+
+        Args:
+            period: Период агрегации (day, week, month)
+
+        Returns:
+            Агрегированный ряд
+
+        Raises:
+            DataProcessingError: При неизвестном периоде или повторной агрегации
+        """
+        if period not in PERIODS:
+            raise DataProcessingError(f"Неизвестный период агрегации: {period}")
+        if period == self.period:
+            return self
+        if self.period != 'day':
+            raise DataProcessingError("Агрегировать можно только дневной ряд")
+
+        if period == 'week':
+            # 1970-01-01 - четверг, сдвиг на 3 дня дает недели с понедельника
+            buckets = (self.starts + 3) // 7
+            bucket_starts = np.unique(buckets) * 7 - 3
+        else:
+            months = self.starts.astype('datetime64[D]').astype('datetime64[M]')
+            buckets = months.astype(np.int64)
+            bucket_starts = np.unique(months).astype('datetime64[D]').astype(np.int64)
+
+        _, inverse = np.unique(buckets, return_inverse=True)
+        size = len(bucket_starts)
+        created = np.bincount(inverse, weights=self.created, minlength=size).astype(np.int64)
+        closed = np.bincount(inverse, weights=self.closed, minlength=size).astype(np.int64)
+        return Timeline(bucket_starts, created, closed, period)
+
+    def as_dicts(self) -> Tuple[DefaultDict[date, int], DefaultDict[date, int]]:
+        """
+        Ненулевые количества в виде словарей по датам начала периодов
+
+        Returns:
+            Кортеж (created_dates, closed_dates)
+        """
+        created_dates, closed_dates = defaultdict(int), defaultdict(int)
+        dates = self.dates
+        for index in np.flatnonzero(self.created).tolist():
+            created_dates[dates[index]] = int(self.created[index])
+        for index in np.flatnonzero(self.closed).tolist():
+            closed_dates[dates[index]] = int(self.closed[index])
+        return created_dates, closed_dates
+
+    @classmethod
+    def from_dicts(cls, created_dates: Mapping[date, int], closed_dates: Mapping[date, int]) -> 'Timeline':
+        """
+        Построение дневного ряда по словарям количеств задач по датам (обратно as_dicts)
+
+        Args:
+            created_dates: Количество созданных задач по датам
+            closed_dates: Количество закрытых задач по датам
+
+        Returns:
+            Дневной ряд
+        """
+        def expand(counts: Mapping[date, int]) -> np.ndarray:
+            days = np.array([to_epoch_day(day) for day in counts], dtype=np.int64)
+            return np.repeat(days, np.array(list(counts.values()), dtype=np.int64))
+
+        return cls.from_days(expand(created_dates), expand(closed_dates))
+
+
+def timeline_arguments(timeline: Union[Timeline, Mapping[date, int]],
+                       issues_count: Union[int, Mapping[date, int]],
+                       legacy_issues_count: Optional[int] = None) -> Tuple[Timeline, int]:
+    """
+    Аргументы графика заведенных и закрытых задач в форме (timeline, issues_count)
+
+    Прежняя форма вызова (created_dates, closed_dates, issues_count) со словарями
+    количеств по датам (см. DataProcessor.get_created_closed_counts) по-прежнему
+    принимается: дневной ряд строится из словарей.
+
+    Args:
+        timeline: Дневной ряд или словарь созданных задач по датам
+        issues_count: Общее количество задач или словарь закрытых задач по датам
+        legacy_issues_count: Общее количество задач в прежней форме вызова
+
+    Returns:
+        Кортеж (дневной ряд, общее количество задач)
+    """
+    if isinstance(timeline, Timeline):
+        return timeline, issues_count
+    return Timeline.from_dicts(timeline, issues_count), legacy_issues_count
@@ -0,0 +1,135 @@
+"""Модуль компактного хранения переходов задач между статусами"""
+from array import array
+from typing import List, Optional
+import numpy as np
+from jira_analytics.dates import parse_jira_timestamps
+
+# Количество дат переходов, разбираемых одним пакетом
+PARSE_BATCH_SIZE = 65536
+
+
+class TransitionLog:
+    """
+    Переходы между статусами в колоночном виде
+
+    Каждый переход хранится как номер строки задачи в таблице, момент
+    перехода (секунды эпохи UTC) и коды исходного и нового статусов
+    в словаре статусов таблицы задач.
+    """
+
+    def __init__(self, rows: np.ndarray, times: np.ndarray,
+                 from_codes: np.ndarray, to_codes: np.ndarray):
+        """
+        Инициализация журнала переходов
+
+        Args:
+            rows: Номера строк задач (int32)
+            times: Моменты переходов, секунды эпохи (float64, NaN при ошибке)
+            from_codes: Коды исходных статусов (int32)
+            to_codes: Коды новых статусов (int32)
+        """
+        self.rows = rows
+        self.times = times
+        self.from_codes = from_codes
+        self.to_codes = to_codes
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @classmethod
+    def empty(cls) -> 'TransitionLog':
+        """Пустой журнал"""
+        return cls(np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float64),
+                   np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32))
+
+    def reindex(self, row_map: np.ndarray) -> 'TransitionLog':
+        """
+        Перенумерация строк задач с удалением переходов исключенных задач
+
+        Args:
+            row_map: Новый номер для каждой старой строки (-1 - строка исключена)
+
+        Returns:
+            Новый журнал
+        """
+        rows = row_map[self.rows]
+        kept = rows >= 0
+        return TransitionLog(rows[kept].astype(np.int32), self.times[kept],
+                             self.from_codes[kept], self.to_codes[kept])
+
+    def concat(self, other: 'TransitionLog', row_offset: int,
+               code_map: Optional[np.ndarray] = None) -> 'TransitionLog':
+        """
+        Объединение с журналом другой таблицы
+
+        Args:
+            other: Журнал, добавляемый в конец
+            row_offset: Смещение номеров строк other
+            code_map: Перекодировка статусов other (последний элемент - для MISSING)
+
+        Returns:
+            Новый журнал
+        """
+        from_codes, to_codes = other.from_codes, other.to_codes
+        if code_map is not None:
+            from_codes, to_codes = code_map[from_codes], code_map[to_codes]
+        return TransitionLog(
+            np.concatenate([self.rows, (other.rows + row_offset).astype(np.int32)]),
+            np.concatenate([self.times, other.times]),
+            np.concatenate([self.from_codes, from_codes]).astype(np.int32),
+            np.concatenate([self.to_codes, to_codes]).astype(np.int32)
+        )
+
+
+class TransitionLogBuilder:
+    """
+    Накопление переходов за один проход по задачам
+
+    Коды хранятся в array без создания объектов на каждый переход,
+    даты разбираются пакетами по PARSE_BATCH_SIZE.
+    """
+
+    def __init__(self):
+        self._rows = array('i')
+        self._from_codes = array('i')
+        self._to_codes = array('i')
+        self._times = array('d')
+        self._pending: List[Optional[str]] = []
+
+    def append(self, row: int, created: Optional[str], from_code: int, to_code: int) -> None:
+        """
+        Добавление перехода
+
+        Args:
+            row: Номер строки задачи
+            created: Дата перехода в формате JIRA
+            from_code: Код исходного статуса
+            to_code: Код нового статуса
+        """
+        self._rows.append(row)
+        self._from_codes.append(from_code)
+        self._to_codes.append(to_code)
+        self._pending.append(created)
+        if len(self._pending) >= PARSE_BATCH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Разбор накопленных дат"""
+        if self._pending:
+            self._times.frombytes(parse_jira_timestamps(self._pending).astype(np.float64).tobytes())
+            self._pending = []
+
+    def build(self) -> TransitionLog:
+        """
+        Формирование журнала
+
+        Returns:
+            Журнал переходов на массивах NumPy
+        """
+        self._flush()
+        return TransitionLog(
+            np.array(self._rows, dtype=np.int32),
+            np.array(self._times, dtype=np.float64),
+            np.array(self._from_codes, dtype=np.int32),
+            np.array(self._to_codes, dtype=np.int32)
+        )
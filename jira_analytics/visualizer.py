@@ -1,40 +1,112 @@
 """Модуль для визуализации данных"""
-import matplotlib.pyplot as plt
+import os
+import re
 import numpy as np
-from datetime import datetime, date, timedelta
-from collections import defaultdict
-from typing import Dict, List, DefaultDict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+from jira_analytics.constants import BACKENDS
 from jira_analytics.exceptions import VisualizationError
+from jira_analytics.histograms import Histogram, compute_histogram
+from jira_analytics.lazy import LazyModule
+from jira_analytics.survival import AgeReport
+from jira_analytics.timeline import Timeline, rolling_mean, timeline_arguments
+
+# Стиль графиков
+PLOT_STYLE = 'seaborn-v0_8-whitegrid'
+
+# matplotlib загружается и настраивается при построении первого графика
+plt = LazyModule('matplotlib.pyplot', on_import=lambda pyplot: pyplot.style.use(PLOT_STYLE))
 
 
 class JiraVisualizer:
     """Класс для визуализации данных JIRA"""
 
-    def __init__(self, project_key: str):
+    def __init__(self, project_key: str, output_dir: Optional[str] = None,
+                 formats: Sequence[str] = ('png',), timeline_days: int = 90,
+                 rolling_window: int = 7, timeline_period: str = 'day'):
         """
         Инициализация визуализатора
 
         Args:
             project_key: Ключ проекта
+            output_dir: Каталог для сохранения графиков; если не задан,
+                графики показываются в интерактивном окне
+            formats: Форматы сохраняемых файлов (png, svg, pdf)
+            timeline_days: Глубина графика заведенных и закрытых задач в днях
+            rolling_window: Окно скользящего среднего в днях
+            timeline_period: Период агрегации графика (day, week, month)
         """
         self.project_key = project_key
-        self.set_style()
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.timeline_days = timeline_days
+        self.rolling_window = rolling_window
+        self.timeline_period = timeline_period
+        self.saved_files: List[str] = []
 
     def set_style(self):
-        """Настройка стиля графиков"""
-        plt.style.use('seaborn-v0_8-whitegrid')
+        """Повторное применение стиля графиков (при первом построении применяется автоматически)"""
+        plt.style.use(PLOT_STYLE)
+
+    def _show(self, name: str) -> None:
+        """
+        Показ текущего графика или сохранение его в файлы
+
+        Args:
+            name: Имя отчета для формирования имени файла
+        """
+        if self.output_dir is None:
+            plt.show()
+            return
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_name = re.sub(r'[^\w.-]+', '_', f"{self.project_key}_{name}")
+        for file_format in self.formats:
+            path = os.path.join(self.output_dir, f"{safe_name}.{file_format}")
+            plt.savefig(path, format=file_format)
+            self.saved_files.append(path)
+        plt.close()
+
+    @staticmethod
+    def _as_histogram(data: Union[Histogram, Sequence[float]], bins: int) -> Histogram:
+        """
+        Приведение данных к гистограмме
+
+        Args:
+            data: Готовая гистограмма или список значений
+            bins: Количество интервалов для списка значений
 
-    def plot_open_time_histogram(self, times: List[int]) -> None:
+        Returns:
+            Гистограмма
+        """
+        return data if isinstance(data, Histogram) else compute_histogram(data, bins)
+
+    @staticmethod
+    def _draw_histogram(histogram: Histogram, color: str) -> None:
+        """
+        Отрисовка гистограммы по количествам в интервалах
+
+        Args:
+            histogram: Гистограмма
+            color: Цвет столбцов
+        """
+        plt.bar(histogram.edges[:-1], histogram.counts, width=np.diff(histogram.edges),
+                align='edge', edgecolor='black', alpha=0.7, color=color)
+        if histogram.log_scale:
+            plt.xscale('symlog', linthresh=1)
+
+    def plot_open_time_histogram(self, times: Union[Histogram, List[int]]) -> None:
         """
         Гистограмма времени в открытом состоянии
 
         Args:
-            times: Список времен в днях
+            times: Гистограмма или список времен в днях
         """
         try:
+            histogram = self._as_histogram(times, 15)
             plt.figure(figsize=(10, 6))
-            if times:
-                plt.hist(times, bins=15, edgecolor='black', alpha=0.7, color='#2E86AB')
+            if histogram.total:
+                self._draw_histogram(histogram, '#2E86AB')
                 plt.xlabel('Дни в открытом состоянии')
                 plt.ylabel('Количество задач')
                 plt.title(f'{self.project_key}: Гистограмма времени в открытом состоянии')
@@ -45,17 +117,18 @@ class JiraVisualizer:
                 plt.title(f'{self.project_key}: Нет данных')
 
             plt.tight_layout()
-            plt.show()
+            self._show('open_time')
 
         except Exception as e:
             raise VisualizationError(f"Ошибка при построении гистограммы времени: {e}")
 
-    def plot_time_distribution_by_status(self, status_groups: Dict[str, List[int]]) -> None:
+    def plot_time_distribution_by_status(self,
+                                         status_groups: Dict[str, Union[Histogram, List[int]]]) -> None:
         """
         Распределение времени по состояниям
 
         Args:
-            status_groups: Словарь {статус: [времена в днях]}
+            status_groups: Словарь {статус: гистограмма или [времена в днях]}
         """
         try:
             if not status_groups:
@@ -63,81 +136,68 @@ class JiraVisualizer:
                 plt.text(0.5, 0.5, 'Нет данных для построения графика',
                          ha='center', va='center', transform=plt.gca().transAxes)
                 plt.title(f'{self.project_key}: Распределение времени по состояниям')
-                plt.show()
+                self._show('time_by_status')
                 return
 
             colors = ['#3498db', '#27ae60', '#f39c12', '#9b59b6', '#e74c3c']
             for i, (status, times) in enumerate(list(status_groups.items())[:5]):
                 plt.figure(figsize=(10, 5))
-                plt.hist(times, bins=10, alpha=0.7, color=colors[i], edgecolor='black')
+                self._draw_histogram(self._as_histogram(times, 10), colors[i])
                 plt.xlabel(f'Дни в состоянии {status}')
                 plt.ylabel('Количество задач')
                 plt.title(f'{self.project_key}: Распределение времени в состоянии {status}')
                 plt.grid(True, alpha=0.3)
                 plt.tight_layout()
-                plt.show()
+                self._show(f'time_by_status_{status}')
 
         except Exception as e:
             raise VisualizationError(f"Ошибка при построении распределения по статусам: {e}")
 
-    def plot_created_vs_closed_timeline(self,
-                                                      created_dates: DefaultDict[date, int],
-                                                      closed_dates: DefaultDict[date, int],
-                                                      issues_count: int) -> None:
+    def plot_created_vs_closed_timeline(self, timeline: Union[Timeline, Mapping[date, int]],
+                                        issues_count: Union[int, Mapping[date, int]],
+                                        legacy_issues_count: Optional[int] = None) -> None:
         """
-        График заведенных и закрытых задач за последние 3 месяца
+        График заведенных и закрытых задач за последние timeline_days дней
+
+        Прежняя форма вызова (created_dates, closed_dates, issues_count)
+        поддерживается, см. timeline_arguments.
 
         Args:
-            created_dates: Количество созданных задач по датам
-            closed_dates: Количество закрытых задач по датам
+            timeline: Дневной ряд созданных и закрытых задач
             issues_count: Общее количество задач
+            legacy_issues_count: Общее количество задач в прежней форме вызова
         """
+        timeline, issues_count = timeline_arguments(timeline, issues_count, legacy_issues_count)
         try:
-            # Определяем дату начала периода (3 месяца назад от текущей даты)
+            # Период: timeline_days дней до текущей даты, дни без задач заполнены нулями
             end_date = date.today()
-            start_date = end_date - timedelta(days=90)
-
-            # Фильтруем данные за последние 3 месяца
-            filtered_created = defaultdict(int)
-            filtered_closed = defaultdict(int)
-
-            for date_key, count in created_dates.items():
-                if start_date <= date_key <= end_date:
-                    filtered_created[date_key] = count
+            start_date = end_date - timedelta(days=self.timeline_days)
+            recent = timeline.last(self.timeline_days, end_date)
+            period_title = f'последние {self.timeline_days} дней'
 
-            for date_key, count in closed_dates.items():
-                if start_date <= date_key <= end_date:
-                    filtered_closed[date_key] = count
-
-            # Если нет данных за последние 3 месяца
-            if not filtered_created and not filtered_closed:
+            num_days = recent.active_periods
+            if not num_days:
                 plt.figure(figsize=(12, 6))
-                plt.text(0.5, 0.5, 'Нет данных за последние 3 месяца',
+                plt.text(0.5, 0.5, f'Нет данных за {period_title}',
                          ha='center', va='center', transform=plt.gca().transAxes)
-                plt.title(f'{self.project_key}: График заведенных и закрытых задач (последние 3 месяца)')
-                plt.show()
+                plt.title(f'{self.project_key}: График заведенных и закрытых задач ({period_title})')
+                self._show('created_vs_closed')
                 return
 
-            # Сортируем даты и получаем значения
-            dates = sorted(set(filtered_created.keys()) | set(filtered_closed.keys()))
-            created_counts = [filtered_created.get(date, 0) for date in dates]
-            closed_counts = [filtered_closed.get(date, 0) for date in dates]
+            recent = recent.resample(self.timeline_period)
+            dates = recent.dates
+            created_counts = recent.created
+            closed_counts = recent.closed
 
-            num_days = len(dates)
             plt.figure(figsize=(14, 8))
 
             # Если данных более чем на 60 дней, используем скользящее среднее
-            if num_days > 60:
-                print(f"За последние 3 месяца: {num_days} дней. Используется скользящее среднее.")
-                window_size = 7
-                created_smooth = []
-                closed_smooth = []
-
-                for i in range(len(created_counts)):
-                    start_idx = max(0, i - window_size // 2)
-                    end_idx = min(len(created_counts), i + window_size // 2 + 1)
-                    created_smooth.append(sum(created_counts[start_idx:end_idx]) / (end_idx - start_idx))
-                    closed_smooth.append(sum(closed_counts[start_idx:end_idx]) / (end_idx - start_idx))
+            if self.timeline_period == 'day' and num_days > 60:
+                window_size = self.rolling_window
+                print(f"За {period_title}: {num_days} дней с данными. "
+                      f"Используется скользящее среднее ({window_size} дней).")
+                created_smooth = rolling_mean(created_counts, window_size)
+                closed_smooth = rolling_mean(closed_counts, window_size)
 
                 plt.plot(dates, created_smooth, label='Создано (сглаженное)',
                          color='#3498db', linewidth=2.5, alpha=0.9)
@@ -148,18 +208,18 @@ class JiraVisualizer:
                 plt.fill_between(dates, closed_smooth, alpha=0.3, color='#2ecc71')
 
                 plt.xlabel('Дата')
-                plt.ylabel('Количество задач (скользящее среднее, 7 дней)')
+                plt.ylabel(f'Количество задач (скользящее среднее, {window_size} дней)')
                 plt.gca().xaxis.set_major_locator(plt.MaxNLocator(15))
                 plt.xticks(rotation=45, ha='right')
 
             else:
-                # Для меньшего количества дней используем обычный график
+                # Для меньшего количества дней или недель/месяцев используем обычный график
                 plt.plot(dates, created_counts, label='Создано',
                          color='#3498db', linewidth=2, marker='o', markersize=4)
                 plt.plot(dates, closed_counts, label='Закрыто',
                          color='#2ecc71', linewidth=2, marker='s', markersize=4)
 
-                plt.xlabel('Дата')
+                plt.xlabel('Дата' if self.timeline_period == 'day' else f'Начало периода ({self.timeline_period})')
                 plt.ylabel('Количество задач')
                 plt.xticks(rotation=45, ha='right')
 
@@ -167,7 +227,7 @@ class JiraVisualizer:
             period_str = f"{start_date.strftime('%d.%m.%Y')} - {end_date.strftime('%d.%m.%Y')}"
             plt.title(
                 f'{self.project_key}: График заведенных и закрытых задач\n'
-                f'Период: последние 3 месяца ({period_str})\n'
+                f'Период: {period_title} ({period_str})\n'
                 f'Дней с данными: {num_days}',
                 fontsize=14, fontweight='bold', pad=20
             )
@@ -176,8 +236,8 @@ class JiraVisualizer:
             plt.grid(True, alpha=0.3, linestyle='--')
 
             # Статистика за период
-            total_created_period = sum(created_counts)
-            total_closed_period = sum(closed_counts)
+            total_created_period = int(created_counts.sum())
+            total_closed_period = int(closed_counts.sum())
 
             stats_x = 0.5  # Центр по горизонтали
             stats_y = 0.98  # Ближе к верху, но не вплотную
@@ -196,7 +256,7 @@ class JiraVisualizer:
 
             plt.tight_layout()
             plt.axhline(y=0, color='gray', linestyle='-', alpha=0.3, linewidth=0.5)
-            plt.show()
+            self._show('created_vs_closed')
 
         except Exception as e:
             raise VisualizationError(f"Ошибка при построении временной шкалы: {e}")
@@ -216,7 +276,7 @@ class JiraVisualizer:
                 plt.text(0.5, 0.5, 'Нет данных о пользователях',
                          ha='center', va='center', transform=plt.gca().transAxes)
                 plt.title(f'{self.project_key}: Топ пользователей')
-                plt.show()
+                self._show('top_users')
                 return
 
             users, counts = zip(*top_users)
@@ -229,22 +289,23 @@ class JiraVisualizer:
             plt.gca().invert_yaxis()
             plt.grid(True, alpha=0.3, axis='x')
             plt.tight_layout()
-            plt.show()
+            self._show('top_users')
 
         except Exception as e:
             raise VisualizationError(f"Ошибка при построении топа пользователей: {e}")
 
-    def plot_time_spent_histogram(self, times: List[float]) -> None:
+    def plot_time_spent_histogram(self, times: Union[Histogram, List[float]]) -> None:
         """
         Гистограмма затраченного времени
 
         Args:
-            times: Список затраченного времени в днях
+            times: Гистограмма или список затраченного времени в днях
         """
         try:
+            histogram = self._as_histogram(times, 15)
             plt.figure(figsize=(10, 6))
-            if times:
-                plt.hist(times, bins=15, edgecolor='black', alpha=0.7, color='#A23B72')
+            if histogram.total:
+                self._draw_histogram(histogram, '#A23B72')
                 plt.xlabel('Затраченное время (дни)')
                 plt.ylabel('Количество задач')
                 plt.title(f'{self.project_key}: Гистограмма затраченного времени')
@@ -255,7 +316,7 @@ class JiraVisualizer:
                 plt.title(f'{self.project_key}: Гистограмма затраченного времени')
 
             plt.tight_layout()
-            plt.show()
+            self._show('time_spent')
 
         except Exception as e:
             raise VisualizationError(f"Ошибка при построении гистограммы затраченного времени: {e}")
@@ -302,7 +363,7 @@ class JiraVisualizer:
                          f'{count}', ha='center', va='bottom', fontweight='bold')
 
             plt.tight_layout()
-            plt.show()
+            self._show('priority')
 
             total = sum(counts)
             print("\n" + "=" * 50)
@@ -315,4 +376,181 @@ class JiraVisualizer:
             print("=" * 50)
 
         except Exception as e:
-            raise VisualizationError(f"Ошибка при построении распределения по приоритетам: {e}")
\ No newline at end of file
+            raise VisualizationError(f"Ошибка при построении распределения по приоритетам: {e}")
+
+    def plot_backlog(self, timeline: Timeline, backlog: np.ndarray) -> None:
+        """
+        Открытый бэклог во времени
+
+        Args:
+            timeline: Дневной ряд созданных и закрытых задач
+            backlog: Количество открытых задач на конец каждого дня ряда
+        """
+        try:
+            plt.figure(figsize=(14, 6))
+            if len(timeline):
+                dates = timeline.dates
+                plt.plot(dates, backlog, color='#e67e22', linewidth=2)
+                plt.fill_between(dates, backlog, alpha=0.3, color='#e67e22')
+                plt.xlabel('Дата')
+                plt.ylabel('Открытых задач')
+                plt.title(f'{self.project_key}: Открытый бэклог во времени\n'
+                          f'Сейчас открыто: {int(backlog[-1])}, максимум: {int(backlog.max())}')
+                plt.xticks(rotation=45, ha='right')
+                plt.grid(True, alpha=0.3, linestyle='--')
+            else:
+                plt.text(0.5, 0.5, 'Нет данных для построения графика',
+                         ha='center', va='center', transform=plt.gca().transAxes)
+                plt.title(f'{self.project_key}: Открытый бэклог во времени')
+
+            plt.tight_layout()
+            self._show('backlog')
+
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении графика бэклога: {e}")
+
+    def plot_throughput(self, throughput: Timeline) -> None:
+        """
+        Пропускная способность: закрытые задачи по периодам
+
+        Args:
+            throughput: Ряд, агрегированный по неделям или месяцам
+        """
+        try:
+            plt.figure(figsize=(14, 6))
+            if throughput.closed.sum():
+                width = 6 if throughput.period == 'week' else 25
+                plt.bar(throughput.dates, throughput.closed, width=width, align='edge',
+                        color='#27ae60', alpha=0.7, edgecolor='black')
+                plt.axhline(y=float(throughput.closed.mean()), color='gray', linestyle='--',
+                            label=f'Среднее: {throughput.closed.mean():.1f}')
+                plt.xlabel('Начало периода')
+                plt.ylabel('Закрыто задач')
+                plt.title(f'{self.project_key}: Пропускная способность ({throughput.period})')
+                plt.legend(loc='upper left')
+                plt.xticks(rotation=45, ha='right')
+                plt.grid(True, alpha=0.3, axis='y')
+            else:
+                plt.text(0.5, 0.5, 'Нет закрытых задач',
+                         ha='center', va='center', transform=plt.gca().transAxes)
+                plt.title(f'{self.project_key}: Пропускная способность')
+
+            plt.tight_layout()
+            self._show('throughput')
+
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении пропускной способности: {e}")
+
+    def plot_lead_time_percentiles(self, percentiles: Dict[float, float], issue_count: int) -> None:
+        """
+        Перцентили времени выполнения задач
+
+        Args:
+            percentiles: Словарь {уровень квантиля: дни}
+            issue_count: Количество закрытых задач в выборке
+        """
+        try:
+            if not issue_count:
+                print("Нет закрытых задач для расчета времени выполнения")
+                return
+
+            labels = [f'p{round(q * 100)}' for q in percentiles]
+            values = list(percentiles.values())
+
+            plt.figure(figsize=(10, 6))
+            bars = plt.bar(labels, values, color='#8e44ad', alpha=0.7, edgecolor='black')
+            for bar, value in zip(bars, values):
+                plt.text(bar.get_x() + bar.get_width() / 2., bar.get_height(),
+                         f'{value:.1f}', ha='center', va='bottom', fontweight='bold')
+            plt.xlabel('Перцентиль')
+            plt.ylabel('Время выполнения (дни)')
+            plt.title(f'{self.project_key}: Перцентили времени выполнения ({issue_count} задач)')
+            plt.grid(True, alpha=0.3, axis='y')
+            plt.tight_layout()
+            self._show('lead_time')
+
+            print(f"\nВремя выполнения задач ({self.project_key}):")
+            for label, value in zip(labels, values):
+                print(f"  {label:<5} {value:>8.1f} дней")
+
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении перцентилей времени выполнения: {e}")
+
+    def plot_open_age(self, report: AgeReport) -> None:
+        """
+        Возраст открытых задач и кривая дожития всех задач
+
+        Args:
+            report: Отчет о возрасте задач
+        """
+        try:
+            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+
+            histogram = report.open_histogram
+            if histogram.total:
+                ax1.bar(histogram.edges[:-1], histogram.counts, width=np.diff(histogram.edges),
+                        align='edge', edgecolor='black', alpha=0.7, color='#c0392b')
+                if histogram.log_scale:
+                    ax1.set_xscale('symlog', linthresh=1)
+                ax1.set_xlabel('Возраст (дни)')
+                ax1.set_ylabel('Количество задач')
+                ax1.grid(True, alpha=0.3)
+            else:
+                ax1.text(0.5, 0.5, 'Нет открытых задач',
+                         ha='center', va='center', transform=ax1.transAxes)
+            ax1.set_title(f'Возраст открытых задач ({report.open_count})\nПроект: {self.project_key}',
+                          fontsize=14, fontweight='bold')
+
+            if len(report.survival_times):
+                times = np.concatenate(([0], report.survival_times))
+                survival = np.concatenate(([1.0], report.survival))
+                ax2.step(times, survival, where='post', color='#2980b9', linewidth=2)
+                median = report.median_lifetime
+                if np.isfinite(median):
+                    ax2.axvline(x=median, color='gray', linestyle='--',
+                                label=f'Медиана: {median:.0f} дн.')
+                    ax2.legend(loc='upper right')
+                ax2.set_xlabel('Дни от создания')
+                ax2.set_ylabel('Доля открытых задач')
+                ax2.set_ylim(0, 1.05)
+                ax2.grid(True, alpha=0.3)
+            else:
+                ax2.text(0.5, 0.5, 'Нет закрытых задач',
+                         ha='center', va='center', transform=ax2.transAxes)
+            ax2.set_title(f'Кривая дожития (Каплан-Мейер)\nПроект: {self.project_key}',
+                          fontsize=14, fontweight='bold')
+
+            plt.tight_layout()
+            self._show('open_age')
+
+            print(f"\nОткрытых задач: {report.open_count}, закрытых: {report.closed_count}")
+            for q, value in report.age_percentiles.items():
+                if np.isfinite(value):
+                    print(f"  Возраст p{round(q * 100):<3} {value:>8.1f} дней")
+
+        except Exception as e:
+            raise VisualizationError(f"Ошибка при построении возраста открытых задач: {e}")
+
+
+def create_visualizer(project_key: str, backend: str = 'matplotlib', **options: Any) -> Any:
+    """
+    Создание визуализатора выбранного бэкенда
+
+    Args:
+        project_key: Ключ проекта
+        backend: Бэкенд (matplotlib или light)
+        **options: Параметры визуализатора (output_dir, formats, timeline_days и т.д.)
+
+    Returns:
+        JiraVisualizer или LightweightVisualizer
+
+    Raises:
+        VisualizationError: При неизвестном бэкенде
+    """
+    if backend == 'light':
+        from jira_analytics.light_visualizer import LightweightVisualizer
+        return LightweightVisualizer(project_key, **options)
+    if backend != 'matplotlib':
+        raise VisualizationError(f"Неизвестный бэкенд визуализации: {backend} "
+                                 f"(доступны: {', '.join(BACKENDS)})")
+    return JiraVisualizer(project_key, **options)
@@ -1,68 +1,559 @@
 """Основной модуль приложения"""
+import argparse
 import sys
 import os
+from typing import Any, Callable, Dict, List, Optional
 
 # Добавляем текущую директорию в путь для импорта модулей
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from jira_analytics.config import load_configuration
-from jira_analytics.jira_client import fetch_jira_issues
+from jira_analytics.jira_client import JiraClient, iter_jira_issues
+from jira_analytics.async_fetch import fetch_projects
+from jira_analytics.cache import (IssueCache, apply_sync, cache_query, delta_fields, prepare_sync,
+                                  refresh_issues, select_delta, sync_issues, to_jql_date)
+from jira_analytics.column_store import (ColumnStore, apply_store_sync, open_column_store,
+                                         prepare_store_sync, sync_column_store)
+from jira_analytics.issue_table import IssueTable
 from jira_analytics.data_processor import DataProcessor
+from jira_analytics.constants import BACKENDS
 from jira_analytics.visualizer import JiraVisualizer
 from jira_analytics.menu import display_menu, MenuHandler
-from jira_analytics.exceptions import ConfigError, JiraApiError, DataProcessingError
+from jira_analytics.reports import REPORTS, required_fields
+from jira_analytics.batch import render_reports
+from jira_analytics.portfolio import INDEX_NAME, render_portfolio
+from jira_analytics.render_cache import RenderCache
+from jira_analytics.snapshot import save_snapshot
+from jira_analytics.index import IssueFilter
+from jira_analytics.server import DEFAULT_HOST, DEFAULT_PORT, serve
+from jira_analytics.exceptions import (ConfigError, JiraApiError, DataProcessingError,
+                                       VisualizationError)
 
-def main() -> None:
+# Суффикс имени запроса ключей задач, удовлетворяющих условию JQL проекта портфеля
+MATCH_SUFFIX = ':match'
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     """
-    Основная функция приложения
+    Разбор аргументов командной строки
+
+    Args:
+        argv: Аргументы (по умолчанию sys.argv)
+
+    Returns:
+        Разобранные аргументы
     """
-    try:
-        # Загрузка конфигурации
-        config = load_configuration()
+    parser = argparse.ArgumentParser(description="JIRA Analytics Tool")
+    parser.add_argument("--config", default="config.json",
+                        help="путь к файлу конфигурации")
+    parser.add_argument("--batch", action="store_true",
+                        help="построить все отчеты в файлы без интерактивного меню")
+    parser.add_argument("--out", default="reports",
+                        help="каталог для файлов отчетов в пакетном режиме")
+    parser.add_argument("--format", dest="formats", default=None,
+                        help="форматы файлов через запятую: png, svg, pdf для matplotlib "
+                             "(по умолчанию png), svg, vega для light (по умолчанию svg)")
+    parser.add_argument("--backend", choices=BACKENDS, default=None,
+                        help="бэкенд визуализации пакетного режима: matplotlib или light "
+                             "(SVG и Vega-Lite без matplotlib, в разы быстрее)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="количество процессов отрисовки (по умолчанию - число ядер)")
+    parser.add_argument("--reports", default=None,
+                        help="отчеты через запятую (номера или имена); из JIRA "
+                             "загружаются только нужные им поля")
+    parser.add_argument("--export", dest="export_path", default=None,
+                        help="загрузить задачи из JIRA и сохранить снимок в файл")
+    parser.add_argument("--import", dest="import_path", default=None,
+                        help="анализировать снимок из файла без обращения к JIRA")
+    parser.add_argument("--compress", action="store_true",
+                        help="сжимать снимок при экспорте (без отображения в память при загрузке)")
+    parser.add_argument("--portfolio", action="store_true",
+                        help="построить отчеты по нескольким проектам (проекты распределяются "
+                             "по процессам) со сводной страницей index.html")
+    parser.add_argument("--projects", default=None,
+                        help="ключи проектов портфеля через запятую (по умолчанию - projects "
+                             "из конфигурации)")
+    parser.add_argument("--compact", action="store_true",
+                        help="уплотнить колоночное хранилище проекта (удалить замененные строки) "
+                             "без обращения к JIRA")
+    parser.add_argument("--serve", action="store_true",
+                        help="запустить локальный HTTP API с данными отчетов")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help="адрес HTTP API")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help="порт HTTP API")
+    return parser.parse_args(argv)
 
-        JIRA_URL = config['jira_url']
-        PROJECT_KEY = config['project_key']
-        MAX_RESULTS = config['max_results']
 
-        # Получение данных из JIRA
-        issues = fetch_jira_issues(JIRA_URL, PROJECT_KEY, MAX_RESULTS)
+def query_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Условия отбора задач из конфигурации
 
-        if not issues:
-            print("Не удалось получить данные. Проверьте настройки и подключение.")
-            return
+    Args:
+        config: Конфигурация приложения
 
-        # Инициализация компонентов
-        processor = DataProcessor(issues)
-        visualizer = JiraVisualizer(PROJECT_KEY)
-        menu_handler = MenuHandler(processor, visualizer)
+    Returns:
+        Именованные аргументы jql, statuses, expand_changelog и fields
+        для функций загрузки
+    """
+    return {'jql': config.get('jql'), 'statuses': config.get('status_filter'),
+            'expand_changelog': config.get('changelog', False),
+            'fields': required_fields(config.get('reports'),
+                                      IssueFilter(**(config.get('issue_filter') or {})))}
 
-        # Основной цикл меню
-        while True:
-            try:
-                display_menu(PROJECT_KEY, len(issues))
-                choice = input("Выберите опцию (0-6): ").strip()
 
-                if not menu_handler.handle_choice(choice):
-                    break
+def project_store(config: Dict[str, Any]) -> ColumnStore:
+    """
+    Колоночное хранилище проекта в каталоге кэша
+
+    Args:
+        config: Конфигурация приложения
+
+    Returns:
+        Хранилище задач
+    """
+    options = query_options(config)
+    return open_column_store(config.get('cache_dir', '.jira_cache'), config['jira_url'],
+                             config['project_key'], options['jql'], options['statuses'],
+                             options['expand_changelog'])
+
+
+def compact_store(config: Dict[str, Any]) -> None:
+    """
+    Уплотнение колоночного хранилища проекта
+
+    Args:
+        config: Конфигурация приложения
+    """
+    store = project_store(config)
+    superseded = store.manifest['superseded_count']
+    store.compact()
+    print(f"Хранилище {store.path}: удалено замененных строк: {superseded}, задач: {len(store)}")
+
+
+def open_issue_cache(config: Dict[str, Any]) -> IssueCache:
+    """
+    Кэш задач проекта в каталоге кэша
+
+    Args:
+        config: Конфигурация приложения
+
+    Returns:
+        Открытый кэш (закрывается вызывающим кодом)
+    """
+    options = query_options(config)
+    return IssueCache(config.get('cache_dir', '.jira_cache'), config['jira_url'], config['project_key'],
+                      cache_query(options['jql'], options['statuses'], options['expand_changelog']))
+
+
+def load_processor(config: Dict[str, Any]) -> DataProcessor:
+    """
+    Загрузка задач проекта и построение процессора данных
+
+    Args:
+        config: Конфигурация приложения
+
+    Returns:
+        Процессор данных
+    """
+    jira_url = config['jira_url']
+    project_key = config['project_key']
+    max_results = config['max_results']
+    max_workers = config.get('max_workers', 4)
+
+    # Получение данных из JIRA (через локальный кэш, если он включен)
+    with JiraClient(jira_url, pool_size=max_workers,
+                    max_retries=config.get('max_retries', 5)) as client:
+        if config.get('use_cache', True) and config.get('column_store', False):
+            # Колонки хранилища отображаются в память, JSON задач не хранится
+            store = project_store(config)
+            sync_column_store(store, jira_url, project_key, max_results, max_workers,
+                              client=client, **query_options(config))
+            table = store.table()
+        elif config.get('use_cache', True):
+            issues = sync_issues(jira_url, project_key, max_results, max_workers,
+                                 config.get('cache_dir', '.jira_cache'), client=client,
+                                 **query_options(config))
+            table = IssueTable.from_issues(issues)
+        else:
+            # Задачи передаются в колоночную таблицу по мере загрузки страниц
+            issues = iter_jira_issues(jira_url, project_key, max_results, max_workers,
+                                      client=client, **query_options(config))
+            table = IssueTable.from_issues(issues)
+
+    return DataProcessor(table, histogram_bins=config.get('histogram_bins', 15),
+                         histogram_log_scale=config.get('histogram_log_scale', False))
+
+
+def make_refresher(config: Dict[str, Any], processor: DataProcessor) -> Optional[Callable[[], int]]:
+    """
+    Функция быстрого обновления: изменения с последней синхронизации
+    загружаются в кэш и применяются к процессору без полной перезагрузки
+
+    Args:
+        config: Конфигурация приложения
+        processor: Процессор данных
+
+    Returns:
+        Функция обновления или None, если кэш отключен
+    """
+    if not config.get('use_cache', True):
+        return None
+
+    if config.get('column_store', False):
+        store = project_store(config)
+
+        def refresh() -> int:
+            delta, removed = sync_column_store(store, config['jira_url'], config['project_key'],
+                                               config['max_results'], config.get('max_workers', 4),
+                                               **query_options(config))
+            if len(delta) or removed:
+                # Таблица заново открывается из хранилища, а не объединяется в памяти;
+                # файлы, отображенные прежней таблицей, удаляются после ее закрытия
+                processor.replace_issues(store.table())
+            return len(delta) + len(removed)
+
+        return refresh
+
+    def refresh() -> int:
+        delta, removed = refresh_issues(config['jira_url'], config['project_key'],
+                                        config['max_results'], config.get('max_workers', 4),
+                                        config.get('cache_dir', '.jira_cache'), **query_options(config))
+        processor.update_issues(delta, removed)
+        return len(delta) + len(removed)
+
+    return refresh
+
+
+def visualizer_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Параметры визуализатора из конфигурации
+
+    Args:
+        config: Конфигурация приложения
+
+    Returns:
+        Именованные аргументы JiraVisualizer
+    """
+    return {
+        'timeline_days': config.get('timeline_days', 90),
+        'rolling_window': config.get('rolling_window', 7),
+        'timeline_period': config.get('timeline_period', 'day')
+    }
+
+
+def open_render_cache(config: Dict[str, Any]) -> Optional[RenderCache]:
+    """
+    Кэш построенных графиков в каталоге кэша
+
+    Args:
+        config: Конфигурация приложения
+
+    Returns:
+        Кэш графиков или None, если он отключен (render_cache_mb = 0)
+    """
+    max_mb = config.get('render_cache_mb', 256)
+    if not max_mb:
+        return None
+    return RenderCache(os.path.join(config.get('cache_dir', '.jira_cache'), 'renders'),
+                       max_bytes=max_mb * 1024 * 1024)
+
 
-                input("\nНажмите Enter для продолжения...")
+def run_menu(processor: DataProcessor, project_key: str,
+             options: Optional[Dict[str, Any]] = None,
+             refresh: Optional[Callable[[], int]] = None,
+             issue_filter: Optional[IssueFilter] = None) -> None:
+    """
+    Интерактивный цикл меню
+
+    Args:
+        processor: Процессор данных
+        project_key: Ключ проекта
+        options: Параметры визуализатора
+        refresh: Функция быстрого обновления данных
+        issue_filter: Условия отбора задач для отчетов
+    """
+    visualizer = JiraVisualizer(project_key, **(options or {}))
+    menu_handler = MenuHandler(processor, visualizer, refresh, issue_filter)
+    hint = f"0-{len(REPORTS)}, r" if refresh else f"0-{len(REPORTS)}"
+
+    while True:
+        try:
+            display_menu(project_key, len(processor), refresh is not None, issue_filter)
+            choice = input(f"Выберите опцию ({hint}): ").strip()
 
-            except KeyboardInterrupt:
-                print("\nПрограмма прервана пользователем.")
+            if not menu_handler.handle_choice(choice):
                 break
-            except DataProcessingError as e:
-                print(f"Ошибка обработки данных: {e}")
-                input("\nНажмите Enter для продолжения...")
-            except Exception as e:
-                print(f"Неожиданная ошибка: {e}")
-                input("\nНажмите Enter для продолжения...")
+
+            input("\nНажмите Enter для продолжения...")
+
+        except KeyboardInterrupt:
+            print("\nПрограмма прервана пользователем.")
+            break
+        except DataProcessingError as e:
+            print(f"Ошибка обработки данных: {e}")
+            input("\nНажмите Enter для продолжения...")
+        except JiraApiError as e:
+            print(f"Ошибка обновления данных: {e}")
+            input("\nНажмите Enter для продолжения...")
+        except Exception as e:
+            print(f"Неожиданная ошибка: {e}")
+            input("\nНажмите Enter для продолжения...")
+
+
+def output_formats(args: argparse.Namespace) -> List[str]:
+    """
+    Форматы файлов отчетов с учетом бэкенда визуализации
+
+    Args:
+        args: Аргументы командной строки
+
+    Returns:
+        Список форматов
+    """
+    formats = args.formats or ('png' if args.backend == 'matplotlib' else 'svg')
+    return [item.strip() for item in formats.split(',') if item.strip()]
+
+
+def run_batch(processor: DataProcessor, project_key: str, args: argparse.Namespace,
+              options: Optional[Dict[str, Any]] = None,
+              issue_filter: Optional[IssueFilter] = None,
+              render_cache: Optional[RenderCache] = None) -> None:
+    """
+    Пакетное построение всех отчетов в файлы
+
+    Args:
+        processor: Процессор данных
+        project_key: Ключ проекта
+        args: Аргументы командной строки
+        options: Параметры визуализатора
+        issue_filter: Условия отбора задач для отчетов
+        render_cache: Кэш построенных графиков
+    """
+    saved_files = render_reports(processor, project_key, args.out, output_formats(args), args.workers,
+                                 report_names=args.reports, visualizer_options=options,
+                                 issue_filter=issue_filter, render_cache=render_cache,
+                                 backend=args.backend)
+    print(f"Сохранено файлов отчетов: {len(saved_files)} (каталог {args.out})")
+    if render_cache is not None and render_cache.hits:
+        print(f"Отчетов из кэша графиков: {render_cache.hits}")
+    for path in saved_files:
+        print(f"  {path}")
+
+
+def project_config(config: Dict[str, Any], spec: Any) -> Dict[str, Any]:
+    """
+    Конфигурация одного проекта портфеля
+
+    Args:
+        config: Конфигурация приложения
+        spec: Ключ проекта или словарь {"key", "jql", "statuses", "jira_url"}
+
+    Returns:
+        Конфигурация с ключом и условиями отбора проекта
+    """
+    if isinstance(spec, str):
+        return dict(config, project_key=spec)
+    overrides = {'project_key': spec['key']}
+    for name, option in (('jql', 'jql'), ('statuses', 'status_filter'), ('jira_url', 'jira_url')):
+        if name in spec:
+            overrides[option] = spec[name]
+    return dict(config, **overrides)
+
+
+def export_portfolio_snapshots(config: Dict[str, Any], projects: List[Any]) -> Dict[str, str]:
+    """
+    Загрузка задач проектов портфеля и сохранение их снимков в каталог кэша
+
+    Изменения всех проектов загружаются одновременно асинхронным движком
+    (общие ограничения max_concurrency и rate_limit), поэтому время загрузки
+    определяется самым медленным проектом, а не суммой. Изменения
+    запрашиваются по всему проекту и отбираются по условию проекта после
+    загрузки (вышедшие из набора задачи удаляются из кэша), затем
+    записываются в кэш каждого проекта. Процессы отрисовки открывают снимки
+    по пути с отображением в память, поэтому задачи не сериализуются при
+    передаче между процессами.
+
+    Args:
+        config: Конфигурация приложения
+        projects: Ключи проектов или словари с условиями отбора
+
+    Returns:
+        Словарь {ключ проекта: путь к снимку}; проекты с ошибкой загрузки пропускаются
+    """
+    use_cache = config.get('use_cache', True)
+    use_store = use_cache and config.get('column_store', False)
+
+    # Отметки синхронизации и поля каждого проекта
+    plans, specs = {}, []
+    for spec in projects:
+        project = project_config(config, spec)
+        options = query_options(project)
+        if use_store:
+            last_sync, fields = prepare_store_sync(project_store(project), options['fields'])
+        elif use_cache:
+            cache = open_issue_cache(project)
+            try:
+                last_sync, fields = prepare_sync(cache, options['fields'])
+            finally:
+                cache.close()
+        else:
+            last_sync, fields = None, options['fields']
+        project_key = project['project_key']
+        plans[project_key] = (project, options, last_sync, fields)
+        spec = {'key': project_key, 'jira_url': project['jira_url'], 'jql': options['jql'],
+                'statuses': options['statuses'], 'expand_changelog': options['expand_changelog'],
+                'fields': fields, 'updated_since': None}
+        if last_sync:
+            # Изменения - по всему проекту, условие отбора применяется после загрузки
+            since = to_jql_date(last_sync)
+            if options['jql']:
+                specs.append(dict(spec, name=f'{project_key}{MATCH_SUFFIX}', fields=['updated'],
+                                  expand_changelog=False, updated_since=since))
+            spec.update(jql=None, statuses=None, fields=delta_fields(fields, options['statuses']),
+                        updated_since=since)
+        specs.append(spec)
+
+    try:
+        fetched = fetch_projects(config['jira_url'], specs, config['max_results'],
+                                 config.get('max_concurrency', 8), config.get('rate_limit', 10.0))
+    except JiraApiError as e:
+        print(f"Ошибка загрузки проектов: {e}")
+        return {}
+
+    snapshot_dir = os.path.join(config.get('cache_dir', '.jira_cache'), 'portfolio')
+    os.makedirs(snapshot_dir, exist_ok=True)
+    snapshots = {}
+    for project_key, (project, options, last_sync, fields) in plans.items():
+        fresh, removed = fetched.get(project_key), []
+        match = fetched.get(f'{project_key}{MATCH_SUFFIX}')
+        if fresh is None or (last_sync and options['jql'] and match is None):
+            # Ошибка загрузки уже выведена
+            continue
+        if last_sync:
+            matching = {issue['key'] for issue in match} if options['jql'] else None
+            fresh = list(select_delta(fresh, options['statuses'], matching, removed))
+        if use_store:
+            store = project_store(project)
+            apply_store_sync(store, fresh, fields, last_sync, removed)
+            table = store.table()
+        elif use_cache:
+            cache = open_issue_cache(project)
+            try:
+                apply_sync(cache, fresh, fields, last_sync, removed)
+                table = IssueTable.from_issues(cache.load_issues())
+            finally:
+                cache.close()
+        else:
+            table = IssueTable.from_issues(fresh)
+        if not len(table):
+            print(f"Проект {project_key}: нет задач, пропущен")
+            continue
+        path = os.path.join(snapshot_dir, f'{project_key}.npz')
+        save_snapshot(table, path)
+        snapshots[project_key] = path
+    return snapshots
+
+
+def run_portfolio(config: Dict[str, Any], args: argparse.Namespace) -> None:
+    """
+    Построение отчетов по портфелю проектов со сводной страницей
+
+    Args:
+        config: Конфигурация приложения
+        args: Аргументы командной строки
+    """
+    if args.projects:
+        projects = [item.strip() for item in args.projects.split(',') if item.strip()]
+    else:
+        projects = config.get('projects') or [config['project_key']]
+    snapshots = export_portfolio_snapshots(config, projects)
+    if not snapshots:
+        print("Не удалось получить данные ни одного проекта.")
+        return
+
+    max_mb = config.get('render_cache_mb', 256)
+    summaries = render_portfolio(
+        snapshots, args.out, output_formats(args), args.workers,
+        report_names=args.reports, visualizer_options=visualizer_options(config),
+        issue_filter=IssueFilter(**(config.get('issue_filter') or {})), backend=args.backend,
+        histogram_bins=config.get('histogram_bins', 15),
+        histogram_log_scale=config.get('histogram_log_scale', False),
+        # Отдельный корень: кэш графиков одного проекта (renders) не видит каталоги портфеля
+        render_cache_dir=(os.path.join(config.get('cache_dir', '.jira_cache'), 'portfolio_renders')
+                          if max_mb else None),
+        # Общее ограничение кэша графиков делится между проектами
+        render_cache_bytes=max_mb * 1024 * 1024 // len(snapshots)
+    )
+    for summary in summaries:
+        if summary['error']:
+            print(f"  {summary['project_key']:<12} ошибка: {summary['error']}")
+        else:
+            print(f"  {summary['project_key']:<12} задач: {summary['issue_count']:>7}  "
+                  f"файлов: {len(summary['files']):>3}  {summary['seconds']:.1f} с")
+    print(f"Сводка портфеля: {os.path.join(args.out, INDEX_NAME)}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Основная функция приложения
+
+    Args:
+        argv: Аргументы командной строки (по умолчанию sys.argv)
+    """
+    args = parse_args(argv)
+    try:
+        # Загрузка конфигурации
+        config = load_configuration(args.config)
+        if args.reports:
+            config['reports'] = [item.strip() for item in args.reports.split(',') if item.strip()]
+        args.reports = config.get('reports')
+        args.backend = args.backend or config.get('backend', 'matplotlib')
+        if args.portfolio:
+            run_portfolio(config, args)
+            return
+        if args.compact:
+            compact_store(config)
+            return
+        project_key = config['project_key']
+
+        if args.import_path:
+            processor = DataProcessor(args.import_path,
+                                      histogram_bins=config.get('histogram_bins', 15),
+                                      histogram_log_scale=config.get('histogram_log_scale', False))
+        else:
+            processor = load_processor(config)
+        if not len(processor):
+            print("Не удалось получить данные. Проверьте настройки и подключение.")
+            return
+
+        if args.export_path:
+            save_snapshot(processor.table, args.export_path, compress=args.compress)
+            print(f"Снимок {len(processor)} задач сохранен в {args.export_path}")
+            return
+
+        options = visualizer_options(config)
+        issue_filter = IssueFilter(**(config.get('issue_filter') or {}))
+        # Снимок не обновляется из JIRA
+        refresh = None if args.import_path else make_refresher(config, processor)
+        if args.serve:
+            serve(processor, project_key, args.host, args.port, options, refresh,
+                  open_render_cache(config))
+        elif args.batch:
+            run_batch(processor, project_key, args, options, issue_filter, open_render_cache(config))
+        else:
+            run_menu(processor, project_key, options, refresh, issue_filter)
 
     except ConfigError as e:
         print(f"Ошибка конфигурации: {e}")
     except JiraApiError as e:
         print(f"Ошибка JIRA API: {e}")
+    except DataProcessingError as e:
+        print(f"Ошибка обработки данных: {e}")
+    except VisualizationError as e:
+        print(f"Ошибка визуализации: {e}")
     except Exception as e:
         print(f"Критическая ошибка: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
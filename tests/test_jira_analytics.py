@@ -1,18 +1,44 @@
 import unittest
 import json
 import tempfile
+import shutil
 import os
 import sys
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
 from unittest.mock import patch, MagicMock
 
+import numpy as np
+
 # Добавляем родительскую директорию в путь для импорта модулей
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 # Импортируем из отдельных модулей
 from jira_analytics.config import load_configuration, validate_config, DEFAULT_CONFIG
-from jira_analytics.exceptions import ConfigError, JiraApiError
-from jira_analytics.jira_client import fetch_jira_issues, calculate_resolution_days
+from jira_analytics.exceptions import ConfigError, JiraApiError, DataProcessingError
+from jira_analytics.jira_client import (JiraClient, fetch_jira_issues, calculate_resolution_days,
+                                        build_search_params, SEARCH_FIELDS)
 from jira_analytics.data_processor import DataProcessor
+from jira_analytics.issue_table import IssueTable, MISSING
+from jira_analytics.histograms import compute_histogram
+from jira_analytics.timeline import Timeline, rolling_mean, timeline_arguments, to_epoch_day
+from jira_analytics.flow_metrics import FlowMetrics, QuantileSketch
+from jira_analytics.survival import kaplan_meier
+from jira_analytics.time_in_status import dwell_by_status
+from jira_analytics.index import IssueFilter
+from jira_analytics.dates import parse_jira_timestamps
+from jira_analytics.streaming import SearchResponseStream, build_projection, project_issue
+from jira_analytics.cache import IssueCache, sync_issues, refresh_issues
+from jira_analytics.async_fetch import fetch_projects
+from jira_analytics.batch import render_reports
+from jira_analytics.reports import get_report, required_fields
+from jira_analytics.snapshot import save_snapshot, load_snapshot
+from jira_analytics.column_store import (ColumnStore, ISSUE_COLUMNS, TRANSITION_COLUMNS,
+                                         open_column_store, sync_column_store)
+from jira_analytics.server import AnalyticsService, create_server
+from jira_analytics.render_cache import RenderCache, render_key
+from jira_analytics.portfolio import render_portfolio
 
 
 class TestJiraAnalyticsKeyFunctions(unittest.TestCase):
@@ -138,15 +164,36 @@ class TestJiraAnalyticsKeyFunctions(unittest.TestCase):
         # При ошибке парсинга должна возвращаться 0
         self.assertEqual(days, 0)
 
-    @patch('jira_analytics.jira_client.requests.get')
+    def test_16_parse_jira_timestamps_with_offset(self):
+        """16. Тест пакетного разбора дат с учетом часового пояса"""
+        timestamps = parse_jira_timestamps([
+            '2024-01-01T03:00:00.000+0300',
+            '2024-01-01T00:00:00.000',
+            '2024-01-01T00:00:00Z',
+            '2024-02-30T00:00:00.000+0000',
+            None
+        ])
+
+        self.assertEqual(timestamps[0], 1704067200.0)
+        self.assertEqual(timestamps[1], 1704067200.0)
+        self.assertEqual(timestamps[2], 1704067200.0)
+        self.assertTrue(all(value != value for value in timestamps[3:]))
+
+        # Разница с учетом смещения: 23:00 UTC-0100 наступает на следующий день по UTC
+        days = calculate_resolution_days('2024-01-01T10:00:00.000+0000',
+                                         '2024-01-02T09:30:00.000-0100')
+        self.assertEqual(days, 1)
+
+    @patch('jira_analytics.jira_client.requests.Session.get')
     def test_8_fetch_jira_issues_success(self, mock_get):
         """8. Тест успешного получения задач из JIRA API"""
         # Настраиваем мок ответа от API
         mock_response = MagicMock()
-        mock_response.json.return_value = {
+        mock_response.iter_content.return_value = [json.dumps({
             'total': 2,
             'issues': self.test_issues
-        }
+        }).encode('utf-8')]
+        mock_response.status_code = 200
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
@@ -157,7 +204,7 @@ class TestJiraAnalyticsKeyFunctions(unittest.TestCase):
         self.assertEqual(len(issues), 2)
         mock_get.assert_called_once()
 
-    @patch('jira_analytics.jira_client.requests.get')
+    @patch('jira_analytics.jira_client.requests.Session.get')
     def test_9_fetch_jira_issues_timeout(self, mock_get):
         """9. Тест обработки таймаута при запросе к JIRA"""
         # Симулируем таймаут
@@ -184,6 +231,1130 @@ class TestJiraAnalyticsKeyFunctions(unittest.TestCase):
         self.assertEqual(priority_dist['High'], 1)
         self.assertEqual(priority_dist['Medium'], 1)
 
+    def test_15_issue_table_columns(self):
+        """15. Тест колоночного представления задач"""
+        table = IssueTable.from_issues(self.test_issues)
+
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.resolution_days.tolist(), [4, 8])
+        self.assertEqual(table.labels('status'), ['Closed', 'Resolved'])
+        # Исполнитель и автор кодируются общим словарем пользователей
+        self.assertEqual(table.labels('assignee'), table.labels('reporter'))
+        self.assertEqual(table.codes['assignee'][1], MISSING)
+        self.assertEqual(table.count_codes('reporter').tolist(), [0, 2])
+
+        processor = DataProcessor(table)
+        self.assertEqual(processor.get_resolution_times_by_status(),
+                         {'Closed': [4], 'Resolved': [8]})
+        self.assertEqual(processor.get_time_spent_data(), [1.0, 8.0])
+
+        # Совместимость: задачи восстанавливаются из таблицы
+        restored = processor.issues
+        self.assertEqual(restored[0]['fields']['created'], '2024-01-01T10:00:00.000+0000')
+        self.assertIsNone(restored[1]['fields']['assignee'])
+        self.assertEqual(IssueTable.from_issues(restored).resolution_days.tolist(), [4, 8])
+
+    def test_23_report_bundle_single_pass(self):
+        """23. Тест набора агрегатов всех отчетов"""
+        processor = DataProcessor(self.test_issues)
+        bundle = processor.get_report_bundle()
+
+        self.assertIs(processor.get_report_bundle(0, 3650), bundle)
+        self.assertIs(processor.get_user_stats(), bundle.user_stats)
+        self.assertEqual(bundle.issue_count, 2)
+        self.assertEqual(bundle.resolution_times.tolist(), [4, 8])
+        self.assertEqual(sum(bundle.created_dates.values()), 2)
+        self.assertEqual(sum(bundle.closed_dates.values()), 2)
+        self.assertEqual(bundle.priority_distribution, {'High': 1, 'Medium': 1})
+
+    def test_17_memoized_reports_invalidated_on_update(self):
+        """17. Тест кэширования отчетов и сброса кэша при обновлении задач"""
+        issues = [dict(issue, key=f'TEST-{i}') for i, issue in enumerate(self.test_issues)]
+        processor = DataProcessor(issues)
+
+        times = processor.get_resolution_times()
+        self.assertIs(processor.get_resolution_times(0, 3650), times)
+        self.assertIsNot(processor.get_resolution_times(5), times)
+
+        processor.update_issues([
+            {'key': 'TEST-1', 'fields': {
+                'created': '2024-01-02T09:00:00.000+0000',
+                'resolutiondate': '2024-01-04T09:00:00.000+0000',
+                'status': {'name': 'Done'},
+                'assignee': {'displayName': 'Jane Smith'},
+                'priority': {'name': 'Low'}
+            }},
+            {'key': 'TEST-2', 'fields': {'created': '2024-01-03T09:00:00.000+0000'}}
+        ])
+
+        self.assertEqual(processor.version, 1)
+        self.assertEqual(len(processor), 3)
+        self.assertEqual(processor.get_resolution_times(), [4, 2])
+        self.assertEqual(processor.get_user_stats(), {'John Doe': 1, 'Jane Smith': 2})
+        self.assertEqual(processor.get_priority_distribution(),
+                         {'High': 1, 'Low': 1, 'Без приоритета': 1})
+
+    def test_24_prebinned_histograms(self):
+        """24. Тест предварительного расчета гистограмм"""
+        histogram = compute_histogram([0, 1, 3, 9, 99], bins=[0, 2, 10, 100])
+        self.assertEqual(histogram.counts.tolist(), [2, 2, 1])
+        self.assertEqual(histogram.total, 5)
+
+        log_histogram = compute_histogram([0, 1, 10, 100, 1000], bins=3, log_scale=True)
+        self.assertTrue(log_histogram.log_scale)
+        self.assertAlmostEqual(log_histogram.edges[0], 0.0)
+        self.assertAlmostEqual(log_histogram.edges[-1], 1000.0)
+        self.assertEqual(log_histogram.total, 5)
+
+        processor = DataProcessor(self.test_issues, histogram_bins=[0, 5, 10])
+        bundle = processor.get_report_bundle()
+        self.assertEqual(bundle.resolution_histogram.counts.tolist(), [1, 1])
+        self.assertEqual(bundle.status_histograms['Resolved'].total, 1)
+        self.assertEqual(bundle.resolution_histogram,
+                         compute_histogram(processor.get_resolution_times(), [0, 5, 10]))
+
+    def test_25_dense_timeline(self):
+        """25. Тест плотного дневного ряда, скользящего среднего и агрегации"""
+        from datetime import date
+
+        self.assertEqual(rolling_mean([3, 0, 3, 6], 3).tolist(), [1.5, 2.0, 3.0, 4.5])
+
+        monday = to_epoch_day(date(2024, 1, 29))
+        timeline = Timeline.from_days(np.array([monday, monday + 1, monday + 7]),
+                                      np.array([monday + 3]))
+        self.assertEqual(timeline.created.tolist(), [1, 1, 0, 0, 0, 0, 0, 1])
+
+        window = timeline.window(date(2024, 1, 27), date(2024, 1, 31))
+        self.assertEqual(window.created.tolist(), [0, 0, 1, 1, 0])
+        self.assertEqual(window.active_periods, 2)
+
+        weekly = timeline.resample('week')
+        self.assertEqual(weekly.dates, [date(2024, 1, 29), date(2024, 2, 5)])
+        self.assertEqual(weekly.created.tolist(), [2, 1])
+        self.assertEqual(weekly.closed.tolist(), [1, 0])
+
+        bundle = DataProcessor(self.test_issues).get_report_bundle()
+        self.assertEqual(bundle.timeline.as_dicts(), (bundle.created_dates, bundle.closed_dates))
+
+        # Прежняя форма вызова графика со словарями количеств по датам
+        from jira_analytics.light_visualizer import LightweightVisualizer
+        rebuilt, issues_count = timeline_arguments(*timeline.as_dicts(), 3)
+        self.assertEqual((rebuilt.starts.tolist(), rebuilt.created.tolist(), rebuilt.closed.tolist()),
+                         (timeline.starts.tolist(), timeline.created.tolist(), timeline.closed.tolist()))
+        self.assertEqual(issues_count, 3)
+        today = to_epoch_day(date.today())
+        recent = Timeline.from_days(np.array([today - 2, today - 1, today - 1]), np.array([today]))
+        charts = []
+        with tempfile.TemporaryDirectory() as output_dir:
+            visualizer = LightweightVisualizer('TEST', output_dir, formats=('vega',))
+            for args in ((recent, 3), (*recent.as_dicts(), 3)):
+                visualizer.plot_created_vs_closed_timeline(*args)
+                with open(visualizer.saved_files[-1], encoding='utf-8') as file:
+                    charts.append(json.load(file))
+        self.assertEqual(charts[0], charts[1])
+
+    def test_26_flow_metrics_incremental(self):
+        """26. Тест инкрементального обновления метрик потока"""
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        sketch.add(np.arange(1, 1001))
+        self.assertAlmostEqual(sketch.quantile(0.5), 500.5, delta=500.5 * 0.01)
+        sketch.remove(np.arange(501, 1001))
+        self.assertAlmostEqual(sketch.quantile(0.95), 475.05, delta=475.05 * 0.01)
+
+        issues = [dict(issue, key=f'TEST-{i}') for i, issue in enumerate(self.test_issues)]
+        processor = DataProcessor(issues)
+        flow = processor.get_flow_metrics()
+        self.assertEqual(flow.backlog()[-1], 0)
+        self.assertEqual(flow.throughput('week').closed.sum(), 2)
+
+        update = [
+            {'key': 'TEST-1', 'fields': {
+                'created': '2024-01-02T09:00:00.000+0000',
+                'resolutiondate': '2024-01-04T09:00:00.000+0000'
+            }},
+            {'key': 'TEST-2', 'fields': {'created': '2024-02-01T09:00:00.000+0000'}}
+        ]
+        processor.update_issues(update)
+        self.assertIs(processor.get_flow_metrics(), flow)
+
+        rebuilt = FlowMetrics.from_table(processor.table)
+        self.assertEqual(flow.first_day, rebuilt.first_day)
+        self.assertEqual(flow.backlog().tolist(), rebuilt.backlog().tolist())
+        self.assertEqual(flow.backlog()[-1], 1)
+        self.assertEqual(flow.lead_times.bins, rebuilt.lead_times.bins)
+        self.assertEqual(flow.lead_time_percentiles(), rebuilt.lead_time_percentiles())
+
+    def test_27_open_issue_ages_and_survival(self):
+        """27. Тест возраста открытых задач и кривой дожития"""
+        times, survival = kaplan_meier(np.array([1, 2, 2, 3, 5]),
+                                       np.array([True, True, False, True, False]))
+        self.assertEqual(times.tolist(), [1, 2, 3])
+        np.testing.assert_allclose(survival, [0.8, 0.6, 0.3])
+
+        issues = self.test_issues + [
+            {'key': 'TEST-3', 'fields': {'created': '2024-01-01T00:00:00.000+0000',
+                                         'status': {'name': 'Open'}}}
+        ]
+        reference = parse_jira_timestamps(['2024-01-11T12:00:00.000+0000'])[0]
+        report = DataProcessor(issues).get_age_report(reference)
+        self.assertEqual(report.open_ages.tolist(), [10])
+        self.assertEqual(report.open_count, 1)
+        self.assertEqual(report.closed_count, 2)
+        self.assertEqual(report.survival_times.tolist(), [4, 8])
+        self.assertEqual(report.age_percentiles[0.5], 10.0)
+
+    def test_29_time_in_status_from_changelog(self):
+        """29. Тест расчета времени в статусах по журналу изменений"""
+        def history(created, from_status, to_status):
+            return {'created': created, 'items': [
+                {'field': 'assignee', 'fromString': None, 'toString': 'John Doe'},
+                {'field': 'status', 'fromString': from_status, 'toString': to_status}
+            ]}
+
+        raw_issue = {
+            'key': 'TEST-1',
+            'fields': dict(self.test_issues[0]['fields']),
+            'changelog': {'total': 3, 'histories': [
+                history('2024-01-02T10:00:00.000+0000', 'Open', 'In Progress'),
+                history('2024-01-03T10:00:00.000+0000', 'In Progress', 'Open')
+            ]}
+        }
+        issue = project_issue(raw_issue)
+        self.assertEqual(issue['changelog']['received'], 2)
+        self.assertEqual(issue['changelog']['transitions'][0],
+                         ['2024-01-02T10:00:00.000+0000', 'Open', 'In Progress'])
+
+        client = JiraClient('https://test-jira.example.com')
+        with patch.object(client, 'get_json', return_value={'values': [
+                history('2024-01-05T10:00:00.000+0000', 'Open', 'Closed')]}) as mock_get_json:
+            client.complete_changelog(issue)
+        client.close()
+        self.assertEqual(mock_get_json.call_args.args[1]['startAt'], 2)
+        self.assertEqual(len(issue['changelog']['transitions']), 3)
+
+        table = IssueTable.from_issues([issue, dict(self.test_issues[1], key='TEST-2')])
+        self.assertEqual(len(table.transitions), 3)
+        dwell = dwell_by_status(table)
+        # Open: 2024-01-01 10:00 -> 01-02 10:00 и 01-03 10:00 -> 01-05 10:00
+        self.assertEqual(dwell['Open'].tolist(), [3.0])
+        self.assertEqual(dwell['In Progress'].tolist(), [1.0])
+        self.assertNotIn('Closed', dwell)
+
+        processor = DataProcessor(table)
+        self.assertEqual(processor.get_resolution_times_by_status(),
+                         {'Open': [3.0], 'In Progress': [1.0]})
+
+        processor.update_issues([{'key': 'TEST-2', 'fields': self.test_issues[1]['fields'],
+                                  'changelog': {'total': 1, 'received': 1, 'transitions': [
+                                      ['2024-01-10T09:00:00.000+0000', 'Review', 'Resolved']]}}])
+        self.assertEqual(processor.table.transitions.rows.tolist(), [0, 0, 0, 1])
+        self.assertEqual(dwell_by_status(processor.table.take(np.array([1])))['Review'].tolist(), [8.0])
+
+    def test_33_issue_filter(self):
+        """33. Тест отбора задач через индексы"""
+        def issue(key, created, priority, assignee):
+            return {'key': key, 'fields': {
+                'created': created, 'resolutiondate': None, 'status': {'name': 'Open'},
+                'priority': {'name': priority} if priority else None,
+                'assignee': {'displayName': assignee} if assignee else None,
+                'reporter': None, 'timespent': None}}
+
+        processor = DataProcessor([
+            issue('TEST-1', '2024-06-30T23:00:00.000+0000', 'Major', 'John Doe'),
+            issue('TEST-2', '2024-07-01T00:00:00.000+0000', 'Major', 'John Doe'),
+            issue('TEST-3', '2024-09-30T12:00:00.000+0000', 'Minor', 'John Doe'),
+            issue('TEST-4', '2024-08-15T12:00:00.000+0000', 'Major', None),
+            issue('TEST-5', None, 'Major', 'John Doe'),
+            issue('TEST-6', '2024-10-01T00:00:00.000+0000', None, 'Jane Doe')
+        ])
+        q3 = IssueFilter(created_from='2024-07-01', created_to='2024-10-01')
+        self.assertEqual(processor.get_index().select(q3).tolist(), [1, 2, 3])
+        major = IssueFilter(created_from='2024-07-01', created_to='2024-10-01',
+                            priority='Major', assignee=['John Doe'])
+        self.assertEqual(processor.get_index().select(major).tolist(), [1])
+        self.assertEqual(processor.get_index().select(IssueFilter(priority='Major')).tolist(),
+                         [0, 1, 3, 4])
+        self.assertEqual(len(processor.get_index().select(IssueFilter(assignee='Nobody'))), 0)
+
+        self.assertEqual(processor.get_priority_distribution(issue_filter=q3),
+                         {'Major': 2, 'Minor': 1})
+        self.assertEqual(processor.get_user_stats(issue_filter=major), {'John Doe': 1})
+        self.assertEqual(processor.get_flow_metrics(major).issue_count, 1)
+        self.assertEqual(processor.get_age_report(issue_filter=major).open_count, 1)
+        # Одинаковые условия разделяют результат в кэше отчетов
+        self.assertIs(processor.get_report_bundle(issue_filter=q3),
+                      processor.get_report_bundle(issue_filter=IssueFilter(
+                          created_to='2024-10-01', created_from='2024-07-01')))
+        self.assertIs(processor.select(IssueFilter()), processor.table)
+
+
+class TestStreamingIngestion(unittest.TestCase):
+    """Тесты потокового разбора ответов поиска"""
+
+    def test_18_stream_items_across_chunks(self):
+        """18. Тест разбора задач, разрезанных на мелкие фрагменты"""
+        issues = [
+            {'key': f'TEST-{i}', 'fields': {
+                'summary': 'Задача с длинным описанием',
+                'created': '2024-01-01T10:00:00.000+0000',
+                'assignee': {'displayName': 'Иван', 'avatarUrls': {'48x48': 'http://a'}}
+            }}
+            for i in range(5)
+        ]
+        body = json.dumps({'expand': 'schema,names', 'startAt': 0, 'maxResults': 50,
+                           'total': 5, 'issues': issues}, ensure_ascii=False).encode('utf-8')
+        chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+
+        stream = SearchResponseStream(chunks)
+        parsed = [project_issue(issue) for issue in stream]
+
+        self.assertEqual(stream.header['total'], 5)
+        self.assertEqual([issue['key'] for issue in parsed], [f'TEST-{i}' for i in range(5)])
+        self.assertNotIn('summary', parsed[0]['fields'])
+        self.assertEqual(parsed[0]['fields']['assignee'], {'displayName': 'Иван'})
+
+    def test_39_stream_large_items_with_escapes(self):
+        """39. Тест разбора больших задач со скобками и кавычками в строках"""
+        history = {'created': '2024-01-02T10:00:00.000+0000',
+                   'items': [{'field': 'status', 'fromString': 'Open "}]{', 'toString': 'Done\\'}]}
+        issues = [{'key': 'TEST-1', 'changelog': {'total': 300, 'histories': [history] * 300}},
+                  {'key': 'TEST-2 ]}'}]
+        body = json.dumps({'total': 2, 'issues': issues}).encode('utf-8')
+        chunks = [body[i:i + 3] for i in range(0, len(body), 3)]
+
+        with patch.object(json.JSONDecoder, 'raw_decode', autospec=True,
+                          side_effect=json.JSONDecoder.raw_decode) as raw_decode:
+            parsed = list(SearchResponseStream(chunks))
+
+        self.assertEqual(parsed, issues)
+        # Каждая задача декодируется один раз, независимо от числа фрагментов
+        # (еще один вызов - разбор поля total заголовка)
+        self.assertEqual(raw_decode.call_count, len(issues) + 1)
+
+    def test_19_stream_truncated_response(self):
+        """19. Тест ошибки разбора обрезанного ответа"""
+        stream = SearchResponseStream([b'{"total": 2, "issues": [{"key": "A"}, {"key"'])
+        with self.assertRaises(json.JSONDecodeError):
+            list(stream)
+
+
+class TestBatchReports(unittest.TestCase):
+    """Тесты пакетного построения отчетов"""
+
+    def test_21_render_all_reports_to_files(self):
+        """21. Тест построения всех отчетов в файлы в пуле процессов"""
+        issues = [
+            {'key': 'TEST-1', 'fields': {
+                'created': '2024-01-01T10:00:00.000+0000',
+                'resolutiondate': '2024-01-05T14:30:00.000+0000',
+                'status': {'name': 'Closed'},
+                'assignee': {'displayName': 'John Doe'},
+                'priority': {'name': 'High'}
+            }}
+        ]
+        with tempfile.TemporaryDirectory() as output_dir:
+            saved_files = render_reports(DataProcessor(issues), 'TEST', output_dir,
+                                         formats=('png', 'svg'), max_workers=2)
+
+            self.assertIn(os.path.join(output_dir, 'TEST_open_time.svg'), saved_files)
+            self.assertIn(os.path.join(output_dir, 'TEST_time_by_status_Closed.png'), saved_files)
+            self.assertEqual(len(saved_files), 20)
+            for path in saved_files:
+                self.assertGreater(os.path.getsize(path), 0)
+
+
+    def test_36_render_cache(self):
+        """36. Тест кэша графиков: повторная пакетная отрисовка и вытеснение"""
+        issues = [
+            {'key': 'TEST-1', 'fields': {
+                'created': '2024-01-01T10:00:00.000+0000',
+                'resolutiondate': '2024-01-05T14:30:00.000+0000',
+                'status': {'name': 'Closed'},
+                'priority': {'name': 'High'}
+            }}
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = RenderCache(os.path.join(temp_dir, 'renders'))
+            output_dir = os.path.join(temp_dir, 'out')
+            names = ['open_time', 'time_by_status', 'priority']
+            first = render_reports(DataProcessor(issues), 'TEST', output_dir, max_workers=1,
+                                   report_names=names, render_cache=cache)
+            self.assertEqual((len(cache), cache.hits), (3, 0))
+            with open(first[0], 'rb') as file:
+                content = file.read()
+
+            # Тот же набор задач в новом процессоре: отрисовка не запускается
+            with patch('jira_analytics.batch.ProcessPoolExecutor') as mock_executor:
+                shutil.rmtree(output_dir)
+                second = render_reports(DataProcessor(issues), 'TEST', output_dir,
+                                        report_names=names, render_cache=RenderCache(cache.path))
+            mock_executor.assert_not_called()
+            self.assertEqual(second, first)
+            with open(second[0], 'rb') as file:
+                self.assertEqual(file.read(), content)
+
+            # Другие параметры и данные дают другой ключ
+            processor = DataProcessor(issues)
+            report = get_report('priority')
+            key = render_key(processor, report, 'TEST', ('png',))
+            self.assertNotEqual(key, render_key(processor, report, 'TEST', ('svg',)))
+            self.assertNotEqual(key, render_key(processor, report, 'TEST', ('png',), {'rolling_window': 3}))
+            processor.update_issues([dict(issues[0], key='TEST-2')])
+            self.assertNotEqual(key, render_key(processor, report, 'TEST', ('png',)))
+
+            # Вытеснение давно не использованных записей по размеру
+            small = RenderCache(os.path.join(temp_dir, 'small'), max_bytes=250)
+            for name in ('a', 'b', 'c'):
+                small.put(name * 64, {f'{name}.png': b'x' * 100})
+            self.assertEqual(sorted(small._entries), ['b' * 64, 'c' * 64])
+            self.assertIsNotNone(small.get('b' * 64))
+            small.put('d' * 64, {'d.png': b'x' * 100})
+            self.assertEqual(list(RenderCache(small.path, max_bytes=250)._entries), ['b' * 64, 'd' * 64])
+            self.assertIsNone(small.get('a' * 64))
+
+            # Чужие каталоги в корне кэша (например, кэш проекта портфеля) не удаляются,
+            # недописанные записи прерванного запуска убираются
+            os.makedirs(os.path.join(small.path, 'KAFKA', 'aa'))
+            os.makedirs(os.path.join(small.path, f"{'e' * 64}.tmp-1"))
+            reopened = RenderCache(small.path, max_bytes=250)
+            self.assertEqual(sorted(reopened._entries), ['b' * 64, 'd' * 64])
+            self.assertTrue(os.path.isdir(os.path.join(small.path, 'KAFKA', 'aa')))
+            self.assertFalse(os.path.exists(os.path.join(small.path, f"{'e' * 64}.tmp-1")))
+
+    def test_37_light_backend(self):
+        """37. Тест облегченного бэкенда: SVG и Vega-Lite без matplotlib"""
+        import xml.etree.ElementTree as ElementTree
+        from jira_analytics.exceptions import VisualizationError
+        from jira_analytics.light_visualizer import LightweightVisualizer
+        from jira_analytics.visualizer import create_visualizer
+
+        issues = [
+            {'key': f'TEST-{index}', 'fields': {
+                'created': f'2024-01-{index:02d}T10:00:00.000+0000',
+                'resolutiondate': f'2024-02-{index:02d}T10:00:00.000+0000' if index % 3 else None,
+                'status': {'name': 'Closed' if index % 3 else 'Open'},
+                'assignee': {'displayName': f'User {index % 4}'},
+                'priority': {'name': 'High' if index % 2 else 'Low'},
+                'timespent': index * 3600
+            }}
+            for index in range(1, 21)
+        ]
+        with tempfile.TemporaryDirectory() as output_dir:
+            with patch('jira_analytics.batch.ProcessPoolExecutor') as mock_executor:
+                saved_files = render_reports(DataProcessor(issues), 'TEST', output_dir,
+                                             formats=('svg', 'vega'), backend='light')
+            mock_executor.assert_not_called()
+            names = {os.path.basename(path) for path in saved_files}
+            self.assertIn('TEST_open_age.svg', names)
+            self.assertIn('TEST_time_by_status_Closed.vl.json', names)
+            self.assertEqual(len(saved_files), 20)
+
+            with open(os.path.join(output_dir, 'TEST_priority.svg'), 'r', encoding='utf-8') as file:
+                root = ElementTree.fromstring(file.read())
+            texts = [element.text for element in root.iter('{http://www.w3.org/2000/svg}text')]
+            self.assertIn('High (50.0%)', texts)
+            with open(os.path.join(output_dir, 'TEST_open_age.vl.json'), 'r', encoding='utf-8') as file:
+                spec = json.load(file)
+            self.assertTrue(spec['$schema'].endswith('vega-lite/v5.json'))
+            self.assertEqual(len(spec['hconcat']), 2)
+            with open(os.path.join(output_dir, 'TEST_top_users.vl.json'), 'r', encoding='utf-8') as file:
+                layer = json.load(file)['layer'][0]
+            self.assertEqual([row['y'] for row in layer['data']['values']], [5.0, 5.0, 5.0, 5.0])
+
+            with self.assertRaises(VisualizationError):
+                LightweightVisualizer('TEST', output_dir, formats=('png',))
+            with self.assertRaises(VisualizationError):
+                create_visualizer('TEST', 'unknown')
+
+    def test_38_portfolio(self):
+        """38. Тест отчетов по портфелю проектов со сводной страницей"""
+        from benchmarks.synthetic import generate_issues
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            snapshots = {}
+            for project_key, count in (('SMALL', 30), ('LARGE', 120)):
+                path = os.path.join(temp_dir, f'{project_key}.npz')
+                save_snapshot(IssueTable.from_issues(generate_issues(count, project_key, seed=1)), path)
+                snapshots[project_key] = path
+            snapshots['BROKEN'] = os.path.join(temp_dir, 'missing.npz')
+
+            output_dir = os.path.join(temp_dir, 'portfolio')
+            summaries = render_portfolio(snapshots, output_dir, formats=('svg',), max_workers=2,
+                                         report_names=['backlog', 'priority'], backend='light',
+                                         render_cache_dir=os.path.join(temp_dir, 'renders'),
+                                         render_cache_bytes=10 ** 7)
+
+            self.assertEqual([summary['project_key'] for summary in summaries], ['SMALL', 'LARGE', 'BROKEN'])
+            self.assertEqual([summary['issue_count'] for summary in summaries[:2]], [30, 120])
+            self.assertIn('missing.npz', summaries[2]['error'])
+            self.assertEqual(summaries[1]['files'], [os.path.join(output_dir, 'LARGE', 'LARGE_backlog.svg'),
+                                                     os.path.join(output_dir, 'LARGE', 'LARGE_priority.svg')])
+            with open(os.path.join(output_dir, 'index.html'), 'r', encoding='utf-8') as file:
+                page = file.read()
+            self.assertIn('<img src="LARGE/LARGE_backlog.svg"', page)
+            self.assertIn('<td>120</td>', page)
+
+            # Повторный запуск берет графики из кэша проектов
+            summaries = render_portfolio(snapshots, output_dir, formats=('svg',), max_workers=2,
+                                         report_names=['backlog', 'priority'], backend='light',
+                                         render_cache_dir=os.path.join(temp_dir, 'renders'),
+                                         render_cache_bytes=10 ** 7)
+            self.assertEqual([summary['cached'] for summary in summaries[:2]], [2, 2])
+
+class TestBenchmarks(unittest.TestCase):
+    """Тесты генератора синтетических данных и бенчмарка"""
+
+    def test_22_benchmark_emits_json(self):
+        """22. Тест прогона бенчмарка на небольшом синтетическом наборе"""
+        from benchmarks.synthetic import generate_issues
+        from benchmarks.run_benchmarks import main as run_benchmarks
+
+        issues = generate_issues(50, seed=1)
+        self.assertEqual(len({issue['key'] for issue in issues}), 50)
+        self.assertEqual(len(DataProcessor(issues)), 50)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, 'bench.json')
+            run_benchmarks(['--sizes', '200', '--skip-render', '--output', output])
+            with open(output, 'r', encoding='utf-8') as file:
+                report = json.load(file)
+
+        stages = {item['stage'] for item in report['results']}
+        self.assertIn('json_decode', stages)
+        self.assertIn('processor.get_user_stats', stages)
+        self.assertTrue(all(item['peak_mb'] is not None for item in report['results']))
+
+    def test_34_lazy_imports(self):
+        """34. Тест отложенной загрузки тяжелых зависимостей"""
+        import jira_analytics
+        from benchmarks.startup import main as run_startup
+
+        self.assertIs(jira_analytics.DataProcessor, DataProcessor)
+        self.assertIn('IssueFilter', dir(jira_analytics))
+        with self.assertRaises(AttributeError):
+            jira_analytics.missing_name
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, 'startup.json')
+            run_startup(['--repeat', '1', '--entries', 'jira_analytics,config,data_processor,visualizer',
+                         '--output', output])
+            with open(output, 'r', encoding='utf-8') as file:
+                report = json.load(file)
+
+        loaded = {item['entry']: item['loaded'] for item in report['results']}
+        self.assertEqual(loaded['jira_analytics'], [])
+        # Чтение конфигурации не загружает NumPy и другие тяжелые модули
+        self.assertEqual(loaded['config'], [])
+        for entry in ('data_processor', 'visualizer'):
+            self.assertNotIn('matplotlib', loaded[entry])
+            self.assertNotIn('requests', loaded[entry])
+
+
+class StubJiraHandler(BaseHTTPRequestHandler):
+    """Заглушка метода поиска JIRA с ограничением размера страницы"""
+
+    total = 23
+    page_cap = 5
+    throttled = 0
+
+    def do_GET(self):
+        if StubJiraHandler.throttled > 0:
+            StubJiraHandler.throttled -= 1
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        project = query['jql'][0].split(' ')[0].split('=')[1]
+        start_at = int(query.get('startAt', ['0'])[0])
+        max_results = min(int(query.get('maxResults', ['50'])[0]), self.page_cap)
+        keys = range(start_at, min(start_at + max_results, self.total))
+        body = json.dumps({
+            'startAt': start_at,
+            'maxResults': max_results,
+            'total': self.total,
+            'issues': [{'key': f'{project}-{i}', 'fields': {'status': {'name': 'Closed'}}} for i in keys]
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestPaginatedFetch(unittest.TestCase):
+    """Тесты постраничной загрузки задач через локальный HTTP-сервер"""
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), StubJiraHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.jira_url = f'http://127.0.0.1:{self.server.server_port}'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_11_fetch_all_pages_in_order(self):
+        """11. Тест загрузки всех страниц при ограничении размера страницы сервером"""
+        issues = fetch_jira_issues(self.jira_url, 'TEST', 100, max_workers=3)
+
+        self.assertEqual(len(issues), StubJiraHandler.total)
+        self.assertEqual([issue['key'] for issue in issues],
+                         [f'TEST-{i}' for i in range(StubJiraHandler.total)])
+
+    def test_13_client_retries_after_throttling(self):
+        """13. Тест повтора запроса после ответа 429 с заголовком Retry-After"""
+        StubJiraHandler.throttled = 2
+        with JiraClient(self.jira_url, pool_size=2, backoff_factor=0) as client:
+            issues = fetch_jira_issues(self.jira_url, 'TEST', 100, max_workers=2, client=client)
+            stats = client.latency_stats()
+
+        self.assertEqual(len(issues), StubJiraHandler.total)
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['requests'], 5 + 2)
+
+    def test_44_retry_after_values(self):
+        """44. Тест разбора заголовка Retry-After: некорректные значения заменяются откатом"""
+        client = JiraClient(self.jira_url, backoff_factor=1, max_backoff=30)
+        response = MagicMock()
+        for value, expected in (('5', 5.0), ('120', 30.0)):
+            response.headers = {'Retry-After': value}
+            self.assertEqual(client._retry_delay(response, 0), expected)
+        for value in ('-3', 'nan', 'inf', 'soon'):
+            response.headers = {'Retry-After': value}
+            delay = client._retry_delay(response, 2)
+            self.assertTrue(0 <= delay <= 4, value)
+        client.close()
+
+    def test_20_fetch_multiple_projects_async(self):
+        """20. Тест параллельной загрузки нескольких проектов"""
+        projects = ['ALPHA', {'key': 'BETA', 'jql': 'priority = Major'}]
+        result = fetch_projects(self.jira_url, projects, 100, max_concurrency=3, rate_limit=100)
+
+        self.assertEqual(set(result), {'ALPHA', 'BETA'})
+        self.assertEqual([issue['key'] for issue in result['BETA']],
+                         [f'BETA-{i}' for i in range(StubJiraHandler.total)])
+
+    def test_43_portfolio_fetches_projects_together(self):
+        """43. Тест загрузки проектов портфеля одним асинхронным запуском с учетом кэша"""
+        import main
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            config = dict(DEFAULT_CONFIG, jira_url=self.jira_url, max_results=100, cache_dir=cache_dir,
+                          max_concurrency=3, rate_limit=None, status_filter=['Closed'])
+            cache = main.open_issue_cache(main.project_config(config, 'ALPHA'))
+            cache.set_last_sync('2024-01-05T14:30:00.000+0000')
+            cache.close()
+
+            with patch('main.fetch_projects', wraps=fetch_projects) as mock_fetch:
+                snapshots = main.export_portfolio_snapshots(config, ['ALPHA', {'key': 'BETA'}])
+
+            mock_fetch.assert_called_once()
+            specs = {spec['key']: spec for spec in mock_fetch.call_args.args[1]}
+            self.assertEqual(specs['ALPHA']['updated_since'], '2024-01-04 14:30')
+            # Изменения запрашиваются по всему проекту, статусы проверяются после загрузки
+            self.assertIsNone(specs['ALPHA']['statuses'])
+            self.assertIsNone(specs['BETA']['updated_since'])
+            self.assertEqual(specs['BETA']['statuses'], ['Closed'])
+            self.assertEqual(mock_fetch.call_args.args[3:], (3, None))
+
+            self.assertEqual(set(snapshots), {'ALPHA', 'BETA'})
+            self.assertEqual(len(load_snapshot(snapshots['BETA'])), StubJiraHandler.total)
+            # Изменения записаны в кэш проекта
+            cache = main.open_issue_cache(main.project_config(config, 'ALPHA'))
+            self.assertEqual(len(cache.load_issues()), StubJiraHandler.total)
+            cache.close()
+
+    def test_14_client_gives_up_after_max_retries(self):
+        """14. Тест ошибки API после исчерпания повторов"""
+        StubJiraHandler.throttled = 3
+        with JiraClient(self.jira_url, max_retries=2, backoff_factor=0) as client:
+            with self.assertRaises(JiraApiError):
+                fetch_jira_issues(self.jira_url, 'TEST', 100, client=client)
+        StubJiraHandler.throttled = 0
+
+
+class TestIssueCache(unittest.TestCase):
+    """Тесты локального кэша задач"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @patch('jira_analytics.cache.fetch_jira_issues')
+    def test_12_incremental_sync(self, mock_fetch):
+        """12. Тест инкрементальной синхронизации: повторный запуск запрашивает только изменения"""
+        first = [
+            {'key': 'TEST-1', 'fields': {'updated': '2024-01-05T14:30:00.000+0000'}},
+            {'key': 'TEST-2', 'fields': {'updated': '2024-01-10T16:00:00.000+0000'}}
+        ]
+        delta = [
+            {'key': 'TEST-2', 'fields': {'updated': '2024-02-01T09:15:00.000+0000', 'timespent': 60,
+                                         'status': {'name': 'Closed'}}},
+            {'key': 'TEST-3', 'fields': {'updated': '2024-02-02T10:00:00.000+0000',
+                                         'status': {'name': 'Resolved'}}}
+        ]
+        mock_fetch.side_effect = [first, delta]
+
+        issues = sync_issues('https://test-jira.example.com', 'TEST', 100,
+                             cache_dir=self.temp_dir.name)
+        self.assertEqual(len(issues), 2)
+        self.assertIsNone(mock_fetch.call_args.kwargs['updated_since'])
+
+        issues = sync_issues('https://test-jira.example.com', 'TEST', 100,
+                             cache_dir=self.temp_dir.name)
+        self.assertEqual(mock_fetch.call_args.kwargs['updated_since'], '2024-01-09 16:00')
+        self.assertEqual([issue['key'] for issue in issues], ['TEST-1', 'TEST-2', 'TEST-3'])
+        self.assertEqual(issues[1]['fields']['timespent'], 60)
+
+        cache = IssueCache(self.temp_dir.name, 'https://test-jira.example.com', 'TEST')
+        self.assertEqual(cache.get_last_sync(), '2024-02-02T10:00:00.000+0000')
+        cache.close()
+
+    @patch('jira_analytics.cache.fetch_jira_issues')
+    def test_28_filtered_cache_and_refresh(self, mock_fetch):
+        """28. Тест отбора задач по статусам и JQL и быстрого обновления"""
+        params = build_search_params('TEST', 50, jql='labels = ui', statuses=None)
+        self.assertEqual(params['jql'], 'project=TEST AND (labels = ui) ORDER BY key ASC')
+        params = build_search_params('TEST', 50, statuses=['Open', 'In Progress'])
+        self.assertEqual(params['jql'],
+                         'project=TEST AND status in ("Open", "In Progress") ORDER BY key ASC')
+        params = build_search_params('TEST', 50, updated_since='2024-01-04 14:30', statuses=None)
+        self.assertEqual(params['jql'], 'project=TEST AND updated >= "2024-01-04 14:30" ORDER BY key ASC')
+
+        mock_fetch.side_effect = [
+            [{'key': 'TEST-1', 'fields': {'updated': '2024-01-05T14:30:00.000+0000'}}],
+            [{'key': 'TEST-2', 'fields': {'updated': '2024-01-06T10:00:00.000+0000'}}]
+        ]
+        issues = sync_issues('https://test-jira.example.com', 'TEST', 100,
+                             cache_dir=self.temp_dir.name, statuses=None)
+        self.assertEqual(len(issues), 1)
+        self.assertIsNone(mock_fetch.call_args.kwargs['statuses'])
+
+        delta, removed = refresh_issues('https://test-jira.example.com', 'TEST', 100,
+                                        cache_dir=self.temp_dir.name, statuses=None)
+        self.assertEqual(([issue['key'] for issue in delta], removed), (['TEST-2'], []))
+        self.assertEqual(mock_fetch.call_args.kwargs['updated_since'], '2024-01-04 14:30')
+
+        # Набор по умолчанию (Closed, Resolved) хранится отдельно
+        cache = IssueCache(self.temp_dir.name, 'https://test-jira.example.com', 'TEST')
+        self.assertIsNone(cache.get_last_sync())
+        cache.close()
+
+    @patch('jira_analytics.cache.fetch_jira_issues')
+    def test_30_report_fields(self, mock_fetch):
+        """30. Тест загрузки только полей, нужных выбранным отчетам"""
+        self.assertEqual(required_fields(['priority']), ['updated', 'priority'])
+        self.assertEqual(required_fields(['1', 'top_users']),
+                         ['created', 'updated', 'resolutiondate', 'reporter', 'assignee'])
+        self.assertEqual(required_fields(), list(SEARCH_FIELDS))
+        with self.assertRaises(ConfigError):
+            required_fields(['unknown'])
+
+        params = build_search_params('TEST', 50, fields=['updated', 'priority'])
+        self.assertEqual(params['fields'], 'updated,priority')
+        issue = {'key': 'TEST-1', 'fields': {
+            'priority': {'name': 'Major', 'iconUrl': 'x'}, 'summary': 'text',
+            'assignee': {'displayName': 'User', 'avatarUrls': {}}}}
+        projected = project_issue(issue, build_projection(['priority']))
+        self.assertEqual(projected, {'key': 'TEST-1', 'fields': {'priority': {'name': 'Major'}}})
+
+        # Запрос новых полей приводит к полной загрузке с объединенным набором
+        mock_fetch.side_effect = [
+            [{'key': 'TEST-1', 'fields': {'updated': '2024-01-05T14:30:00.000+0000'}}],
+            [],
+            [{'key': 'TEST-1', 'fields': {'updated': '2024-01-05T14:30:00.000+0000'}}]
+        ]
+        url = 'https://test-jira.example.com'
+        sync_issues(url, 'TEST', 100, cache_dir=self.temp_dir.name, fields=['updated', 'priority'])
+        sync_issues(url, 'TEST', 100, cache_dir=self.temp_dir.name, fields=['updated'])
+        # Для отбора изменений по статусам к полям добавляется status
+        self.assertEqual(mock_fetch.call_args.kwargs['fields'], ['updated', 'priority', 'status'])
+        self.assertIsNotNone(mock_fetch.call_args.kwargs['updated_since'])
+        sync_issues(url, 'TEST', 100, cache_dir=self.temp_dir.name, fields=['updated', 'status'])
+        self.assertEqual(mock_fetch.call_args.kwargs['fields'], ['updated', 'status', 'priority'])
+        self.assertIsNone(mock_fetch.call_args.kwargs['updated_since'])
+
+    def test_40_report_fields_with_issue_filter(self):
+        """40. Тест загрузки полей отчетов вместе с полями условий отбора"""
+        import main
+
+        self.assertEqual(required_fields(['1'], IssueFilter(priority='Major')),
+                         ['created', 'updated', 'resolutiondate', 'priority'])
+        self.assertEqual(required_fields(['priority'], IssueFilter(created_from='2024-01-01')),
+                         ['created', 'updated', 'priority'])
+
+        issues = [
+            {'key': 'TEST-1', 'fields': {
+                'created': '2024-01-01T10:00:00.000+0000', 'updated': '2024-01-05T10:00:00.000+0000',
+                'resolutiondate': '2024-01-05T10:00:00.000+0000', 'priority': {'name': 'Major'},
+                'status': {'name': 'Closed'}}},
+            {'key': 'TEST-2', 'fields': {
+                'created': '2024-01-02T10:00:00.000+0000', 'updated': '2024-01-04T10:00:00.000+0000',
+                'resolutiondate': '2024-01-04T10:00:00.000+0000', 'priority': {'name': 'Minor'},
+                'status': {'name': 'Closed'}}}
+        ]
+
+        def fetch(*args, fields, **kwargs):
+            # Сервер возвращает только запрошенные поля
+            projection = build_projection(fields)
+            return iter([project_issue(issue, projection) for issue in issues])
+
+        config = dict(DEFAULT_CONFIG, jira_url='https://test-jira.example.com', project_key='TEST',
+                      use_cache=False, reports=['1'], issue_filter={'priority': 'Major'})
+        with patch('main.iter_jira_issues', side_effect=fetch) as mock_fetch:
+            processor = main.load_processor(config)
+
+        self.assertIn('priority', mock_fetch.call_args.kwargs['fields'])
+        issue_filter = IssueFilter(**config['issue_filter'])
+        self.assertEqual(processor.get_report_bundle(issue_filter=issue_filter).issue_count, 1)
+
+    def test_31_snapshot_export_import(self):
+        """31. Тест сохранения и загрузки снимка набора задач"""
+        issues = [
+            {'key': 'TEST-1', 'fields': {
+                'created': '2024-01-01T10:00:00.000+0000',
+                'resolutiondate': '2024-01-05T10:00:00.000+0000',
+                'status': {'name': 'Closed'}, 'priority': {'name': 'Major'},
+                'assignee': {'displayName': 'John Doe'}, 'reporter': None, 'timespent': 3600},
+             'changelog': {'transitions': [['2024-01-03T10:00:00.000+0000', 'Open', 'Closed']]}},
+            {'key': 'TEST-2', 'fields': {
+                'created': '2024-01-02T10:00:00.000+0000', 'resolutiondate': None,
+                'status': {'name': 'Open'}, 'priority': None, 'assignee': None,
+                'reporter': {'displayName': 'Jane Doe'}, 'timespent': None}}
+        ]
+        table = IssueTable.from_issues(issues)
+        expected = DataProcessor(table).get_report_bundle()
+
+        for compress in (False, True):
+            path = os.path.join(self.temp_dir.name, f'snapshot_{compress}.npz')
+            save_snapshot(table, path, compress=compress)
+            loaded = load_snapshot(path)
+            self.assertEqual(isinstance(loaded.created, np.memmap), not compress)
+            self.assertEqual(loaded.keys.tolist(), ['TEST-1', 'TEST-2'])
+            self.assertEqual(loaded.dictionaries, table.dictionaries)
+            self.assertEqual(loaded.transitions.to_codes.tolist(), table.transitions.to_codes.tolist())
+
+            bundle = DataProcessor(path).get_report_bundle()
+            self.assertEqual(bundle.user_stats, expected.user_stats)
+            self.assertEqual(bundle.resolution_times.tolist(), expected.resolution_times.tolist())
+            self.assertEqual(bundle.priority_distribution, expected.priority_distribution)
+
+        with open(path, 'wb') as file:
+            file.write(b'not a snapshot')
+        with self.assertRaises(DataProcessingError):
+            load_snapshot(path)
+
+    @patch('jira_analytics.cache.fetch_jira_issues')
+    def test_46_issue_leaving_filter_is_evicted(self, mock_fetch):
+        """46. Тест удаления из кэша задач, вышедших из набора после изменения"""
+        def issue(key, updated, status):
+            return {'key': key, 'fields': {'created': '2024-01-01T10:00:00.000+0000',
+                                           'updated': updated, 'status': {'name': status}}}
+
+        url = 'https://test-jira.example.com'
+        mock_fetch.side_effect = [
+            [issue('TEST-1', '2024-01-02T10:00:00.000+0000', 'Closed'),
+             issue('TEST-2', '2024-01-03T10:00:00.000+0000', 'Resolved')],
+            [issue('TEST-1', '2024-01-05T10:00:00.000+0000', 'Reopened'),
+             issue('TEST-3', '2024-01-04T10:00:00.000+0000', 'Closed')]
+        ]
+        processor = DataProcessor(sync_issues(url, 'TEST', 100, cache_dir=self.temp_dir.name))
+        delta, removed = refresh_issues(url, 'TEST', 100, cache_dir=self.temp_dir.name)
+        # Изменения запрашиваются по всему проекту, статусы проверяются локально
+        self.assertEqual((mock_fetch.call_args.kwargs['statuses'], mock_fetch.call_args.kwargs['jql']),
+                         (None, None))
+        self.assertEqual(([item['key'] for item in delta], removed), (['TEST-3'], ['TEST-1']))
+        processor.update_issues(delta, removed)
+        self.assertEqual(sorted(processor.table.keys.tolist()), ['TEST-2', 'TEST-3'])
+        cache = IssueCache(self.temp_dir.name, url, 'TEST')
+        self.assertEqual(sorted(item['key'] for item in cache.load_issues()), ['TEST-2', 'TEST-3'])
+        self.assertEqual(cache.get_last_sync(), '2024-01-05T10:00:00.000+0000')
+        cache.close()
+
+        # Условие JQL проверяется по ключам задач, которые ему удовлетворяют
+        mock_fetch.side_effect = [
+            [issue('TEST-2', '2024-01-03T10:00:00.000+0000', 'Closed'),
+             issue('TEST-3', '2024-01-04T10:00:00.000+0000', 'Closed')],
+            [{'key': 'TEST-3', 'fields': {'updated': '2024-01-06T10:00:00.000+0000'}}],
+            [issue('TEST-2', '2024-01-06T10:00:00.000+0000', 'Closed'),
+             issue('TEST-3', '2024-01-06T10:00:00.000+0000', 'Closed')]
+        ]
+        sync_issues(url, 'TEST', 100, cache_dir=self.temp_dir.name, jql='labels = ui')
+        issues = sync_issues(url, 'TEST', 100, cache_dir=self.temp_dir.name, jql='labels = ui')
+        self.assertEqual(mock_fetch.call_args_list[-2].kwargs['jql'], 'labels = ui')
+        self.assertEqual(mock_fetch.call_args_list[-2].kwargs['fields'], ['updated'])
+        self.assertEqual([item['key'] for item in issues], ['TEST-3'])
+
+        # Колоночное хранилище помечает такие задачи замененными
+        store = ColumnStore(os.path.join(self.temp_dir.name, 'store'))
+        store.append(IssueTable.from_issues([issue('TEST-1', '2024-01-02T10:00:00.000+0000', 'Closed'),
+                                             issue('TEST-2', '2024-01-03T10:00:00.000+0000', 'Closed')]))
+        store.append(IssueTable.from_issues([]), removed=['TEST-1'])
+        self.assertEqual(store.table().keys.tolist(), ['TEST-2'])
+
+    @patch('jira_analytics.column_store.iter_jira_issues')
+    def test_32_column_store_sync(self, mock_iter):
+        """32. Тест колоночного хранилища с дописыванием изменений"""
+        def issue(key, updated, status, assignee):
+            return {'key': key, 'fields': {
+                'created': '2024-01-01T10:00:00.000+0000', 'updated': updated,
+                'resolutiondate': None, 'status': {'name': status},
+                'assignee': {'displayName': assignee}, 'reporter': None,
+                'priority': None, 'timespent': None}}
+
+        mock_iter.side_effect = [
+            iter([issue('TEST-1', '2024-01-02T10:00:00.000+0000', 'Open', 'John Doe'),
+                  issue('TEST-2', '2024-01-03T10:00:00.000+0000', 'Open', 'Jane Doe')]),
+            iter([issue('LONGPROJECTNAME-100000', '2024-01-04T10:00:00.000+0000', 'Open', 'Bob')]),
+            iter([issue('TEST-1', '2024-01-05T10:00:00.000+0000', 'Closed', 'Bob')])
+        ]
+        url = 'https://test-jira.example.com'
+        store = open_column_store(self.temp_dir.name, url, 'TEST', statuses=None)
+        sync_column_store(store, url, 'TEST', 100, statuses=None)
+        self.assertIsNone(mock_iter.call_args.kwargs['updated_since'])
+        key_size = os.path.getsize(os.path.join(store.path, 'keys.bin'))
+        created_path = os.path.join(store.path, 'created.bin')
+        with open(created_path, 'rb') as file:
+            created_bytes = file.read()
+
+        store = open_column_store(self.temp_dir.name, url, 'TEST', statuses=None)
+        self.assertEqual(store.last_sync, '2024-01-03T10:00:00.000+0000')
+        delta, _ = sync_column_store(store, url, 'TEST', 100, statuses=None)
+        self.assertEqual(len(delta), 1)
+        self.assertEqual(mock_iter.call_args.kwargs['updated_since'], '2024-01-02 10:00')
+
+        # Прежние данные колонок не переписываются, длинный ключ расширяет только ключи
+        with open(created_path, 'rb') as file:
+            self.assertEqual(file.read(len(created_bytes)), created_bytes)
+        self.assertGreater(os.path.getsize(store._column_path('keys')), key_size * 2)
+
+        # Прежняя версия замененной задачи остается на диске и отбрасывается при чтении
+        delta, _ = sync_column_store(open_column_store(self.temp_dir.name, url, 'TEST', statuses=None),
+                                     url, 'TEST', 100, statuses=None)
+        self.assertEqual(len(delta), 1)
+        store = open_column_store(self.temp_dir.name, url, 'TEST', statuses=None)
+        self.assertEqual((store.manifest['row_count'], store.manifest['superseded']), (4, [[0, 1]]))
+        with open(created_path, 'rb') as file:
+            self.assertEqual(file.read(len(created_bytes)), created_bytes)
+        table = store.table()
+        self.assertEqual(table.keys.tolist(), ['TEST-2', 'LONGPROJECTNAME-100000', 'TEST-1'])
+        self.assertEqual(DataProcessor(table).get_user_stats(), {'Jane Doe': 1, 'Bob': 2})
+
+        # Явное уплотнение переписывает хранилище в файлы следующего поколения
+        store.compact()
+        self.assertEqual((store.manifest['row_count'], store.manifest['generation']), (3, 1))
+        self.assertFalse(os.path.exists(created_path))
+        table = store.table()
+        self.assertIsInstance(table.created, np.memmap)
+        self.assertEqual(table.keys.tolist(), ['TEST-2', 'LONGPROJECTNAME-100000', 'TEST-1'])
+
+        # Быстрое обновление заново открывает таблицу из хранилища
+        import main
+        config = dict(DEFAULT_CONFIG, jira_url=url, project_key='TEST', max_results=100,
+                      cache_dir=self.temp_dir.name, column_store=True)
+        processor = DataProcessor(table)
+        mock_iter.side_effect = [iter([issue('TEST-2', '2024-01-06T10:00:00.000+0000', 'Closed', 'Bob')])]
+        self.assertEqual(main.make_refresher(config, processor)(), 1)
+        self.assertEqual(processor.table.keys.tolist(), ['LONGPROJECTNAME-100000', 'TEST-1', 'TEST-2'])
+        self.assertEqual(processor.get_user_stats(), {'Bob': 3})
+
+    def test_42_column_store_compaction_is_atomic(self):
+        """42. Тест атомарного добавления и уплотнения хранилища и чтения без записи на диск"""
+        import gc
+
+        def issue(key, status, transitions):
+            return {'key': key, 'fields': {'created': '2024-01-01T10:00:00.000+0000',
+                                           'status': {'name': status}},
+                    'changelog': {'transitions': transitions}}
+
+        store = ColumnStore(os.path.join(self.temp_dir.name, 'store'))
+        store.append(IssueTable.from_issues([
+            issue('TEST-1', 'Open', []),
+            issue('TEST-2', 'Done', [['2024-01-02T10:00:00.000+0000', 'Open', 'Done']])]))
+        update = IssueTable.from_issues([
+            issue('TEST-1', 'Done', [['2024-01-03T10:00:00.000+0000', 'Open', 'Done']])])
+        mapped = store.table()
+
+        # Сбой до записи манифеста: ни новые строки, ни пометки замененных не видны
+        with patch.object(ColumnStore, '_write_manifest', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                store.append(update)
+        self.assertEqual(store.manifest['row_count'], 2)
+        reopened = ColumnStore(store.path)
+        self.assertEqual((len(reopened), reopened.manifest['superseded']), (2, []))
+        self.assertEqual(reopened.table().keys.tolist(), ['TEST-1', 'TEST-2'])
+
+        # Замененная строка записывается диапазоном в манифест, чтение не изменяет файлы
+        with patch('jira_analytics.column_store.COMPACT_RATIO', 1.0):
+            store.append(update)
+        self.assertEqual((store.manifest['row_count'], store.manifest['superseded']), (3, [[0, 1]]))
+        files = sorted(os.listdir(store.path))
+        with open(os.path.join(store.path, 'manifest.json'), 'rb') as file:
+            manifest = file.read()
+        table = ColumnStore(store.path).table()
+        self.assertEqual(table.keys.tolist(), ['TEST-2', 'TEST-1'])
+        self.assertEqual(table.transitions.rows.tolist(), [0, 1])
+        self.assertEqual(sorted(os.listdir(store.path)), files)
+        with open(os.path.join(store.path, 'manifest.json'), 'rb') as file:
+            self.assertEqual(file.read(), manifest)
+
+        # Сбой уплотнения до смены манифеста оставляет прежнее поколение
+        with patch.object(ColumnStore, '_write_manifest', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                store.compact()
+        self.assertEqual(store.manifest['generation'], 0)
+        reopened = ColumnStore(store.path)
+        self.assertEqual((len(reopened), reopened.manifest['generation']), (2, 0))
+
+        # Файлы прежнего поколения сохраняются, пока их отображает открытая таблица
+        store.compact()
+        self.assertEqual(store.manifest['generation'], 1)
+        self.assertTrue(os.path.exists(os.path.join(store.path, 'keys.bin')))
+        self.assertEqual(mapped.keys.tolist(), ['TEST-1', 'TEST-2'])
+        del mapped
+        gc.collect()
+        store.compact()
+        self.assertEqual(ColumnStore(store.path).table().keys.tolist(), ['TEST-2', 'TEST-1'])
+        self.assertEqual(sorted(os.listdir(store.path)),
+                         sorted([f'{name}.g1.bin' for name in ['keys', *ISSUE_COLUMNS, *TRANSITION_COLUMNS]]
+                                + ['manifest.json']))
+
+
+class TestAnalyticsServer(unittest.TestCase):
+    """Тесты HTTP API отчетов"""
+
+    def setUp(self):
+        def issue(key, created, resolved, priority):
+            return {'key': key, 'fields': {
+                'created': created, 'resolutiondate': resolved, 'status': {'name': 'Closed'},
+                'priority': {'name': priority}, 'assignee': {'displayName': 'John Doe'},
+                'reporter': None, 'timespent': 3600, 'updated': created}}
+
+        self.processor = DataProcessor([
+            issue('TEST-1', '2024-01-01T10:00:00.000+0000', '2024-01-05T10:00:00.000+0000', 'High'),
+            issue('TEST-2', '2024-01-02T10:00:00.000+0000', None, 'Low')
+        ])
+        self.issue = issue
+        self.service = AnalyticsService(self.processor, 'TEST', refresh=self.refresh)
+        self.server = create_server(self.service, port=0)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def refresh(self):
+        self.processor.update_issues([
+            self.issue('TEST-3', '2024-01-03T10:00:00.000+0000', None, 'High')])
+        return 1
+
+    def request(self, path, method='GET', headers=None):
+        from urllib.error import HTTPError
+        from urllib.request import Request, urlopen
+        try:
+            with urlopen(Request(self.base_url + path, method=method, headers=headers or {})) as response:
+                return response.status, dict(response.headers), response.read()
+        except HTTPError as e:
+            return e.code, dict(e.headers), e.read()
+
+    def test_35_reports_api(self):
+        """35. Тест HTTP API: JSON, PNG, условные запросы и обновление"""
+        self.service.warm()
+        status, _, body = self.request('/api/reports')
+        self.assertEqual(status, 200)
+        self.assertIn('priority', [item['name'] for item in json.loads(body)])
+
+        status, headers, body = self.request('/api/reports/priority.json')
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)['data'], {'priority_stats': {'High': 1, 'Low': 1}})
+        etag = headers['ETag']
+
+        status, _, body = self.request('/api/reports/priority', headers={'If-None-Match': etag})
+        self.assertEqual(status, 200)
+        status, _, body = self.request('/api/reports/priority.json', headers={'If-None-Match': etag})
+        self.assertEqual((status, body), (304, b''))
+        status, _, _ = self.request('/api/reports/priority.json',
+                                    headers={'If-Modified-Since': headers['Last-Modified']})
+        self.assertEqual(status, 304)
+
+        status, _, body = self.request('/api/reports/6?priority=High')
+        self.assertEqual(json.loads(body)['data'], {'priority_stats': {'High': 1}})
+        status, _, body = self.request('/api/reports/6?created_from=not-a-date')
+        self.assertEqual(status, 400)
+        self.assertEqual(self.request('/api/reports/missing.json')[0], 404)
+
+        status, headers, body = self.request('/api/reports/1.json')
+        self.assertEqual(status, 200)
+        self.assertIn('counts', json.loads(body)['data']['times'])
+        status, headers, body = self.request('/api/reports/priority.png')
+        self.assertEqual((status, headers['Content-Type']), (200, 'image/png'))
+        self.assertTrue(body.startswith(b'\x89PNG'))
+        status, headers, body = self.request('/api/reports/backlog.svg')
+        self.assertEqual((status, headers['Content-Type']), (200, 'image/svg+xml'))
+        self.assertTrue(body.startswith(b'<svg'))
+
+        status, _, body = self.request('/api/refresh', method='POST')
+        self.assertEqual(json.loads(body)['issue_count'], 3)
+        status, headers, body = self.request('/api/reports/priority.json', headers={'If-None-Match': etag})
+        self.assertEqual(status, 200)
+        self.assertNotEqual(headers['ETag'], etag)
+        self.assertEqual(json.loads(body)['data'], {'priority_stats': {'High': 2, 'Low': 1}})
+
+    def test_41_conditional_and_daily_reports(self):
+        """41. Тест ответа 304 без расчета отчета и смены дня для отчетов от текущей даты"""
+        from datetime import date
+
+        status, headers, _ = self.request('/api/reports/open_age.json')
+        etag = headers['ETag']
+        with patch.object(self.service, '_report', wraps=self.service._report) as report:
+            status, _, _ = self.request('/api/reports/open_age.json', headers={'If-None-Match': etag})
+            self.assertEqual(status, 304)
+            report.assert_not_called()
+
+        class Tomorrow(date):
+            @classmethod
+            def today(cls):
+                return date.fromordinal(date.today().toordinal() + 1)
+
+        with patch('jira_analytics.server.date', Tomorrow):
+            status, headers, _ = self.request('/api/reports/open_age.json', headers={'If-None-Match': etag})
+            self.assertEqual(status, 200)
+            self.assertNotEqual(headers['ETag'], etag)
+        self.assertEqual(len([key for key in self.service._responses if key[0] == 'open_age']), 2)
+
+    def test_45_bounded_caches_and_refresh_errors(self):
+        """45. Тест ограничения кэшей ответов и отчетов и ошибок обновления в JSON"""
+        with patch('jira_analytics.server.MAX_RESPONSES', 2), \
+                patch('jira_analytics.data_processor.MAX_CACHED_RESULTS', 3):
+            for priority in ('High', 'Low', 'Major', 'High'):
+                status, headers, body = self.request(f'/api/reports/priority.json?priority={priority}')
+                self.assertEqual(status, 200)
+                self.assertIn(f'-{self.processor.version}-', headers['ETag'])
+                self.assertEqual(json.loads(body)['version'], self.processor.version)
+            self.assertEqual([key[2] for key in self.service._responses],
+                             [IssueFilter(priority=['Major']), IssueFilter(priority=['High'])])
+            self.assertLessEqual(len(self.processor._cache), 3)
+
+        self.service.refresh_data = MagicMock(side_effect=DataProcessingError('повреждены данные'))
+        status, headers, body = self.request('/api/refresh', method='POST')
+        self.assertEqual((status, headers['Content-Type']), (500, 'application/json; charset=utf-8'))
+        self.assertIn('повреждены данные', json.loads(body)['error'])
+        self.service.refresh_data = MagicMock(side_effect=RuntimeError('сбой'))
+        status, _, body = self.request('/api/refresh', method='POST')
+        self.assertEqual(status, 500)
+        self.assertIn('сбой', json.loads(body)['error'])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file